@@ -0,0 +1,108 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from causal_nest.results import DiscoveryResult
+
+
+def _edge_votes(results: List[DiscoveryResult], nodes: List[str]) -> np.ndarray:
+    """
+    Builds the edge-vote matrix of a list of discovery results.
+
+    Args:
+        results (List[DiscoveryResult]): The discovery results voting for edges.
+        nodes (List[str]): The node labels indexing the rows and columns of the matrix.
+
+    Returns:
+        np.ndarray: A matrix where the entry (i, j) is the share of results containing the edge i -> j.
+    """
+    index = {n: i for i, n in enumerate(nodes)}
+    votes = np.zeros((len(nodes), len(nodes)))
+
+    for r in results:
+        for u, v in r.output_graph.edges():
+            votes[index[u], index[v]] += 1
+
+    return votes / max(len(results), 1)
+
+
+@dataclass
+class ConsensusStoppingRule:
+    """
+    Stopping rule for the discovery stage, based on the agreement between the completed models.
+
+    The stage can stop once `k` completed models report the same parent set for the target, or once the edge-vote
+    matrix is stable: adding the latest result did not change the majority graph and the votes are decisive, i.e. the
+    average share of the winning side (edge present or absent) over the voted pairs is at least `vote_threshold`.
+
+    Attributes:
+        k (Optional[int]): Number of completed models that must agree on the target parents. None disables this check.
+        vote_threshold (Optional[float]): Minimum decisiveness of a stable edge-vote matrix, in (0.5, 1].
+            None disables this check.
+        min_results (int): Number of completed models required before the edge-vote check applies.
+    """
+
+    k: Optional[int] = 3
+    vote_threshold: Optional[float] = None
+    min_results: int = 3
+
+    def parents_agree(self, results: List[DiscoveryResult], target: str) -> bool:
+        """
+        Checks if at least `k` results report the same parent set for the target.
+
+        Args:
+            results (List[DiscoveryResult]): The completed discovery results.
+            target (str): The target node.
+
+        Returns:
+            bool: True if `k` results agree on the target parents, False otherwise.
+        """
+        if self.k is None:
+            return False
+
+        parent_sets = Counter(
+            frozenset(r.output_graph.predecessors(target)) if target in r.output_graph else frozenset() for r in results
+        )
+        return len(parent_sets) > 0 and parent_sets.most_common(1)[0][1] >= self.k
+
+    def votes_stable(self, results: List[DiscoveryResult]) -> bool:
+        """
+        Checks if the latest result left the majority graph unchanged and the votes are decisive enough.
+
+        Args:
+            results (List[DiscoveryResult]): The completed discovery results, in completion order.
+
+        Returns:
+            bool: True if the edge-vote matrix is stable above `vote_threshold`, False otherwise.
+        """
+        if self.vote_threshold is None or len(results) < max(self.min_results, 2):
+            return False
+
+        nodes = sorted({n for r in results for n in r.output_graph.nodes()})
+        previous = _edge_votes(results[:-1], nodes)
+        current = _edge_votes(results, nodes)
+
+        if np.any((previous > 0.5) != (current > 0.5)):
+            return False
+
+        voted = current > 0
+        if not voted.any():
+            return True
+
+        decisiveness = np.maximum(current[voted], 1 - current[voted]).mean()
+        return decisiveness >= self.vote_threshold
+
+    def should_stop(self, results: List[DiscoveryResult], target: str) -> bool:
+        """
+        Checks if the discovery stage can stop given the completed results.
+
+        Args:
+            results (List[DiscoveryResult]): The completed discovery results, in completion order.
+            target (str): The target node.
+
+        Returns:
+            bool: True if any of the enabled agreement conditions is met, False otherwise.
+        """
+        return self.parents_agree(results, target) or self.votes_stable(results)
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import List
+from typing import Any, Dict, List
 
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
@@ -66,6 +66,16 @@ class Dataset:
     feature_mapping: List[FeatureTypeMap] = field(default_factory=list)
     """A map to detemine the feature types which will be used to evaluate metrics and allowed causal discovery algorithms."""
 
+    cache: Dict[Any, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    """Values derived from the data, such as the superstructure, computed once and shared by every discovery method.
+    Copies made with `dataclasses.replace` start with an empty cache, and assigning the data, target or feature mapping
+    clears it. Changes made in place to the dataframe are not tracked."""
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ("data", "target", "feature_mapping") and "cache" in self.__dict__:
+            self.cache.clear()
+
     def __post_init__(self):
         if not isinstance(self.data, pd.DataFrame):
             raise ValueError("Field 'data' must be a pandas dataframe")
@@ -191,3 +201,29 @@ def estimate_feature_importances(dataset: Dataset):
 def featured_only_data(dataset: Dataset):
     whitelist = list(map(lambda x: x.feature, dataset.feature_mapping)) + [dataset.target]
     return dataset.data[whitelist]
+
+
+def subsample_dataset(dataset: Dataset, max_rows: int = None, max_features: int = None, random_state: int = 0):
+    """
+    Generates a smaller copy of the dataset, keeping a random subset of rows and the most important features.
+
+    Args:
+        dataset (Dataset): The dataset definition.
+        max_rows (int, optional): The maximum number of rows to keep. Defaults to None, which keeps all rows.
+        max_features (int, optional): The maximum number of features to keep, besides the target. Features are taken
+            in the `feature_mapping` order, which is sorted by importance after `estimate_feature_importances`.
+            Defaults to None, which keeps all features.
+        random_state (int, optional): The seed of the row sampling. Defaults to 0.
+
+    Returns:
+        Dataset: A copy of the original dataset with fewer rows and features.
+    """
+    feature_mapping = dataset.feature_mapping
+    if max_features is not None:
+        feature_mapping = feature_mapping[:max_features]
+
+    data = dataset.data
+    if max_rows is not None and len(data) > max_rows:
+        data = data.sample(n=max_rows, random_state=random_state)
+
+    return replace(dataset, data=data, feature_mapping=list(feature_mapping))
@@ -1,19 +1,23 @@
 import os
-from concurrent.futures import TimeoutError
-from dataclasses import replace
-from multiprocessing import cpu_count
+from concurrent.futures import FIRST_COMPLETED, TimeoutError, wait
+from dataclasses import dataclass, replace
+from multiprocessing import Manager, Queue
 from timeit import default_timer as timer
+from typing import Optional
 
 import matplotlib.pyplot as plt
 import networkx as nx
 from pebble import ProcessExpired, ProcessPool
 
+from causal_nest.consensus import ConsensusStoppingRule
+from causal_nest.dataset import subsample_dataset
 from causal_nest.discovery_models import (
     BES,
     CAM,
     CCDR,
     CGNN,
     FAST_IAMB,
+    FGES,
     GES,
     GIES,
     GRASP,
@@ -21,12 +25,19 @@ from causal_nest.discovery_models import (
     IAMB,
     INTER_IAMB,
     LINGAM,
+    MMHC,
+    NOTEARS,
     PC,
     SAM,
     DiscoveryMethodModel,
 )
+from causal_nest.engines import score_cache, score_cache_delta
+from causal_nest.portfolio import PortfolioHistory, estimate_model_seconds, select_portfolio
 from causal_nest.problem import Problem
+from causal_nest.profile import inherit_profile
+from causal_nest.resources import plan_thread_budget
 from causal_nest.results import DiscoveryResult
+from causal_nest.sampling import SampleSizeController, stratified_subsample
 from causal_nest.stats import (
     calculate_auc_pr,
     calculate_graph_ranking_score,
@@ -36,12 +47,15 @@ from causal_nest.stats import (
     graph_integrity_score,
     required_edges_compliance_rate,
 )
+from causal_nest.superstructure import ScreeningMethod, Superstructure, dataset_superstructure
 from causal_nest.utils import dagify_graph, dagify_graph_v2
+from causal_nest.workers import initialize_worker, kill_process_groups, reported_pids
 
 known_methods = [
     PC,
     GS,
     GES,
+    FGES,
     GIES,
     CAM,
     CCDR,
@@ -53,13 +67,45 @@ known_methods = [
     BES,
     GRASP,
     CGNN,
+    NOTEARS,
+    MMHC,
 ]
 
+warm_start_chain = {
+    "BES": ["PC", "GS", "IAMB", "LINGAM", "GRASP"],
+    "FGES": ["PC", "GS", "IAMB", "LINGAM", "GRASP"],
+}
+"""Map of warm start providers. The key is a model supporting warm starts and the value lists the models whose output
+graph can be used as its starting point. The first provider to finish successfully is used."""
+
+
+@dataclass
+class DegradedRetryPolicy:
+    """
+    Cheaper configuration used to retry, once, a model that crashed or timed out.
+
+    The retry runs on a random subsample of the rows and on the most important features, and the model switches to
+    its own cheaper settings through `DiscoveryMethodModel.degrade` (e.g. fewer epochs for SAM and CGNN, or a parent
+    limit for BES). The retried result is flagged as `degraded`.
+
+    Attributes:
+        max_rows (Optional[int]): The maximum number of rows of the retry. None keeps all rows.
+        max_features (Optional[int]): The maximum number of features of the retry, besides the target. None keeps all.
+        max_seconds (Optional[int]): The time limit of the retry. None uses the `max_seconds_model` of the stage.
+    """
+
+    max_rows: Optional[int] = 2000
+    max_features: Optional[int] = 15
+    max_seconds: Optional[int] = None
+
 
 def applyable_models(problem: Problem):
     """
     Filters and returns a list of models that are applicable to the given problem.
 
+    The checks share the `DatasetProfile` cached on the dataset, which travels with the pickled problem, so the
+    workers and later calls reuse its verdicts.
+
     Args:
         problem (Problem): The problem instance containing the dataset.
 
@@ -70,7 +116,14 @@ def applyable_models(problem: Problem):
 
 
 def discover_with_model(
-    problem: Problem, model: DiscoveryMethodModel, verbose: bool = False, orient_toward_target: bool = True
+    problem: Problem,
+    model: DiscoveryMethodModel,
+    verbose: bool = False,
+    orient_toward_target: bool = True,
+    warm_start: DiscoveryResult = None,
+    degraded: DegradedRetryPolicy = None,
+    superstructure: Superstructure = None,
+    sample_size: SampleSizeController = None,
 ):
     """
     Discovers a causal graph using the specified model.
@@ -80,16 +133,52 @@ def discover_with_model(
         model (DiscoveryMethodModel): The discovery model to use.
         verbose (bool, optional): If True, prints and plots the discovered graph. Defaults to False.
         orient_toward_target (bool, optional): If True, orients the graph toward the target. Defaults to True.
+        warm_start (DiscoveryResult, optional): A previous result whose graph is used as the starting point of the
+            search. Only used by models with `supports_warm_start`. Defaults to None.
+        degraded (DegradedRetryPolicy, optional): If given, runs the model in its cheaper configuration on a smaller
+            dataset and flags the result as degraded. Defaults to None.
+        superstructure (Superstructure, optional): The candidate edges the search is restricted to. Only used by
+            models with `supports_superstructure`. Defaults to None.
+        sample_size (SampleSizeController, optional): If given, runs the model on growing stratified subsamples until
+            its graph is stable, and reports the rows used. Defaults to None, which uses every row.
 
     Returns:
         DiscoveryResult: The result of the discovery process, including the discovered graph and various statistics.
     """
     model_name = model.__name__
 
+    kwargs = {}
+    if warm_start is not None and model.supports_warm_start:
+        kwargs["warm_start"] = warm_start.output_graph
+    if superstructure is not None and model.supports_superstructure:
+        kwargs["superstructure"] = superstructure
+
+    dataset = problem.dataset
+    degradation = None
+
+    cache_before = score_cache().stats()
     start = timer()
     m = model()
-    output_graph = m.create_graph_from_data(problem.dataset)
+    if degraded is not None:
+        dataset = inherit_profile(
+            problem.dataset,
+            subsample_dataset(dataset, max_rows=degraded.max_rows, max_features=degraded.max_features),
+        )
+        changes = [f"{len(dataset.data)} rows", f"{len(dataset.feature_mapping)} features", m.degrade()]
+        degradation = ", ".join(c for c in changes if c)
+    if sample_size is None:
+        output_graph = m.create_graph_from_data(dataset, **kwargs)
+    else:
+        output_graph = None
+        for rows in sample_size.sizes(len(dataset.data)):
+            previous, subsample = output_graph, inherit_profile(dataset, stratified_subsample(dataset, rows))
+            output_graph = m.create_graph_from_data(subsample, **kwargs)
+            if previous is not None and sample_size.is_stable(previous, output_graph):
+                break
+        dataset = subsample
     end = timer()
+    cache_stats = score_cache_delta(cache_before, score_cache().stats())
+    used_cache = cache_stats["hits"] + cache_stats["misses"] > 0
 
     runtime = end - start
 
@@ -105,7 +194,7 @@ def discover_with_model(
         stats["shd"] = calculate_shd(problem.ground_truth, output_graph)
         stats["sid"] = calculate_sid(problem.ground_truth, output_graph)
 
-    if problem.knowledge is not None and len(problem.knowledge.forbidden_edges) > 0:
+    if problem.knowledge is not None and (len(problem.knowledge.forbidden_edges) > 0 or problem.knowledge.tiers):
         stats["fevr"] = forbidden_edges_violation_rate(output_graph, problem.knowledge)
         stats["recr"] = required_edges_compliance_rate(output_graph, problem.knowledge)
         stats["kis"] = graph_integrity_score(stats["fevr"], stats["recr"])
@@ -121,6 +210,12 @@ def discover_with_model(
         knowledge_integrity_score=stats["kis"],
         forbidden_edges_violation_rate=stats["fevr"],
         required_edges_compliance_rate=stats["recr"],
+        warm_started_from=warm_start.model if "warm_start" in kwargs else None,
+        degraded=degraded is not None,
+        degradation=degradation,
+        score_cache_hits=cache_stats["hits"] if used_cache else None,
+        score_cache_misses=cache_stats["misses"] if used_cache else None,
+        rows_used=len(dataset.data) if sample_size is not None or degraded is not None else None,
     )
 
     if verbose:
@@ -145,54 +240,222 @@ def _run_discover_with_model_task(args):
     return discover_with_model(*args)
 
 
+def _update_portfolio_history(history: PortfolioHistory, problem: Problem, models, discovery_results, timed_out):
+    """
+    Records the outcome of every executed model in the portfolio history.
+
+    Args:
+        history (PortfolioHistory): The history to update.
+        problem (Problem): The problem instance containing the dataset.
+        models (list): The executed discovery model classes.
+        discovery_results (dict): Map of discovery results, with `None` for models without a result.
+        timed_out (set): Names of the models that exceeded their time limit.
+    """
+    for m in models:
+        name = m.__name__
+        result = discovery_results.get(name)
+        # A degraded result still counts as a failure of the original configuration
+        if name in timed_out:
+            history.record_timeout(name)
+        elif result is not None and not result.degraded:
+            history.record_success(name, result.runtime, estimate_model_seconds(m, problem.dataset))
+        else:
+            history.record_failure(name)
+
+    ranked = sorted(filter(lambda x: x, discovery_results.values()), key=lambda x: x.priority_score, reverse=True)
+    for position, result in enumerate(ranked):
+        history.record_rank(result.model, position / (len(ranked) - 1) if len(ranked) > 1 else 0.0)
+
+
 def discover_with_all_models(
     problem: Problem,
     max_seconds_model: int = 90,
     verbose: bool = False,
     max_workers: int = None,
     orient_toward_target: bool = True,
+    time_budget: int = None,
+    history: PortfolioHistory = None,
+    stopping_rule: ConsensusStoppingRule = None,
+    warm_start: bool = False,
+    retry_policy: DegradedRetryPolicy = None,
+    screening: ScreeningMethod = None,
+    share_score_cache: bool = False,
+    sample_size: SampleSizeController = None,
 ):
     """
     Discovers causal graphs using all applicable models.
 
+    When a `time_budget` is given, the applicable models go through `causal_nest.portfolio.select_portfolio`, which
+    skips those unlikely to finish or to rank well. The skipped models and the reasons are stored in the
+    `skipped_models` field of the returned problem.
+
+    When a `stopping_rule` is given, the stage returns as soon as the completed models agree. The outstanding models
+    are cancelled, their workers and R subprocesses are killed, and they are reported in `skipped_models`.
+
+    When `warm_start` is True, the models listed in `warm_start_chain` wait for the first of their providers to finish
+    and start their search from its output graph. If every provider fails, they run from scratch.
+
+    When a `retry_policy` is given, models that crash or time out are retried once in a cheaper configuration, and the
+    retried results are flagged as `degraded`.
+
+    When a `screening` method is given, a superstructure of candidate edges is computed once for the dataset and the
+    models with `supports_superstructure` only search within it.
+
+    The score-based engines memoize their local scores per worker process. When `share_score_cache` is True, the
+    workers also share them through a manager process, so models on other workers reuse them.
+
+    When a `sample_size` controller is given, every model runs on growing stratified subsamples until its graph is
+    stable, instead of on the full dataset.
+
     Args:
         problem (Problem): The problem instance containing the dataset.
         max_seconds_model (int, optional): The maximum time allowed for each model. Defaults to 90.
         verbose (bool, optional): If True, prints warnings and errors. Defaults to False.
-        max_workers (int, optional): The maximum number of workers to use. Defaults to the number of CPU cores.
+        max_workers (int, optional): The maximum number of workers to use. Defaults to one per model, up to the
+            number of CPUs allowed by the container quota. The remaining CPUs are shared as threads within workers.
         orient_toward_target (bool, optional): If True, orients the graph toward the target. Defaults to True.
+        time_budget (int, optional): The wall-clock budget in seconds for the whole stage. Defaults to None, which
+            runs every applicable model.
+        history (PortfolioHistory, optional): Previous outcomes used by the portfolio selection. It is updated in
+            place with the outcomes of this run. Defaults to None.
+        stopping_rule (ConsensusStoppingRule, optional): Rule to stop the stage early once the completed models
+            agree. Defaults to None, which waits for every model.
+        warm_start (bool, optional): If True, chains the models following `warm_start_chain`. Defaults to False.
+        retry_policy (DegradedRetryPolicy, optional): The cheaper configuration for retrying failed models. Defaults
+            to None, which leaves failed models without a result.
+        screening (ScreeningMethod, optional): The screening test used to build the superstructure. Defaults to None,
+            which lets every model search all edges.
+        share_score_cache (bool, optional): If True, shares the local score cache between the workers. Defaults to
+            False.
+        sample_size (SampleSizeController, optional): The controller of the rows used by each model. Defaults to None,
+            which uses every row.
 
     Returns:
         Problem: The problem instance with the discovery results added.
     """
-    if max_workers is None:
-        max_workers = cpu_count()
-
     models = applyable_models(problem)
+    skipped_models = {}
 
-    discovery_results = {models[i].__name__: None for i in range(len(models))}
-    pool_args = [(problem, model, verbose, orient_toward_target) for model in models]
+    if time_budget is not None:
+        processes = plan_thread_budget(max_workers, tasks=len(models)).processes
+        models, skipped_models = select_portfolio(
+            problem.dataset, models, time_budget, max_seconds_model, max_workers=processes, history=history
+        )
+        if verbose:
+            for name, reason in skipped_models.items():
+                print(f"Warning: skipping {name}: {reason}")
 
-    with ProcessPool(max_workers=max_workers) as pool:
-        future = pool.map(_run_discover_with_model_task, pool_args, timeout=max_seconds_model)
+    superstructure = dataset_superstructure(problem.dataset, screening) if screening is not None else None
 
-        iterator = future.result()
+    # Sized after the selection, so the CPUs of skipped models go to the threads of the selected ones
+    budget = plan_thread_budget(max_workers, tasks=len(models))
 
-        while True:
-            try:
-                result = next(iterator)
-                discovery_results[result.model] = result
-            except StopIteration:
-                break
-            except TimeoutError as _error:
+    discovery_results = {models[i].__name__: None for i in range(len(models))}
+    completed = []
+    timed_out = set()
+    pids = set()
+    retried = set()
+    warm_starts = {}
+
+    # Models waiting for a warm start provider, mapped to the providers still running
+    waiting = {}
+    if warm_start:
+        names = {m.__name__ for m in models}
+        for m in models:
+            providers = [p for p in warm_start_chain.get(m.__name__, []) if p in names and p != m.__name__]
+            if m.supports_warm_start and providers:
+                waiting[m] = set(providers)
+
+    manager = Manager() if share_score_cache else None
+    score_store = manager.dict() if manager is not None else None
+    # The workers of this pool report their PIDs, so concurrent calls never kill each other's workers
+    pid_queue = Queue()
+
+    with ProcessPool(
+        max_workers=budget.processes,
+        initializer=initialize_worker,
+        initargs=(budget.threads_per_process, score_store, pid_queue),
+    ) as pool:
+
+        def schedule(model, provider_result=None, degraded=None):
+            args = (
+                problem,
+                model,
+                verbose,
+                orient_toward_target,
+                provider_result,
+                degraded,
+                superstructure,
+                sample_size,
+            )
+            timeout = (degraded.max_seconds or max_seconds_model) if degraded is not None else max_seconds_model
+            return pool.schedule(_run_discover_with_model_task, args=(args,), timeout=timeout)
+
+        pending = {schedule(model): model for model in models if model not in waiting}
+
+        while pending or waiting:
+            if not pending:
+                # Only reachable with a cyclic chain, so the remaining models run from scratch
+                pending = {schedule(dependent): dependent for dependent in waiting}
+                waiting = {}
+
+            # Poll so the PIDs of workers respawned after a timeout are collected too
+            pids |= reported_pids(pid_queue)
+            done, _ = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                model = pending.pop(future)
+                result = None
+                try:
+                    result = future.result()
+                    discovery_results[result.model] = result
+                    completed.append(result)
+                except TimeoutError as _error:
+                    timed_out.add(model.__name__)
+                    if verbose:
+                        print(f"Warning: {model.__name__} took longer than {max_seconds_model} seconds")
+                except ProcessExpired as error:
+                    print("%s. Exit code: %d" % (error, error.exitcode))
+                    # raise error
+                except Exception as error:
+                    print("Function raised %s" % error)
+                    print(getattr(error, "traceback", ""))
+                    # raise error
+
+                if result is None and retry_policy is not None and model not in retried:
+                    retried.add(model)
+                    pending[schedule(model, warm_starts.get(model), retry_policy)] = model
+                    continue
+
+                # Release the models waiting for this one, warm when it succeeded or cold once all providers failed
+                for dependent, providers in list(waiting.items()):
+                    if model.__name__ not in providers:
+                        continue
+                    providers.discard(model.__name__)
+                    if result is not None or not providers:
+                        del waiting[dependent]
+                        warm_starts[dependent] = result
+                        pending[schedule(dependent, result)] = dependent
+
+            if done and pending and stopping_rule and stopping_rule.should_stop(completed, problem.dataset.target):
                 if verbose:
-                    print(f"Warning: discovery method took longer than {max_seconds_model} seconds")
-            except ProcessExpired as error:
-                print("%s. Exit code: %d" % (error, error.exitcode))
-                # raise error
-            except Exception as error:
-                print("Function raised %s" % error)
-                print(error.traceback)
-                # raise error
-
-    return replace(problem, discovery_results=discovery_results)
+                    print(f"Consensus reached after {len(completed)} models, cancelling the remaining ones")
+                for future, model in pending.items():
+                    future.cancel()
+                    skipped_models[model.__name__] = "cancelled by the consensus stopping rule"
+                for model in waiting:
+                    skipped_models[model.__name__] = "cancelled by the consensus stopping rule"
+                pool.stop()
+                break
+
+    # Cancelled and timed out workers may leave orphaned R sessions behind
+    kill_process_groups(pids | reported_pids(pid_queue))
+    pid_queue.close()
+    if manager is not None:
+        manager.shutdown()
+
+    if history is not None:
+        executed = [m for m in models if m.__name__ not in skipped_models]
+        _update_portfolio_history(history, problem, executed, discovery_results, timed_out)
+
+    return replace(problem, discovery_results=discovery_results, skipped_models=skipped_models)
@@ -4,6 +4,7 @@ from .ccdr import CCDR
 from .cgnn import CGNN
 from .discovery_method_model import DiscoveryMethodModel
 from .fast_iamb import FAST_IAMB
+from .fges import FGES
 from .ges import GES
 from .gies import GIES
 from .grasp import GRASP
@@ -11,5 +12,7 @@ from .gs import GS
 from .iamb import IAMB
 from .inter_iamb import INTER_IAMB
 from .lingam import LINGAM
+from .mmhc import MMHC
+from .notears import NOTEARS
 from .pc import PC
 from .sam import SAM
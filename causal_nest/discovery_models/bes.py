@@ -1,8 +1,13 @@
 import networkx as nx
+import numpy as np
 from causallearn.search.ScoreBased.ExactSearch import bic_exact_search
 
 from causal_nest.dataset import Dataset, FeatureType, featured_only_data
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.graph import ArrayGraph
+from causal_nest.portfolio import CostProfile
+from causal_nest.superstructure import Superstructure
+from causal_nest.utils import adjacency_matrix
 
 
 # BIC Exact Search algorithm
@@ -12,24 +17,46 @@ class BES(DiscoveryMethodModel):
 
     This class implements the BIC Exact Search algorithm, which is used to discover causal graphs from data.
     It assumes linearity but does not assume Gaussian distribution of the data.
+    When warm started, the skeleton of the given graph is used as the super-structure restricting the search. A
+    screening superstructure restricts it further.
 
     Attributes:
         allowed_feature_types (list): List of allowed feature types for this method.
         gaussian_assumption (bool): Indicates if the method assumes Gaussian distribution.
         linearity_assumption (bool): Indicates if the method assumes linearity.
+        max_parents (Optional[int]): Maximum number of parents of each node. None means no limit.
     """
 
+    cost_profile = CostProfile(base_seconds=0.5, row_exponent=0.5, feature_exponent=0.0, exponential_in_features=True)
+    supports_warm_start = True
+    supports_superstructure = True
+
     def __init__(self):
         super().__init__(
             allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=False, linearity_assumption=True
         )
+        self.max_parents = None
+
+    def degrade(self):
+        """
+        Limits the number of parents of each node, which shrinks the parent graphs of the exact search.
 
-    def create_graph_from_data(self, dataset: Dataset):
+        Returns:
+            str: A short description of the change.
+        """
+        self.max_parents = 2
+        return "BES limited to 2 parents per node"
+
+    def create_graph_from_data(
+        self, dataset: Dataset, warm_start: nx.DiGraph = None, superstructure: Superstructure = None
+    ):
         """
         Creates a causal graph from the given dataset using the BIC Exact Search algorithm.
 
         Args:
             dataset (Dataset): The dataset from which to create the causal graph.
+            warm_start (nx.DiGraph, optional): A graph whose skeleton restricts the candidate edges. Defaults to None.
+            superstructure (Superstructure, optional): The candidate edges from a screening step. Defaults to None.
 
         Returns:
             nx.DiGraph: The discovered causal graph.
@@ -41,10 +68,18 @@ class BES(DiscoveryMethodModel):
             raise ValueError("This method can not be used with this dataset")
 
         fod = featured_only_data(dataset)
-        mapping = mapping = {i: fod.columns[i] for i in range(len(fod.columns))}
+        candidates = np.ones((len(fod.columns), len(fod.columns)), dtype=bool)
+        if warm_start is not None:
+            skeleton = adjacency_matrix(warm_start, list(fod.columns))
+            candidates &= (skeleton + skeleton.T) > 0
+        if superstructure is not None:
+            candidates &= superstructure.matrix(list(fod.columns))
+
+        super_graph = None
+        if warm_start is not None or superstructure is not None:
+            super_graph = candidates.astype(float)
 
-        g, _ = bic_exact_search(fod.to_numpy())
-        graph = nx.from_numpy_array(g, create_using=nx.DiGraph)
-        graph = nx.relabel_nodes(graph, mapping)
+        g, _ = bic_exact_search(fod.to_numpy(), super_graph=super_graph, max_parents=self.max_parents)
+        graph = ArrayGraph(g.astype(float), list(fod.columns)).to_networkx()
 
         return graph
@@ -1,34 +1,53 @@
-from cdt.causality.graph import CAM as CDT_CAM
-
-from causal_nest.dataset import Dataset, FeatureType, featured_only_data
+from causal_nest.dataset import Dataset, FeatureType, featured_only_data, subsample_dataset
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.engines import cam
+from causal_nest.graph import ArrayGraph
+from causal_nest.portfolio import CostProfile
+from causal_nest.resources import thread_limit
+from causal_nest.superstructure import Superstructure
 
 
 # Causal Additive Models algorithm
 class CAM(DiscoveryMethodModel):
     """
-    Causal Additive Models (CAM) algorithm for causal discovery.
+    Causal Additive Models (CAM) algorithm for causal discovery, running in-process on NumPy.
 
     This class implements the CAM algorithm, which is used to discover causal graphs from data.
-    It assumes both Gaussian distribution and linearity of the data.
+    The preliminary neighbourhood selection, the greedy search and the pruning share one cached spline basis per
+    variable, and the per-variable steps can run in parallel threads. The bases hold several copies of the data, so
+    larger datasets are fitted on a random sample of `max_rows` rows.
+    It fits nonlinear additive relationships with additive noise, so it assumes neither Gaussian distribution nor
+    linearity of the data.
 
     Attributes:
         allowed_feature_types (list): List of allowed feature types for this method.
         gaussian_assumption (bool): Indicates if the method assumes Gaussian distribution.
         linearity_assumption (bool): Indicates if the method assumes linearity.
+        max_neighbours (int): Number of candidate parents kept per variable by the preliminary neighbourhood selection.
+        alpha (float): Significance level of the pruning.
+        n_jobs (int): Number of threads of the per-variable steps, or None to use the thread budget of the process.
+        max_rows (int): Maximum number of rows used to fit the splines, or None to use every row.
     """
 
-    def __init__(self):
+    cost_profile = CostProfile(base_seconds=0.5, row_exponent=1.0, feature_exponent=2.0)
+    supports_superstructure = True
+
+    def __init__(self, max_neighbours: int = 10, alpha: float = 0.001, n_jobs: int = None, max_rows: int = 5000):
         super().__init__(
-            allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=True, linearity_assumption=True
+            allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=False, linearity_assumption=False
         )
+        self.max_neighbours = max_neighbours
+        self.alpha = alpha
+        self.n_jobs = n_jobs
+        self.max_rows = max_rows
 
-    def create_graph_from_data(self, dataset: Dataset):
+    def create_graph_from_data(self, dataset: Dataset, superstructure: Superstructure = None):
         """
         Creates a causal graph from the given dataset using the CAM algorithm.
 
         Args:
             dataset (Dataset): The dataset from which to create the causal graph.
+            superstructure (Superstructure, optional): The candidate edges from a screening step. Defaults to None.
 
         Returns:
             nx.DiGraph: The discovered causal graph.
@@ -39,7 +58,16 @@ class CAM(DiscoveryMethodModel):
         if not self.is_method_allowed(dataset):
             raise ValueError("This method can not be used with this dataset")
 
-        m = CDT_CAM()
-        graph = m.predict(featured_only_data(dataset))
+        fod = featured_only_data(subsample_dataset(dataset, max_rows=self.max_rows))
+        nodes = list(fod.columns)
+
+        dag = cam(
+            fod.to_numpy(dtype=float),
+            max_neighbours=self.max_neighbours,
+            alpha=self.alpha,
+            superstructure=superstructure.matrix(nodes) if superstructure is not None else None,
+            n_jobs=self.n_jobs if self.n_jobs is not None else thread_limit(),
+        )
+        graph = ArrayGraph(dag, nodes).to_networkx()
 
         return graph
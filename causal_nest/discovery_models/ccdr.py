@@ -2,6 +2,7 @@ from cdt.causality.graph import CCDr as CDT_CCDR
 
 from causal_nest.dataset import Dataset, FeatureType, featured_only_data
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.portfolio import CostProfile
 
 
 # Concave Penalized Coordinate Descent with Reparametrization algorithm
@@ -19,6 +20,8 @@ class CCDR(DiscoveryMethodModel):
         ValueError: If the method is not allowed to be used with the given dataset.
     """
 
+    cost_profile = CostProfile(overhead_seconds=3.0, base_seconds=1.0, row_exponent=1.0, feature_exponent=2.0)
+
     def __init__(self):
         super().__init__(
             allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=False, linearity_assumption=False
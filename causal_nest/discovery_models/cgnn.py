@@ -2,27 +2,52 @@ from cdt.causality.graph import CGNN as CDT_CGNN
 
 from causal_nest.dataset import Dataset, FeatureType, featured_only_data
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.portfolio import CostProfile
+from causal_nest.streaming import RowSampler, dataset_buffer
 
 
 # Causal Generative Neural Networks algorithm
 class CGNN(DiscoveryMethodModel):
     """
-    Creates a causal graph from the given dataset using the CAM algorithm.
+    Causal Generative Neural Networks (CGNN) algorithm for causal discovery.
 
-    Args:
-        dataset (Dataset): The dataset from which to create the causal graph.
+    This class implements the CGNN algorithm, which is used to discover causal graphs from data.
+    It does not assume Gaussian distribution or linearity of the data.
+    With `batch_size` or `rows_per_epoch`, the networks are trained on mini-batches streamed from the shared dataset
+    buffer, and each epoch draws `rows_per_epoch` random rows, so memory and epoch time do not grow with the rows.
 
-    Returns:
-        nx.DiGraph: The discovered causal graph.
-
-    Raises:
-        ValueError: If the method is not allowed to be used with the given dataset.
+    Attributes:
+        allowed_feature_types (list): List of allowed feature types for this method.
+        gaussian_assumption (bool): Indicates if the method assumes Gaussian distribution.
+        linearity_assumption (bool): Indicates if the method assumes linearity.
+        train_epochs (int): Number of training epochs of each run.
+        test_epochs (int): Number of test epochs of each run.
+        nruns (int): Number of runs averaged into the score of each graph.
+        batch_size (int): Number of rows of each training step, or None for full-batch training.
+        rows_per_epoch (int): Number of rows drawn for each epoch, or None for every row.
     """
 
-    def __init__(self):
+    cost_profile = CostProfile(overhead_seconds=5.0, base_seconds=300.0, row_exponent=1.0, feature_exponent=3.0)
+
+    def __init__(self, batch_size: int = None, rows_per_epoch: int = None):
         super().__init__(
             allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=False, linearity_assumption=False
         )
+        self.train_epochs = 150
+        self.test_epochs = 50
+        self.nruns = 4
+        self.batch_size = batch_size
+        self.rows_per_epoch = rows_per_epoch
+
+    def degrade(self):
+        """
+        Reduces the training epochs and the number of runs.
+
+        Returns:
+            str: A short description of the change.
+        """
+        self.train_epochs, self.test_epochs, self.nruns = 50, 20, 2
+        return "CGNN with 50 training epochs, 20 test epochs and 2 runs"
 
     def create_graph_from_data(self, dataset: Dataset):
         """
@@ -40,7 +65,17 @@ class CGNN(DiscoveryMethodModel):
         if not self.is_method_allowed(dataset):
             raise ValueError("This method can not be used with this dataset")
 
-        m = CDT_CGNN(nruns=4, nh=5, train_epochs=150, test_epochs=50, verbose=False)
-        graph = m.predict(featured_only_data(dataset))
+        m = CDT_CGNN(
+            nruns=self.nruns,
+            nh=5,
+            train_epochs=self.train_epochs,
+            test_epochs=self.test_epochs,
+            verbose=False,
+            batch_size=self.batch_size or -1,
+        )
+        data = featured_only_data(dataset)
+        if self.batch_size is not None or self.rows_per_epoch is not None:
+            data = RowSampler(dataset_buffer(dataset), list(data.columns), rows_per_epoch=self.rows_per_epoch)
+        graph = m.predict(data)
 
         return graph
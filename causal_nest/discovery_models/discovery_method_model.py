@@ -1,7 +1,8 @@
 from typing import List
 
 from causal_nest.dataset import Dataset, FeatureType
-from causal_nest.distribution import is_linear, is_normal
+from causal_nest.portfolio import CostProfile
+from causal_nest.profile import dataset_profile
 
 
 class DiscoveryMethodModel:
@@ -17,11 +18,18 @@ class DiscoveryMethodModel:
         allowed_feature_types (List[FeatureType]): List of allowed feature types for the discovery method.
         gaussian_assumption (bool): Indicates if the method assumes the data follows a Gaussian distribution.
         linearity_assumption (bool): Indicates if the method assumes linear relationships between features.
+        cost_profile (CostProfile): Rough runtime model used to skip methods that can not finish in the time budget.
+        supports_warm_start (bool): Indicates if `create_graph_from_data` accepts a `warm_start` graph to start from.
+        supports_superstructure (bool): Indicates if `create_graph_from_data` accepts a `superstructure` restricting
+            the search to its candidate edges.
     """
 
     allowed_feature_types: List[FeatureType] = list(FeatureType)
     gaussian_assumption: bool = False
     linearity_assumption: bool = False
+    cost_profile: CostProfile = CostProfile()
+    supports_warm_start: bool = False
+    supports_superstructure: bool = False
 
     def __init__(
         self,
@@ -62,6 +70,9 @@ class DiscoveryMethodModel:
             2. Validates if the data is normal if the subclass `gaussian_assumption` field is `True`;
             3. Validates if all feature pairs in the data are linear if the subclass `linearity_assumption` field is `True`;
 
+        The checks read the `DatasetProfile` cached on the dataset, so only the first method asking for a verdict
+        computes it.
+
         Args:
             dataset (Dataset): The dataset to validate.
 
@@ -70,18 +81,30 @@ class DiscoveryMethodModel:
         """
         self._check_dataset_valid(dataset)
 
-        type_condition = all(fm.type in self.allowed_feature_types for fm in dataset.feature_mapping)
-        if not type_condition:
+        profile = dataset_profile(dataset)
+        if not profile.feature_types.issubset(self.allowed_feature_types):
             return False
 
-        if self.gaussian_assumption and not is_normal(dataset):
+        if self.gaussian_assumption and not dataset_profile(dataset, normality=True).normal:
             return False
 
-        if self.linearity_assumption and not is_linear(dataset):
+        if self.linearity_assumption and not dataset_profile(dataset, linearity=True).linear:
             return False
 
         return True
 
+    def degrade(self):
+        """
+        Switches the method to a cheaper configuration, used when retrying after a failure or timeout.
+
+        Subclasses with expensive settings (training epochs, number of runs, parent limits) override it. The base
+        implementation keeps the configuration unchanged.
+
+        Returns:
+            Optional[str]: A short description of the change, or None if the configuration was kept.
+        """
+        return None
+
     def create_graph_from_data(self, data: Dataset, **kwargs):
         """
         Infers a directed graph from the data.
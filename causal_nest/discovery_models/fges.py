@@ -0,0 +1,80 @@
+import networkx as nx
+
+from causal_nest.dataset import Dataset, FeatureType, featured_only_data
+from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.engines import fges
+from causal_nest.graph import ArrayGraph
+from causal_nest.portfolio import CostProfile
+from causal_nest.resources import thread_limit
+from causal_nest.superstructure import Superstructure
+from causal_nest.utils import adjacency_matrix
+
+
+# Fast Greedy Equivalence Search algorithm
+class FGES(DiscoveryMethodModel):
+    """
+    Fast Greedy Equivalence Search (FGES) algorithm for causal discovery, running in-process on NumPy.
+
+    This class implements FGES, a variant of GES that caches the score deltas of the insert and delete operators in a
+    priority queue and only recomputes the ones touched by the last operator. The local scores are a decomposable BIC
+    computed from the covariance matrix, so it only accepts continuous features and assumes Gaussian distribution of
+    the data.
+    When warm started, the search starts from the given graph instead of the empty graph.
+
+    Attributes:
+        allowed_feature_types (list): List of allowed feature types for this method.
+        gaussian_assumption (bool): Indicates if the method assumes Gaussian distribution.
+        linearity_assumption (bool): Indicates if the method assumes linearity.
+        penalty_discount (float): Multiplier of the BIC penalty. Higher values give sparser graphs.
+        n_jobs (int): Number of threads scoring the candidate operators, or None to use the thread budget of the
+            process.
+    """
+
+    cost_profile = CostProfile(base_seconds=0.5, row_exponent=0.0, feature_exponent=2.5)
+    supports_warm_start = True
+    supports_superstructure = True
+
+    def __init__(self, penalty_discount: float = 1.0, n_jobs: int = None):
+        super().__init__(
+            allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=True, linearity_assumption=False
+        )
+        self.penalty_discount = penalty_discount
+        self.n_jobs = n_jobs
+
+    def create_graph_from_data(
+        self, dataset: Dataset, warm_start: nx.DiGraph = None, superstructure: Superstructure = None
+    ):
+        """
+        Creates a causal graph from the given dataset using the FGES algorithm.
+
+        Args:
+            dataset (Dataset): The dataset from which to create the causal graph.
+            warm_start (nx.DiGraph, optional): An acyclic graph to start the search from. Defaults to None.
+            superstructure (Superstructure, optional): The candidate edges from a screening step. Defaults to None.
+
+        Returns:
+            nx.DiGraph: The discovered causal graph, with both directions for the edges left undirected.
+
+        Raises:
+            ValueError: If the method is not allowed to be used with the given dataset.
+        """
+        if not self.is_method_allowed(dataset):
+            raise ValueError("This method can not be used with this dataset")
+
+        fod = featured_only_data(dataset)
+        nodes = list(fod.columns)
+
+        initial_graph = None
+        if warm_start is not None and nx.is_directed_acyclic_graph(warm_start):
+            initial_graph = adjacency_matrix(warm_start, nodes)
+
+        cpdag = fges(
+            fod.to_numpy(dtype=float),
+            penalty_discount=self.penalty_discount,
+            superstructure=superstructure.matrix(nodes) if superstructure is not None else None,
+            initial_graph=initial_graph,
+            n_jobs=self.n_jobs if self.n_jobs is not None else thread_limit(),
+        )
+        graph = ArrayGraph(cpdag, nodes).to_networkx()
+
+        return graph
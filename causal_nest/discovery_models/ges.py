@@ -2,6 +2,10 @@ from cdt.causality.graph import GES as CDT_GES
 
 from causal_nest.dataset import Dataset, FeatureType, featured_only_data
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.engines import fges
+from causal_nest.graph import ArrayGraph
+from causal_nest.portfolio import CostProfile
+from causal_nest.resources import thread_limit
 
 
 # Greedy Equivalance Search algorithm
@@ -11,19 +15,34 @@ class GES(DiscoveryMethodModel):
 
     This class implements the GES algorithm, which is used to discover causal graphs from data.
     It assumes both Gaussian distribution and linearity of the data.
+    The search runs either in R's pcalg through cdt or in the native FGES engine. The native engine scores with a
+    Gaussian BIC, so with it only continuous features are allowed.
 
     Attributes:
         allowed_feature_types (list): List of allowed feature types for this method.
         gaussian_assumption (bool): Indicates if the method assumes Gaussian distribution.
         linearity_assumption (bool): Indicates if the method assumes linearity.
+        backend (str): Either "pcalg" or "fges".
+        n_jobs (int): Number of threads scoring the candidate operators of the "fges" backend, or None to use the
+            thread budget of the process.
     """
 
-    def __init__(self):
+    cost_profile = CostProfile(overhead_seconds=3.0, base_seconds=2.0, row_exponent=1.0, feature_exponent=3.0)
+
+    backends = ["pcalg", "fges"]
+
+    def __init__(self, backend: str = "pcalg", n_jobs: int = None):
+        if backend not in self.backends:
+            raise ValueError(f"Argument 'backend' must be one of {self.backends}")
         super().__init__(
-            allowed_feature_types=[FeatureType.CONTINUOUS, FeatureType.CATEGORICAL],
+            allowed_feature_types=(
+                [FeatureType.CONTINUOUS] if backend == "fges" else [FeatureType.CONTINUOUS, FeatureType.CATEGORICAL]
+            ),
             gaussian_assumption=True,
             linearity_assumption=False,
         )
+        self.backend = backend
+        self.n_jobs = n_jobs
 
     def create_graph_from_data(self, dataset: Dataset):
         """
@@ -41,7 +60,13 @@ class GES(DiscoveryMethodModel):
         if not self.is_method_allowed(dataset):
             raise ValueError("This method can not be used with this dataset")
 
+        fod = featured_only_data(dataset)
+
+        if self.backend == "fges":
+            cpdag = fges(fod.to_numpy(dtype=float), n_jobs=self.n_jobs if self.n_jobs is not None else thread_limit())
+            return ArrayGraph(cpdag, list(fod.columns)).to_networkx()
+
         m = CDT_GES()
-        graph = m.predict(featured_only_data(dataset))
+        graph = m.predict(fod)
 
         return graph
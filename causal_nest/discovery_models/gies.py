@@ -2,6 +2,7 @@ from cdt.causality.graph import GIES as CDT_GIES
 
 from causal_nest.dataset import Dataset, FeatureType, featured_only_data
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.portfolio import CostProfile
 
 
 # Greedy Interventional Equivalance Search Algorithm
@@ -18,6 +19,8 @@ class GIES(DiscoveryMethodModel):
         linearity_assumption (bool): Indicates if the method assumes linearity.
     """
 
+    cost_profile = CostProfile(overhead_seconds=3.0, base_seconds=2.0, row_exponent=1.0, feature_exponent=3.0)
+
     def __init__(self):
         super().__init__(
             allowed_feature_types=[FeatureType.CONTINUOUS, FeatureType.CATEGORICAL],
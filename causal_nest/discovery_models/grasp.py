@@ -1,8 +1,9 @@
-import networkx as nx
 from causallearn.search.PermutationBased.GRaSP import grasp
 
 from causal_nest.dataset import Dataset, FeatureType, featured_only_data
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.graph import ArrayGraph
+from causal_nest.portfolio import CostProfile
 
 
 # Greedy Relaxation of the Sparsest Permutation algorithm
@@ -19,6 +20,8 @@ class GRASP(DiscoveryMethodModel):
         linearity_assumption (bool): Indicates if the method assumes linearity.
     """
 
+    cost_profile = CostProfile(base_seconds=2.0, row_exponent=0.2, feature_exponent=3.0)
+
     def __init__(self):
         super().__init__(
             allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=False, linearity_assumption=False
@@ -41,10 +44,7 @@ class GRASP(DiscoveryMethodModel):
             raise ValueError("This method can not be used with this dataset")
 
         fod = featured_only_data(dataset)
-        mapping = mapping = {i: fod.columns[i] for i in range(len(fod.columns))}
-
         g = grasp(fod.to_numpy())
-        graph = nx.from_numpy_array(g.graph, create_using=nx.DiGraph)
-        graph = nx.relabel_nodes(graph, mapping)
+        graph = ArrayGraph(g.graph.astype(float), list(fod.columns)).to_networkx()
 
         return graph
@@ -2,6 +2,7 @@ from cdt.causality.graph.bnlearn import IAMB as CDT_IAMB
 
 from causal_nest.dataset import Dataset, featured_only_data
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.portfolio import CostProfile
 
 
 # Incremental Association Markov Blanket algorithm
@@ -18,6 +19,8 @@ class IAMB(DiscoveryMethodModel):
         linearity_assumption (bool): Indicates if the method assumes linearity.
     """
 
+    cost_profile = CostProfile(overhead_seconds=3.0, base_seconds=0.5, row_exponent=1.0, feature_exponent=2.0)
+
     def __init__(self):
         super().__init__(gaussian_assumption=False, linearity_assumption=False)
 
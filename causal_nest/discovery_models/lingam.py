@@ -1,32 +1,42 @@
-from cdt.causality.graph import LiNGAM as CDT_LINGAM
-
 from causal_nest.dataset import Dataset, FeatureType, featured_only_data
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.engines import direct_lingam
+from causal_nest.graph import ArrayGraph
+from causal_nest.portfolio import CostProfile
+from causal_nest.resources import thread_limit
 
 
 # Linear Non-Gaussian Acyclic Model algorithm
 class LINGAM(DiscoveryMethodModel):
     """
-    Creates a causal graph from the given dataset using the INTER_IAMB algorithm.
-
-    Args:
-        dataset (Dataset): The dataset from which to create the causal graph.
-
-    Returns:
-        nx.DiGraph: The discovered causal graph.
-
-    Raises:
-        ValueError: If the method is not allowed to be used with the given dataset.
+    DirectLiNGAM algorithm for causal discovery, running in-process on NumPy.
+
+    This class implements the DirectLiNGAM variant of the Linear Non-Gaussian Acyclic Model, which estimates a causal
+    order by repeatedly finding the most exogenous variable and then prunes the edges allowed by that order.
+    It assumes linearity of the data and identifies the order from non-Gaussian noise, so it does not assume Gaussian
+    distribution.
+
+    Attributes:
+        allowed_feature_types (list): List of allowed feature types for this method.
+        gaussian_assumption (bool): Indicates if the method assumes Gaussian distribution.
+        linearity_assumption (bool): Indicates if the method assumes linearity.
+        alpha (float): Significance level used to prune the edges of the causal order.
+        n_jobs (int): Number of threads evaluating the candidate variables of each step, or None to use the thread
+            budget of the process.
     """
 
-    def __init__(self):
+    cost_profile = CostProfile(base_seconds=0.2, row_exponent=1.0, feature_exponent=3.0)
+
+    def __init__(self, alpha: float = 0.01, n_jobs: int = None):
         super().__init__(
-            allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=True, linearity_assumption=True
+            allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=False, linearity_assumption=True
         )
+        self.alpha = alpha
+        self.n_jobs = n_jobs
 
     def create_graph_from_data(self, dataset: Dataset):
         """
-        Creates a causal graph from the given dataset using the INTER_IAMB algorithm.
+        Creates a causal graph from the given dataset using the DirectLiNGAM algorithm.
 
         Args:
             dataset (Dataset): The dataset from which to create the causal graph.
@@ -40,7 +50,12 @@ class LINGAM(DiscoveryMethodModel):
         if not self.is_method_allowed(dataset):
             raise ValueError("This method can not be used with this dataset")
 
-        m = CDT_LINGAM()
-        graph = m.predict(featured_only_data(dataset))
+        fod = featured_only_data(dataset)
+        _, adjacency = direct_lingam(
+            fod.to_numpy(dtype=float),
+            alpha=self.alpha,
+            n_jobs=self.n_jobs if self.n_jobs is not None else thread_limit(),
+        )
+        graph = ArrayGraph(adjacency != 0, list(fod.columns)).to_networkx()
 
         return graph
@@ -0,0 +1,86 @@
+from causal_nest.dataset import Dataset, FeatureType, featured_only_data
+from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.engines import DiscreteBIC, GaussianBIC, ci_tests, mmhc
+from causal_nest.graph import ArrayGraph
+from causal_nest.portfolio import CostProfile
+from causal_nest.resources import thread_limit
+from causal_nest.superstructure import Superstructure
+
+
+# Max-Min Hill-Climbing algorithm
+class MMHC(DiscoveryMethodModel):
+    """
+    Max-Min Hill-Climbing (MMHC) algorithm for causal discovery, running in-process on NumPy.
+
+    This hybrid algorithm first learns the candidate parents and children of every variable with conditional
+    independence tests, then runs a BIC hill climb restricted to those candidates. It scales to a few hundred variables.
+    With the default Fisher z-test it assumes linearity but does not assume Gaussian distribution of the data. The
+    random Fourier feature kernel test ("rff") also detects nonlinear dependence, so it makes no linearity assumption.
+    With a contingency table test ("gsq" or "chisq") it accepts categorical, discrete and binned continuous features,
+    scores the hill climb with a discrete BIC and makes no linearity assumption.
+
+    Attributes:
+        allowed_feature_types (list): List of allowed feature types for this method.
+        gaussian_assumption (bool): Indicates if the method assumes Gaussian distribution.
+        linearity_assumption (bool): Indicates if the method assumes linearity.
+        alpha (float): Significance level of the conditional independence tests.
+        max_k (int): Maximum size of the conditioning sets.
+        ci_test (str): Name of the conditional independence test, one of `causal_nest.engines.ci_tests`.
+        n_jobs (int): Number of threads learning the candidate sets, or None to use the thread budget of the process.
+    """
+
+    cost_profile = CostProfile(base_seconds=0.2, row_exponent=0.2, feature_exponent=2.0)
+    supports_superstructure = True
+
+    def __init__(self, alpha: float = 0.05, max_k: int = 3, ci_test: str = "fisherz", n_jobs: int = None):
+        if ci_test not in ci_tests:
+            raise ValueError(f"Argument 'ci_test' must be one of {list(ci_tests)}")
+        test_class = ci_tests[ci_test]
+        super().__init__(
+            allowed_feature_types=(
+                [FeatureType.CATEGORICAL, FeatureType.DISCRETE, FeatureType.CONTINUOUS]
+                if test_class.discrete
+                else [FeatureType.CONTINUOUS]
+            ),
+            gaussian_assumption=False,
+            linearity_assumption=test_class.assumes_linearity,
+        )
+        self.alpha = alpha
+        self.max_k = max_k
+        self.ci_test = ci_test
+        self.n_jobs = n_jobs
+
+    def create_graph_from_data(self, dataset: Dataset, superstructure: Superstructure = None):
+        """
+        Creates a causal graph from the given dataset using the MMHC algorithm.
+
+        Args:
+            dataset (Dataset): The dataset from which to create the causal graph.
+            superstructure (Superstructure, optional): The candidate edges from a screening step. Defaults to None.
+
+        Returns:
+            nx.DiGraph: The discovered causal graph.
+
+        Raises:
+            ValueError: If the method is not allowed to be used with the given dataset.
+        """
+        if not self.is_method_allowed(dataset):
+            raise ValueError("This method can not be used with this dataset")
+
+        fod = featured_only_data(dataset)
+        nodes = list(fod.columns)
+        test_class = ci_tests[self.ci_test]
+        x = fod.to_numpy() if test_class.discrete else fod.to_numpy(dtype=float)
+
+        dag = mmhc(
+            x,
+            alpha=self.alpha,
+            max_k=self.max_k,
+            test=test_class(x),
+            score=DiscreteBIC(x) if test_class.discrete else GaussianBIC(x),
+            superstructure=superstructure.matrix(nodes) if superstructure is not None else None,
+            n_jobs=self.n_jobs if self.n_jobs is not None else thread_limit(),
+        )
+        graph = ArrayGraph(dag, nodes).to_networkx()
+
+        return graph
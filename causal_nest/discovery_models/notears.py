@@ -0,0 +1,73 @@
+import numpy as np
+
+from causal_nest.dataset import Dataset, FeatureType, featured_only_data
+from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.engines import notears_linear
+from causal_nest.graph import ArrayGraph
+from causal_nest.portfolio import CostProfile
+from causal_nest.superstructure import Superstructure
+
+
+# Non-combinatorial Optimization via Trace Exponential and Augmented lagRangian for Structure learning
+class NOTEARS(DiscoveryMethodModel):
+    """
+    NOTEARS algorithm for causal discovery, running in-process on NumPy and SciPy.
+
+    This class implements the linear NOTEARS method, which turns the search over DAGs into a continuous least squares
+    problem with an acyclicity constraint. It works on the covariance matrix of the standardized data, so its
+    iterations cost the same for any number of rows, and it scales to hundreds of variables.
+    It assumes linearity but does not assume Gaussian distribution of the data.
+
+    Attributes:
+        allowed_feature_types (list): List of allowed feature types for this method.
+        gaussian_assumption (bool): Indicates if the method assumes Gaussian distribution.
+        linearity_assumption (bool): Indicates if the method assumes linearity.
+        lambda1 (float): L1 penalty of the edge weights.
+        acyclicity (str): Acyclicity penalty, either "expm" or "polynomial".
+        w_threshold (float): Minimum absolute weight of the returned edges.
+    """
+
+    cost_profile = CostProfile(base_seconds=1.0, row_exponent=0.0, feature_exponent=3.0)
+    supports_superstructure = True
+
+    def __init__(self, lambda1: float = 0.1, acyclicity: str = "expm", w_threshold: float = 0.3):
+        super().__init__(
+            allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=False, linearity_assumption=True
+        )
+        self.lambda1 = lambda1
+        self.acyclicity = acyclicity
+        self.w_threshold = w_threshold
+
+    def create_graph_from_data(self, dataset: Dataset, superstructure: Superstructure = None):
+        """
+        Creates a causal graph from the given dataset using the NOTEARS algorithm.
+
+        Args:
+            dataset (Dataset): The dataset from which to create the causal graph.
+            superstructure (Superstructure, optional): The candidate edges from a screening step. Defaults to None.
+
+        Returns:
+            nx.DiGraph: The discovered causal graph.
+
+        Raises:
+            ValueError: If the method is not allowed to be used with the given dataset.
+        """
+        if not self.is_method_allowed(dataset):
+            raise ValueError("This method can not be used with this dataset")
+
+        fod = featured_only_data(dataset)
+        nodes = list(fod.columns)
+
+        # Standardized, so the L1 penalty and the weight threshold do not depend on the scale of each column
+        covariance = np.corrcoef(fod.to_numpy(dtype=float), rowvar=False).reshape(len(nodes), len(nodes))
+
+        w = notears_linear(
+            np.nan_to_num(covariance),
+            lambda1=self.lambda1,
+            acyclicity=self.acyclicity,
+            w_threshold=self.w_threshold,
+            superstructure=superstructure.matrix(nodes) if superstructure is not None else None,
+        )
+        graph = ArrayGraph(w != 0, nodes).to_networkx()
+
+        return graph
@@ -2,6 +2,7 @@ from cdt.causality.graph import PC as CDT_PC
 
 from causal_nest.dataset import Dataset, FeatureType, featured_only_data
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.portfolio import CostProfile
 
 
 # Peter-Clark algorithm
@@ -18,6 +19,8 @@ class PC(DiscoveryMethodModel):
         linearity_assumption (bool): Indicates if the method assumes linearity.
     """
 
+    cost_profile = CostProfile(overhead_seconds=3.0, base_seconds=1.0, row_exponent=1.0, feature_exponent=3.0)
+
     def __init__(self):
         super().__init__(
             allowed_feature_types=[FeatureType.CONTINUOUS, FeatureType.DISCRETE],
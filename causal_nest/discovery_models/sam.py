@@ -1,7 +1,13 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
 from cdt.causality.graph import SAM as CDT_SAM
 
 from causal_nest.dataset import Dataset, FeatureType, featured_only_data
 from causal_nest.discovery_models.discovery_method_model import DiscoveryMethodModel
+from causal_nest.graph import ArrayGraph
+from causal_nest.portfolio import CostProfile
+from causal_nest.streaming import dataset_buffer, subsample_rows
 
 
 # Structural Agnostic Model
@@ -11,17 +17,41 @@ class SAM(DiscoveryMethodModel):
 
     This class implements the SAM algorithm, which is used to discover causal graphs from data.
     It assumes both Gaussian distribution and linearity of the data.
+    Each run trains on its own random subsample of `rows_per_run` rows of the shared dataset buffer, in mini-batches of
+    `batch_size` rows, and the adjacency matrices of the runs are averaged, so memory does not grow with the rows.
 
     Attributes:
         allowed_feature_types (list): List of allowed feature types for this method.
         gaussian_assumption (bool): Indicates if the method assumes Gaussian distribution.
         linearity_assumption (bool): Indicates if the method assumes linearity.
+        train_epochs (int): Number of training epochs of each run.
+        test_epochs (int): Number of test epochs of each run.
+        nruns (int): Number of runs averaged into the final graph.
+        batch_size (int): Number of rows of each training step, or None for full-batch training.
+        rows_per_run (int): Number of rows subsampled for each run, or None for every row.
     """
 
-    def __init__(self):
+    cost_profile = CostProfile(overhead_seconds=5.0, base_seconds=120.0, row_exponent=1.0, feature_exponent=2.0)
+
+    def __init__(self, batch_size: int = None, rows_per_run: int = None):
         super().__init__(
             allowed_feature_types=[FeatureType.CONTINUOUS], gaussian_assumption=False, linearity_assumption=False
         )
+        self.train_epochs = 750
+        self.test_epochs = 250
+        self.nruns = 8
+        self.batch_size = batch_size
+        self.rows_per_run = rows_per_run
+
+    def degrade(self):
+        """
+        Reduces the training epochs and the number of runs.
+
+        Returns:
+            str: A short description of the change.
+        """
+        self.train_epochs, self.test_epochs, self.nruns = 150, 50, 2
+        return "SAM with 150 training epochs, 50 test epochs and 2 runs"
 
     def create_graph_from_data(self, dataset: Dataset):
         """
@@ -39,7 +69,26 @@ class SAM(DiscoveryMethodModel):
         if not self.is_method_allowed(dataset):
             raise ValueError("This method can not be used with this dataset")
 
-        m = CDT_SAM(mixed_data=True, train_epochs=750, test_epochs=250, nruns=8)
-        graph = m.predict(featured_only_data(dataset))
+        if self.batch_size is None and self.rows_per_run is None:
+            m = CDT_SAM(mixed_data=True, train_epochs=self.train_epochs, test_epochs=self.test_epochs, nruns=self.nruns)
+            return m.predict(featured_only_data(dataset))
+
+        buffer = dataset_buffer(dataset)
+        nodes = list(featured_only_data(dataset).columns)
+        m = CDT_SAM(
+            mixed_data=True,
+            train_epochs=self.train_epochs,
+            test_epochs=self.test_epochs,
+            nruns=1,
+            batch_size=self.batch_size or -1,
+        )
+
+        adjacency = np.zeros((len(nodes), len(nodes)))
+        for run in range(self.nruns):
+            rows = subsample_rows(len(buffer), self.rows_per_run, random_state=run)
+            run_graph = m.predict(pd.DataFrame(buffer[rows], columns=nodes))
+            adjacency += nx.to_numpy_array(run_graph, nodelist=nodes)
+
+        graph = ArrayGraph(adjacency / self.nruns, nodes).to_networkx()
 
         return graph
@@ -1,8 +1,7 @@
-from itertools import combinations
+from typing import Tuple
 
 import numpy as np
-from scipy.stats import normaltest
-from sklearn import linear_model
+from scipy.stats import f, normaltest
 
 from causal_nest.dataset import Dataset, FeatureType
 
@@ -12,13 +11,21 @@ normality_checkable_types = [
 ]
 
 
-def is_normal(dataset: Dataset, threshold: float = 0.05):
+def is_normal(dataset: Dataset, threshold: float = 0.05, max_rows: int = 5000, random_state: int = 0):
     """
     Checks if the features in the dataset follow a normal distribution.
 
+    Every numeric feature is tested at once with a column-wise D'Agostino-Pearson test. Datasets with more than
+    `max_rows` rows are tested on a fixed-size uniform sample of rows, as a reservoir sample would give. The test only
+    depends on the sample skewness and kurtosis, whose standard errors under normality are about sqrt(6 / m) and
+    sqrt(24 / m) for m rows: 0.035 and 0.069 with the default 5000 rows. Larger deviations are still detected, while
+    the full data would reject negligible ones. The verdict is cached on the dataset.
+
     Args:
         dataset (Dataset): The dataset to check for normality.
         threshold (float, optional): The p-value threshold for the normality test. Defaults to 0.05.
+        max_rows (int, optional): The number of rows sampled from larger datasets. Defaults to 5000.
+        random_state (int, optional): The random seed of the sample. Defaults to 0.
 
     Returns:
         bool: True if all features pass the normality test, False otherwise.
@@ -29,22 +36,113 @@ def is_normal(dataset: Dataset, threshold: float = 0.05):
     if not isinstance(dataset, Dataset):
         raise ValueError("Argument 'dataset' must be a CausalNest `Dataset` instance")
 
+    key = ("is_normal", threshold, max_rows, random_state)
+    if key in dataset.cache:
+        return dataset.cache[key]
+
     features_to_test = [f.feature for f in dataset.feature_mapping if f.type in normality_checkable_types]
+    data = dataset.data
+    if len(data) > max_rows:
+        # Only the sampled rows are selected and converted, so large frames are never copied whole
+        rows = np.random.default_rng(random_state).choice(len(data), size=max_rows, replace=False)
+        data = data.iloc[np.sort(rows)]
+    values = data[features_to_test].to_numpy(dtype=float)
+
+    p_values = normaltest(values, axis=0).pvalue if features_to_test else np.array([])
+
+    dataset.cache[key] = bool(np.all(p_values >= threshold))
+    return dataset.cache[key]
+
+
+def pairwise_linear_fits(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fits the least squares line of every column on every other column in closed form.
+
+    The fits only depend on the column means and the covariance matrix. The entry (i, j) of each result refers to the
+    regression of column j on column i. Constant regressors get a zero slope. Since each line passes through the means,
+    the mean residuals are zero unless the data holds missing or infinite values.
 
-    p_values = [normaltest(dataset.data[f].values).pvalue for f in features_to_test]
+    Args:
+        values (np.ndarray): The data, with one column per variable.
 
-    return all(pv >= threshold for pv in p_values)
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The intercepts, the slopes and the mean residuals.
+    """
+    means = values.mean(axis=0)
+    covariance = np.atleast_2d(np.cov(values, rowvar=False, bias=True))
+    variances = np.diag(covariance)[:, None]
+    slopes = np.divide(covariance, variances, out=np.zeros_like(covariance), where=variances > 0)
+    intercepts = means[None, :] - slopes * means[:, None]
+    residuals = means[None, :] - (intercepts + slopes * means[:, None])
+    return intercepts, slopes, residuals
 
 
-def is_linear(dataset: Dataset):
+def nonlinearity_tests(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tests every pairwise linear fit against a cubic fit, as in Ramsey's RESET test.
+
+    For each regressor, the regressions of every other column on it share one basis, so a single least squares solve
+    fits all of them. Besides the p-values, the share of the variance of each standardized column that the cubic terms
+    explain measures how far the relationship is from linear.
+
+    Args:
+        values (np.ndarray): The data, with one column per variable.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The p-values of the F tests and the explained variance gains, with the
+            regression of column j on column i at (i, j). The diagonal holds p-values of 1 and gains of 0.
+    """
+    n, p = values.shape
+    standardized = (values - values.mean(axis=0)) / np.where(values.std(axis=0) > 0, values.std(axis=0), 1)
+    p_values = np.ones((p, p))
+    gains = np.zeros((p, p))
+
+    for i in range(p):
+        x = standardized[:, i]
+        linear = np.c_[np.ones(n), x]
+        cubic = np.c_[linear, x**2, x**3]
+        rss_linear = np.linalg.lstsq(linear, standardized, rcond=None)[1]
+        rss_cubic = np.linalg.lstsq(cubic, standardized, rcond=None)[1]
+        if rss_linear.size == 0 or rss_cubic.size == 0:
+            continue
+        statistic = ((rss_linear - rss_cubic) / 2) / np.maximum(rss_cubic / (n - 4), np.finfo(float).tiny)
+        p_values[i] = f.sf(statistic, 2, n - 4)
+        p_values[i, i] = 1
+        gains[i] = (rss_linear - rss_cubic) / n
+        gains[i, i] = 0
+
+    return p_values, gains
+
+
+def is_linear(
+    dataset: Dataset,
+    threshold: float = 0.05,
+    test_nonlinearity: bool = False,
+    alpha: float = 0.01,
+    min_gain: float = 0.05,
+    max_rows: int = 2000,
+    random_state: int = 0,
+):
     """
     Checks if the relationships between features in the dataset are linear.
 
+    Every pairwise linear fit comes from the means and covariance matrix of the data, and a pair is linear when the
+    mean of its residuals is at most `threshold`. With `test_nonlinearity`, each pair must also pass a RESET test
+    against a cubic fit on a sample of `max_rows` rows: a pair is nonlinear when the cubic terms explain at least
+    `min_gain` of the variance and the test rejects at the family-wise level `alpha`, with a Bonferroni correction over
+    the pairs. The verdict is cached on the dataset.
+
     Args:
         dataset (Dataset): The dataset to check for linearity.
+        threshold (float, optional): The threshold for the mean of residuals of each pair. Defaults to 0.05.
+        test_nonlinearity (bool, optional): If True, also tests every pair against a cubic fit. Defaults to False.
+        alpha (float, optional): The family-wise significance level of the nonlinearity test. Defaults to 0.01.
+        min_gain (float, optional): The share of variance the cubic terms must explain. Defaults to 0.05.
+        max_rows (int, optional): The number of rows sampled for the nonlinearity test. Defaults to 2000.
+        random_state (int, optional): The random seed of the sample. Defaults to 0.
 
     Returns:
-        bool: True if all feature pairs have a linear relationship, False otherwise.
+        bool: True if all relationships are linear, False otherwise.
 
     Raises:
         ValueError: If the provided dataset is not an instance of `Dataset`.
@@ -52,8 +150,26 @@ def is_linear(dataset: Dataset):
     if not isinstance(dataset, Dataset):
         raise ValueError("Argument 'dataset' must be a CausalNest `Dataset` instance")
 
-    pairs = list(combinations([f.feature for f in dataset.feature_mapping] + [dataset.target], 2))
-    return all([check_linearity(dataset.data[x].values, dataset.data[y].values) for x, y in pairs])
+    key = ("is_linear", threshold, test_nonlinearity, alpha, min_gain, max_rows, random_state)
+    if key in dataset.cache:
+        return dataset.cache[key]
+
+    columns = list(dict.fromkeys([f.feature for f in dataset.feature_mapping] + [dataset.target]))
+    values = dataset.data[columns].to_numpy(dtype=float)
+
+    _, _, residuals = pairwise_linear_fits(values)
+    linear = bool(np.all(residuals[~np.eye(len(columns), dtype=bool)] <= threshold))
+
+    # The F test needs more rows than the four coefficients of the cubic fit
+    if linear and test_nonlinearity and len(columns) > 1 and len(values) > 4:
+        if len(values) > max_rows:
+            values = values[np.sort(np.random.default_rng(random_state).choice(len(values), max_rows, replace=False))]
+        p_values, gains = nonlinearity_tests(values)
+        nonlinear = (gains >= min_gain) & (p_values < alpha / (len(columns) * (len(columns) - 1)))
+        linear = not nonlinear.any()
+
+    dataset.cache[key] = linear
+    return linear
 
 
 def check_linearity(x, y, threshold=0.05):
@@ -68,11 +184,5 @@ def check_linearity(x, y, threshold=0.05):
     Returns:
         bool: True if the relationship is linear, False otherwise.
     """
-    reshaped_x = x.reshape(-1, 1)
-    reshaped_y = y.reshape(-1, 1)
-
-    regr = linear_model.LinearRegression()
-    regr.fit(reshaped_x, reshaped_y)
-    y_pred = regr.predict(reshaped_x)
-    residuals = reshaped_y - y_pred
-    return np.mean(residuals) <= threshold
+    _, _, residuals = pairwise_linear_fits(np.c_[np.ravel(x), np.ravel(y)].astype(float))
+    return residuals[0, 1] <= threshold
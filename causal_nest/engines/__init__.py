@@ -0,0 +1,19 @@
+from .cam import SplineBases, cam
+from .ci_tests import (
+    ChiSquare,
+    CITest,
+    DiscreteCITest,
+    FisherZ,
+    GSquare,
+    RandomFourierCITest,
+    ci_tests,
+    encode_discrete,
+    joint_codes,
+)
+from .direct_lingam import causal_order, direct_lingam, prune_order
+from .fges import DiscreteBIC, GaussianBIC, fges
+from .metrics import auc_pr, reachability, shd, sid
+from .mmhc import hill_climb, mmhc, mmpc, mmpc_skeleton
+from .notears import notears_linear
+from .pdag import dag_to_cpdag, meek_rules, pdag_to_dag
+from .score_cache import LocalScoreCache, configure_score_cache, dataset_fingerprint, score_cache, score_cache_delta
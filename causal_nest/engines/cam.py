@@ -0,0 +1,248 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+from scipy.stats import f as f_distribution
+
+
+class SplineBases:
+    """
+    Cubic spline expansions of every column of a dataset, computed once and shared by all the CAM phases.
+
+    Each column is expanded into a truncated power basis with knots at its quantiles, centered and orthonormalized, so
+    an additive regression on a set of columns is a least squares fit on the stacked bases.
+
+    Attributes:
+        x (np.ndarray): The centered data.
+        bases (np.ndarray): Array of shape (p, n, m) with the orthonormal basis of each column.
+    """
+
+    def __init__(self, x: np.ndarray, n_knots: int = 5):
+        x = np.asarray(x, dtype=float)
+        self.x = x - x.mean(axis=0)
+
+        std = self.x.std(axis=0)
+        z = self.x / np.where(std > 0, std, 1)
+        knots = np.quantile(z, np.linspace(0, 1, n_knots + 2)[1:-1], axis=0)
+
+        # Shape (p, n, 3 + n_knots), batched over the columns
+        expansions = np.concatenate(
+            [
+                np.stack([z, z**2, z**3], axis=-1),
+                np.clip(z[:, :, None] - knots.T[None, :, :], 0, None) ** 3,
+            ],
+            axis=-1,
+        ).transpose(1, 0, 2)
+        expansions -= expansions.mean(axis=1, keepdims=True)
+        self.bases, _ = np.linalg.qr(expansions)
+
+    @property
+    def n(self) -> int:
+        """The number of rows."""
+        return self.x.shape[0]
+
+    @property
+    def m(self) -> int:
+        """The size of the basis of each column."""
+        return self.bases.shape[2]
+
+    def design(self, columns: List[int]) -> np.ndarray:
+        """
+        Returns an orthonormal basis of the additive model on the given columns.
+
+        Args:
+            columns (List[int]): The regressor columns.
+
+        Returns:
+            np.ndarray: Array of shape (n, k) spanning the stacked bases of the columns.
+        """
+        if not columns:
+            return np.zeros((self.n, 0))
+        q, r = np.linalg.qr(np.hstack([self.bases[c] for c in columns]))
+        return q[:, np.abs(np.diag(r)) > 1e-10]
+
+    def rss(self, node: int, columns: List[int]) -> float:
+        """
+        Returns the residual sum of squares of the additive regression of a column on other columns.
+
+        Args:
+            node (int): The response column.
+            columns (List[int]): The regressor columns.
+
+        Returns:
+            float: The residual sum of squares.
+        """
+        y = self.x[:, node]
+        q = self.design(columns)
+        return float(y @ y - np.sum((q.T @ y) ** 2))
+
+    def rss_with_each(self, node: int, columns: List[int], candidates: List[int]) -> np.ndarray:
+        """
+        Returns the residual sum of squares after adding each candidate to the regressors, in one batched fit.
+
+        Args:
+            node (int): The response column.
+            columns (List[int]): The current regressor columns.
+            candidates (List[int]): The columns to add, one at a time.
+
+        Returns:
+            np.ndarray: The residual sum of squares of each candidate.
+        """
+        y = self.x[:, node]
+        z = self.design(columns)
+        residual = y - z @ (z.T @ y)
+
+        # Orthogonalize every candidate basis against the current design, then project the residual on it
+        extra = self.bases[candidates]
+        extra = extra - z[None, :, :] @ (z.T[None, :, :] @ extra)
+        q, r = np.linalg.qr(extra)
+        independent = np.abs(np.diagonal(r, axis1=1, axis2=2)) > 1e-10
+        projections = np.einsum("cnm,n->cm", q, residual) * independent
+        return residual @ residual - np.sum(projections**2, axis=1)
+
+
+def _map(n_jobs: int, fn, items):
+    if n_jobs > 1:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return list(executor.map(fn, items))
+    return [fn(i) for i in items]
+
+
+def preliminary_neighbourhoods(bases: SplineBases, max_neighbours: int = 10, n_jobs: int = 1) -> np.ndarray:
+    """
+    Selects, for every variable, the candidate parents explaining most of its variance in a univariate additive fit.
+
+    Args:
+        bases (SplineBases): The cached spline bases.
+        max_neighbours (int, optional): The number of candidate parents kept per variable. Defaults to 10.
+        n_jobs (int, optional): The number of threads, one variable at a time. Defaults to 1.
+
+    Returns:
+        np.ndarray: Boolean matrix where the entry (i, j) is True if i is a candidate parent of j.
+    """
+    p = bases.x.shape[1]
+
+    def select(j):
+        others = [i for i in range(p) if i != j]
+        explained = bases.rss(j, []) - bases.rss_with_each(j, [], others)
+        keep = np.zeros(p, dtype=bool)
+        keep[np.array(others)[np.argsort(-explained)[:max_neighbours]]] = True
+        return keep
+
+    return np.column_stack(_map(n_jobs, select, range(p))) if p > 1 else np.zeros((p, p), dtype=bool)
+
+
+def greedy_dag_search(bases: SplineBases, candidates: np.ndarray, penalty: float = 1.0, n_jobs: int = 1) -> np.ndarray:
+    """
+    Adds, one at a time, the edge with the best BIC gain that keeps the graph acyclic.
+
+    After an edge i -> j is added, only the gains of the edges into j are recomputed, in one batched fit.
+
+    Args:
+        bases (SplineBases): The cached spline bases.
+        candidates (np.ndarray): Boolean matrix of the edges allowed in the search.
+        penalty (float, optional): Multiplier of the BIC penalty of each added spline basis. Defaults to 1.0.
+        n_jobs (int, optional): The number of threads computing the initial gains. Defaults to 1.
+
+    Returns:
+        np.ndarray: Boolean adjacency matrix of the DAG, where (i, j) means i -> j.
+    """
+    n, m, p = bases.n, bases.m, bases.x.shape[1]
+    dag = np.zeros((p, p), dtype=bool)
+    # reaches[i, j] is True if there is a directed path from i to j (including i == j)
+    reaches = np.eye(p, dtype=bool)
+    rss = np.array([bases.rss(j, []) for j in range(p)])
+    gains = np.full((p, p), -np.inf)
+
+    def column_gains(j):
+        parents = list(np.flatnonzero(dag[:, j]))
+        options = [i for i in range(p) if candidates[i, j] and not dag[i, j] and i != j]
+        column = np.full(p, -np.inf)
+        if options:
+            new_rss = np.clip(bases.rss_with_each(j, parents, options), 1e-12, None)
+            column[options] = n * np.log(rss[j] / new_rss) - penalty * m * np.log(n)
+        return column
+
+    gains[:] = np.column_stack(_map(n_jobs, column_gains, range(p)))
+
+    while True:
+        allowed = np.where(reaches.T, -np.inf, gains)
+        i, j = np.unravel_index(np.argmax(allowed), allowed.shape)
+        if allowed[i, j] <= 0:
+            break
+
+        dag[i, j] = True
+        reaches |= np.outer(reaches[:, i], reaches[j, :])
+        rss[j] = bases.rss(j, list(np.flatnonzero(dag[:, j])))
+        gains[:, j] = column_gains(j)
+
+    return dag
+
+
+def prune_dag(bases: SplineBases, dag: np.ndarray, alpha: float = 0.001, n_jobs: int = 1) -> np.ndarray:
+    """
+    Removes the parents whose additive component is not significant, with one F-test per edge.
+
+    Args:
+        bases (SplineBases): The cached spline bases.
+        dag (np.ndarray): Boolean adjacency matrix of the DAG.
+        alpha (float, optional): The significance level of the F-tests. Defaults to 0.001.
+        n_jobs (int, optional): The number of threads, one variable at a time. Defaults to 1.
+
+    Returns:
+        np.ndarray: The pruned adjacency matrix.
+    """
+    n, m, p = bases.n, bases.m, dag.shape[0]
+
+    def prune(j):
+        parents = list(np.flatnonzero(dag[:, j]))
+        keep = dag[:, j].copy()
+        if not parents:
+            return keep
+
+        full = max(bases.rss(j, parents), 1e-12)
+        dof = max(n - m * len(parents) - 1, 1)
+        for k in parents:
+            reduced = bases.rss(j, [c for c in parents if c != k])
+            statistic = ((reduced - full) / m) / (full / dof)
+            if f_distribution.sf(statistic, m, dof) > alpha:
+                keep[k] = False
+        return keep
+
+    return np.column_stack(_map(n_jobs, prune, range(p))) if p else dag
+
+
+def cam(
+    x: np.ndarray,
+    max_neighbours: int = 10,
+    n_knots: int = 5,
+    penalty: float = 1.0,
+    alpha: float = 0.001,
+    superstructure: np.ndarray = None,
+    n_jobs: int = 1,
+) -> np.ndarray:
+    """
+    Runs Causal Additive Models (Bühlmann et al., 2014) with cubic spline regressions.
+
+    Args:
+        x (np.ndarray): The data, with one column per variable.
+        max_neighbours (int, optional): The number of candidate parents kept per variable by the preliminary
+            neighbourhood selection. Defaults to 10.
+        n_knots (int, optional): The number of knots of each spline basis. Defaults to 5.
+        penalty (float, optional): Multiplier of the BIC penalty of the greedy search. Defaults to 1.0.
+        alpha (float, optional): The significance level of the pruning. Defaults to 0.001.
+        superstructure (np.ndarray, optional): Boolean matrix of the candidate edges. Defaults to None, which allows
+            every edge.
+        n_jobs (int, optional): The number of threads of the per-variable steps. Defaults to 1.
+
+    Returns:
+        np.ndarray: Boolean adjacency matrix of the DAG, where (i, j) means i -> j.
+    """
+    bases = SplineBases(x, n_knots=n_knots)
+
+    candidates = preliminary_neighbourhoods(bases, max_neighbours=max_neighbours, n_jobs=n_jobs)
+    if superstructure is not None:
+        candidates &= np.asarray(superstructure, dtype=bool)
+
+    dag = greedy_dag_search(bases, candidates, penalty=penalty, n_jobs=n_jobs)
+    return prune_dag(bases, dag, alpha=alpha, n_jobs=n_jobs)
@@ -0,0 +1,366 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from scipy.stats import chi2, gamma, norm
+
+
+class CITest:
+    """
+    Base class of the conditional independence tests used by the constraint-based engines.
+
+    Subclasses implement `pvalues`, which tests one variable against several others given the same conditioning set,
+    so the work shared by those tests (such as residualizing on the conditioning set) is done once.
+
+    Attributes:
+        n_variables (int): The number of variables of the data.
+    """
+
+    n_variables: int
+    discrete: bool = False
+    """Whether the test treats every variable as categorical, so it does not assume linear relations."""
+    assumes_linearity: bool = False
+    """Whether the test only detects linear dependence."""
+
+    def pvalues(self, x: int, ys: Sequence[int], z: Sequence[int] = ()) -> np.ndarray:
+        """
+        Tests the independence of `x` and each of `ys` given `z`.
+
+        Args:
+            x (int): The column index of the first variable.
+            ys (Sequence[int]): The column indexes of the variables tested against `x`.
+            z (Sequence[int], optional): The column indexes of the conditioning set. Defaults to ().
+
+        Returns:
+            np.ndarray: The p-value of each test. Low values reject independence.
+        """
+        raise NotImplementedError
+
+    def pvalue(self, x: int, y: int, z: Sequence[int] = ()) -> float:
+        """
+        Tests the independence of `x` and `y` given `z`.
+
+        Args:
+            x (int): The column index of the first variable.
+            y (int): The column index of the second variable.
+            z (Sequence[int], optional): The column indexes of the conditioning set. Defaults to ().
+
+        Returns:
+            float: The p-value of the test.
+        """
+        return float(self.pvalues(x, [y], z)[0])
+
+
+class FisherZ(CITest):
+    """
+    Fisher z-test of zero partial correlation, for linear Gaussian data.
+
+    The correlation matrix is computed once. The partial correlations of `x` with every tested variable given the same
+    conditioning set come from a single Schur complement of that matrix.
+    """
+
+    assumes_linearity = True
+
+    def __init__(self, data: np.ndarray):
+        data = np.asarray(data, dtype=float)
+        self.n = data.shape[0]
+        self.n_variables = data.shape[1]
+        self.correlation = np.nan_to_num(np.corrcoef(data, rowvar=False)).reshape(self.n_variables, self.n_variables)
+
+    def pvalues(self, x: int, ys: Sequence[int], z: Sequence[int] = ()) -> np.ndarray:
+        ys, z = list(ys), list(z)
+        a = [x] + ys
+        s = self.correlation[np.ix_(a, a)]
+        if z:
+            s_az = self.correlation[np.ix_(a, z)]
+            s = s - s_az @ np.linalg.pinv(self.correlation[np.ix_(z, z)]) @ s_az.T
+
+        d = np.sqrt(np.clip(np.diag(s), 1e-12, None))
+        r = np.clip(s[0, 1:] / (d[0] * d[1:]), -0.999999, 0.999999)
+        statistic = np.sqrt(max(self.n - len(z) - 3, 1)) * np.abs(np.arctanh(r))
+        return 2 * norm.sf(statistic)
+
+
+def encode_discrete(data: np.ndarray, max_levels: int = 10, bins: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encodes every column of the data as small integer codes.
+
+    Columns with at most `max_levels` distinct values keep one code per value. Columns with more values, usually
+    continuous features of a mixed dataset, are binned at their quantiles.
+
+    Args:
+        data (np.ndarray): The data, with one column per variable.
+        max_levels (int, optional): The maximum number of distinct values of a column encoded as is. Defaults to 10.
+        bins (int, optional): The number of quantile bins of the other columns. Defaults to 5.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The integer codes, with the shape of `data`, and the number of levels of each
+            column.
+    """
+    data = np.asarray(data)
+    codes = np.empty(data.shape, dtype=np.int64)
+    for j in range(data.shape[1]):
+        values, inverse = np.unique(data[:, j], return_inverse=True)
+        if len(values) > max_levels:
+            edges = np.quantile(data[:, j].astype(float), np.linspace(0, 1, bins + 1)[1:-1])
+            _, inverse = np.unique(np.searchsorted(edges, data[:, j].astype(float)), return_inverse=True)
+        codes[:, j] = inverse.ravel()
+    return codes, codes.max(axis=0, initial=-1) + 1
+
+
+def joint_codes(codes: np.ndarray, levels: np.ndarray, columns: Sequence[int]) -> Tuple[np.ndarray, int]:
+    """
+    Numbers the combinations of values of several encoded columns, keeping only the observed ones.
+
+    The combinations are mixed-radix keys, compacted with a `np.bincount` when the key space is small and with a
+    one-dimensional `np.unique` otherwise.
+
+    Args:
+        codes (np.ndarray): The integer codes of the data, see `encode_discrete`.
+        levels (np.ndarray): The number of levels of each column.
+        columns (Sequence[int]): The column indexes to combine.
+
+    Returns:
+        Tuple[np.ndarray, int]: The combination code of each row and the number of observed combinations.
+    """
+    key = np.zeros(len(codes), dtype=np.int64)
+    size = 1
+    for c in columns:
+        key = key * int(levels[c]) + codes[:, c]
+        size *= int(levels[c])
+        if size > 1 << 40:
+            _, key = np.unique(key, return_inverse=True)
+            size = int(key.max()) + 1
+
+    if size <= max(4 * len(codes), 1 << 16):
+        present = np.bincount(key, minlength=size) > 0
+        return (np.cumsum(present) - 1)[key], int(present.sum())
+    _, key = np.unique(key, return_inverse=True)
+    return key, int(key.max(initial=-1)) + 1
+
+
+class DiscreteCITest(CITest):
+    """
+    Contingency table test of conditional independence, for categorical and discrete data.
+
+    The columns are encoded once as integer codes. The strata of a conditioning set are computed once and cached, and
+    the tables of `x` against several variables are built by a single `np.bincount` on combined keys, so the marginal
+    tables of each stratum are sums over that array.
+
+    Attributes:
+        codes (np.ndarray): The integer codes of the data.
+        levels (np.ndarray): The number of levels of each column.
+        statistic (str): The statistic of the test, "g2" or "chi2".
+    """
+
+    discrete = True
+    statistic = "g2"
+    max_table_size = 1 << 22
+    max_cached_strata = 4096
+
+    def __init__(self, data: np.ndarray, max_levels: int = 10, bins: int = 5):
+        self.codes, self.levels = encode_discrete(data, max_levels=max_levels, bins=bins)
+        self.n, self.n_variables = self.codes.shape
+        self._strata: Dict[Tuple[int, ...], Tuple[np.ndarray, int]] = {}
+
+    def strata(self, z: Sequence[int]) -> Tuple[np.ndarray, int]:
+        """
+        Returns the stratum of every row for a conditioning set, numbering only the observed combinations.
+
+        Args:
+            z (Sequence[int]): The column indexes of the conditioning set.
+
+        Returns:
+            Tuple[np.ndarray, int]: The stratum code of each row and the number of strata.
+        """
+        key = tuple(sorted(z))
+        if key not in self._strata:
+            if len(self._strata) >= self.max_cached_strata:
+                self._strata.clear()
+            self._strata[key] = joint_codes(self.codes, self.levels, key) if key else (np.zeros(self.n, np.int64), 1)
+        return self._strata[key]
+
+    def pvalues(self, x: int, ys: Sequence[int], z: Sequence[int] = ()) -> np.ndarray:
+        ys = list(ys)
+        strata, n_strata = self.strata(z)
+        rx = int(self.levels[x])
+        ry = int(self.levels[ys].max()) if ys else 1
+        xz = strata * rx + self.codes[:, x]
+        table_size = n_strata * rx * ry
+
+        result = np.empty(len(ys))
+        chunk = max(1, self.max_table_size // table_size)
+        for start in range(0, len(ys), chunk):
+            batch = ys[start : start + chunk]
+            keys = (xz[None, :] * ry + self.codes[:, batch].T) + table_size * np.arange(len(batch))[:, None]
+            counts = np.bincount(keys.ravel(), minlength=len(batch) * table_size)
+            result[start : start + len(batch)] = self._pvalues(counts.reshape(len(batch), n_strata, rx, ry))
+        return result
+
+    def _pvalues(self, counts: np.ndarray) -> np.ndarray:
+        n_xz = counts.sum(axis=3, keepdims=True)
+        n_yz = counts.sum(axis=2, keepdims=True)
+        n_z = n_xz.sum(axis=2, keepdims=True)
+        expected = n_xz * n_yz / np.maximum(n_z, 1)
+
+        observed = counts > 0
+        if self.statistic == "g2":
+            terms = 2 * counts * np.log(np.where(observed, counts, 1) / np.where(observed, expected, 1))
+        else:
+            terms = np.where(expected > 0, (counts - expected) ** 2 / np.where(expected > 0, expected, 1), 0)
+        statistic = terms.sum(axis=(1, 2, 3))
+
+        # Degrees of freedom from the levels observed in each stratum
+        dof = ((np.count_nonzero(n_xz, axis=2) - 1).clip(0) * (np.count_nonzero(n_yz, axis=3) - 1).clip(0)).sum(
+            axis=(1, 2)
+        )
+        return np.where(dof > 0, chi2.sf(statistic, np.maximum(dof, 1)), 1.0)
+
+
+class GSquare(DiscreteCITest):
+    """G-test (log-likelihood ratio) of conditional independence on contingency tables."""
+
+    statistic = "g2"
+
+
+class ChiSquare(DiscreteCITest):
+    """Pearson chi-square test of conditional independence on contingency tables."""
+
+    statistic = "chi2"
+
+
+class RandomFourierCITest(CITest):
+    """
+    Approximate kernel test of conditional independence with random Fourier features (RCoT, Strobl et al., 2019).
+
+    Every variable is standardized and given random frequencies for its median-heuristic bandwidth, and its own
+    feature map is cached and reused by every test. The features of a conditioning set are the cosines of the summed
+    projections of its variables, which approximates a Gaussian kernel on their joint values, and their orthonormal
+    basis is cached per set. The features of `x` and of every tested variable are residualized on that basis, and the
+    statistic is n times the squared Frobenius norm of their cross-covariance, compared with a gamma approximation of
+    its null distribution. The cost is linear in the rows, and the feature products behind the null distribution are
+    accumulated over blocks of rows, so a test never holds more than `max_block_bytes` of them.
+
+    Attributes:
+        n_features (int): The number of features of `x` and of each tested variable.
+        n_z_features (int): The number of features of the conditioning set.
+        frequencies (np.ndarray): Array of shape (p, n_z_features) with the random frequencies of each variable.
+    """
+
+    max_cached_bases = 64
+    max_block_bytes = 64 * 2**20
+
+    def __init__(self, data: np.ndarray, n_features: int = 5, n_z_features: int = 100, random_state: int = 0):
+        data = np.asarray(data, dtype=float)
+        self.n, self.n_variables = data.shape
+        self.n_features = n_features
+        self.n_z_features = n_z_features
+
+        std = data.std(axis=0)
+        self.data = (data - data.mean(axis=0)) / np.where(std > 0, std, 1)
+        sample = self.data[: min(self.n, 500)]
+        bandwidths = np.median(np.abs(sample[:, None, :] - sample[None, :, :]), axis=(0, 1))
+        bandwidths = np.where(bandwidths > 0, bandwidths, 1)
+
+        rng = np.random.default_rng(random_state)
+        self.frequencies = rng.normal(size=(self.n_variables, max(n_features, n_z_features))) / bandwidths[:, None]
+        self.phases = rng.uniform(0, 2 * np.pi, size=self.frequencies.shape[1])
+        self._features: Dict[int, np.ndarray] = {}
+        self._bases: Dict[Tuple[int, ...], np.ndarray] = {}
+
+    def features(self, columns: Sequence[int], n_features: int) -> np.ndarray:
+        """
+        Returns the centered random Fourier features of the joint values of some columns.
+
+        Args:
+            columns (Sequence[int]): The column indexes.
+            n_features (int): The number of features.
+
+        Returns:
+            np.ndarray: Array of shape (n, n_features).
+        """
+        columns = list(columns)
+        phase = self.data[:, columns] @ self.frequencies[columns, :n_features] + self.phases[:n_features]
+        f = np.sqrt(2 / n_features) * np.cos(phase)
+        return f - f.mean(axis=0)
+
+    def variable_features(self, v: int) -> np.ndarray:
+        """
+        Returns the features of a single variable, cached per variable.
+
+        Args:
+            v (int): The column index.
+
+        Returns:
+            np.ndarray: Array of shape (n, n_features).
+        """
+        if v not in self._features:
+            self._features[v] = self.features([v], self.n_features)
+        return self._features[v]
+
+    def basis(self, z: Sequence[int]) -> np.ndarray:
+        """
+        Returns an orthonormal basis of the features of a conditioning set, cached per set.
+
+        Args:
+            z (Sequence[int]): The column indexes of the conditioning set.
+
+        Returns:
+            np.ndarray: Array of shape (n, k) with k at most `n_z_features`.
+        """
+        key = tuple(sorted(z))
+        if key not in self._bases:
+            if len(self._bases) >= self.max_cached_bases:
+                self._bases.clear()
+            q, r = np.linalg.qr(self.features(key, self.n_z_features))
+            self._bases[key] = q[:, np.abs(np.diag(r)) > 1e-10]
+        return self._bases[key]
+
+    def _row_blocks(self, n_ys: int) -> List[slice]:
+        """Splits the rows in blocks whose feature products for `n_ys` variables fit in `max_block_bytes`."""
+        rows = max(1, self.max_block_bytes // (8 * max(n_ys, 1) * self.n_features**2))
+        return [slice(start, start + rows) for start in range(0, self.n, rows)]
+
+    def pvalues(self, x: int, ys: Sequence[int], z: Sequence[int] = ()) -> np.ndarray:
+        ys = list(ys)
+        d = self.n_features
+        features = [self.variable_features(v) for v in [x] + ys]
+        blocks = self._row_blocks(len(ys))
+
+        # Features of x and of every y side by side, residualized on the conditioning set one block of rows at a time
+        if z:
+            q = self.basis(z)
+            projection = sum(q[b].T @ np.hstack([v[b] for v in features]) for b in blocks)
+
+        covariance = np.zeros((d, len(ys) * d))
+        product_sum = np.zeros((len(ys), d * d))
+        product_outer = np.zeros((len(ys), d * d, d * d))
+        for b in blocks:
+            f = np.hstack([v[b] for v in features])
+            if z:
+                f = f - q[b] @ projection
+            fx = f[:, :d]
+            fy = f[:, d:].reshape(len(f), len(ys), d)
+            covariance += fx.T @ f[:, d:]
+
+            # Products of the features of x and y, whose covariance weighs the chi-squares of the null distribution
+            products = (fy.transpose(1, 0, 2)[:, :, None, :] * fx[None, :, :, None]).reshape(len(ys), len(f), d * d)
+            product_sum += products.sum(axis=1)
+            product_outer += products.transpose(0, 2, 1) @ products
+
+        covariance = covariance.reshape(d, len(ys), d) / self.n
+        statistic = self.n * np.sum(covariance**2, axis=(0, 2))
+
+        # Null distribution: weighted sum of chi-squares, weights the eigenvalues of the covariance of the products
+        product_mean = product_sum / self.n
+        product_covariance = product_outer / self.n - product_mean[:, :, None] * product_mean[:, None, :]
+        mean = np.trace(product_covariance, axis1=1, axis2=2)
+        variance = 2 * np.sum(product_covariance**2, axis=(1, 2))
+
+        valid = (mean > 1e-12) & (variance > 1e-24)
+        shape = np.where(valid, mean**2 / np.where(valid, variance, 1), 1)
+        scale = np.where(valid, variance / np.where(valid, mean, 1), 1)
+        return np.where(valid, gamma.sf(statistic, shape, scale=scale), 1.0)
+
+
+ci_tests = {"fisherz": FisherZ, "gsq": GSquare, "chisq": ChiSquare, "rff": RandomFourierCITest}
+"""Conditional independence tests selectable by name in the constraint-based models."""
@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+from scipy.stats import norm
+
+# Constants of the maximum entropy approximation of Hyvärinen (1998)
+_ENTROPY_K1 = 79.047
+_ENTROPY_K2 = 7.4129
+_ENTROPY_GAMMA = 0.37457
+
+
+def _entropy(u: np.ndarray) -> np.ndarray:
+    """Approximate differential entropy of each standardized column of `u`."""
+    return (
+        (1 + np.log(2 * np.pi)) / 2
+        - _ENTROPY_K1 * (np.mean(np.logaddexp(u, -u) - np.log(2), axis=0) - _ENTROPY_GAMMA) ** 2
+        - _ENTROPY_K2 * np.mean(u * np.exp(-(u**2) / 2), axis=0) ** 2
+    )
+
+
+def _standardize(x: np.ndarray) -> np.ndarray:
+    std = x.std(axis=0)
+    return (x - x.mean(axis=0)) / np.where(std > 0, std, 1)
+
+
+class _Serial:
+    """Stand-in for an executor that maps in the calling thread."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def map(self, fn, iterable):
+        return map(fn, iterable)
+
+
+def _residual_entropies(x: np.ndarray, corr: np.ndarray, i: int) -> np.ndarray:
+    """
+    Entropies of the standardized residuals of column `i` regressed on every column of `x`.
+
+    The columns of `x` must be standardized, so each regression coefficient is the correlation.
+    """
+    c = corr[i]
+    scale = np.sqrt(np.clip(1 - c**2, 1e-12, None))
+    entropies = _entropy((x[:, [i]] - x * c) / scale)
+    entropies[i] = 0.0
+    return entropies
+
+
+def causal_order(x: np.ndarray, n_jobs: int = 1) -> List[int]:
+    """
+    Estimates the causal order of the columns of `x` with the DirectLiNGAM procedure.
+
+    At each step, the most exogenous of the remaining columns is found with the pairwise likelihood ratio measure,
+    computed for all candidates from a single matrix of residual entropies. The remaining columns are then replaced by
+    their residuals on it, which the next step reuses instead of refitting on the original data.
+
+    Args:
+        x (np.ndarray): The data, with one column per variable.
+        n_jobs (int, optional): The number of threads evaluating the candidate columns of each step. Defaults to 1.
+
+    Returns:
+        List[int]: The column indexes, from the most exogenous to the most endogenous.
+    """
+    residuals = _standardize(np.asarray(x, dtype=float))
+    remaining = list(range(residuals.shape[1]))
+    order = []
+
+    with ThreadPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else _Serial() as executor:
+        while len(remaining) > 1:
+            corr = residuals.T @ residuals / len(residuals)
+            entropies = _entropy(residuals)
+
+            # residual_entropies[i, j] is the entropy of the residual of i on j, shared by candidates i and j
+            residual_entropies = np.vstack(
+                list(executor.map(lambda i: _residual_entropies(residuals, corr, i), range(residuals.shape[1])))
+            )
+
+            # Pairwise likelihood ratio measure of Hyvarinen and Smith (2013) for every candidate at once
+            diff = (entropies[None, :] + residual_entropies) - (entropies[:, None] + residual_entropies.T)
+            measures = -np.sum(np.minimum(0, diff) ** 2, axis=1)
+
+            chosen = int(np.argmax(measures))
+            order.append(remaining.pop(chosen))
+
+            # Regress the chosen column out of the others and keep them standardized for the next step
+            keep = np.arange(residuals.shape[1]) != chosen
+            residuals = _standardize(residuals[:, keep] - np.outer(residuals[:, chosen], corr[chosen, keep]))
+
+    return order + remaining
+
+
+def prune_order(x: np.ndarray, order: List[int], alpha: float = 0.01) -> np.ndarray:
+    """
+    Fits every variable on all its predecessors in the causal order and keeps the significant coefficients.
+
+    All the regressions come from a single LDL decomposition of the covariance matrix in causal order, and the
+    standard errors from the cumulative sums of its inverse, so no regression is fitted separately.
+
+    Args:
+        x (np.ndarray): The data, with one column per variable.
+        order (List[int]): The causal order of the columns.
+        alpha (float, optional): The significance level of the t-tests on the coefficients. Defaults to 0.01.
+
+    Returns:
+        np.ndarray: The weighted adjacency matrix, where the entry (i, j) is the coefficient of the edge i -> j.
+    """
+    x = np.asarray(x, dtype=float)
+    n, p = x.shape
+    covariance = np.cov(x[:, order], rowvar=False, bias=True).reshape(p, p)
+
+    # With U = L / diag(L) unit lower triangular, covariance = U D U^T, so x = (I - U^-1) x + e with var(e) = D
+    cholesky = np.linalg.cholesky(covariance + 1e-10 * np.eye(p))
+    d = np.diag(cholesky) ** 2
+    l_inv = np.linalg.inv(cholesky / np.diag(cholesky))
+    coefficients = np.eye(p) - l_inv
+
+    # The leading blocks of U^-1 invert the leading blocks of the covariance, so the diagonal of the inverse of the
+    # predecessors covariance of the k-th variable is the cumulative sum of the first k rows
+    inverse_diagonals = np.vstack([np.zeros(p), np.cumsum(l_inv**2 / d[:, None], axis=0)[:-1]])
+    standard_errors = np.sqrt(np.clip(d[:, None] * inverse_diagonals / n, 1e-300, None))
+
+    significant = np.abs(coefficients / standard_errors) > norm.ppf(1 - alpha / 2)
+    coefficients = np.where(significant & np.tri(p, k=-1, dtype=bool), coefficients, 0)
+
+    adjacency = np.zeros((p, p))
+    adjacency[np.ix_(order, order)] = coefficients.T
+    return adjacency
+
+
+def direct_lingam(x: np.ndarray, alpha: float = 0.01, n_jobs: int = 1) -> Tuple[List[int], np.ndarray]:
+    """
+    Runs DirectLiNGAM (Shimizu et al., 2011) on the given data.
+
+    Args:
+        x (np.ndarray): The data, with one column per variable.
+        alpha (float, optional): The significance level used to prune the edges. Defaults to 0.01.
+        n_jobs (int, optional): The number of threads evaluating the candidate columns of each step. Defaults to 1.
+
+    Returns:
+        Tuple[List[int], np.ndarray]: The causal order and the weighted adjacency matrix, where the entry (i, j) is
+            the coefficient of the edge i -> j.
+    """
+    order = causal_order(x, n_jobs=n_jobs)
+    return order, prune_order(x, order, alpha=alpha)
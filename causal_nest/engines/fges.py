@@ -0,0 +1,412 @@
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from causal_nest.engines.ci_tests import encode_discrete, joint_codes
+from causal_nest.engines.pdag import dag_to_cpdag, neighbors, parents, pdag_to_dag
+from causal_nest.engines.score_cache import LocalScoreCache, dataset_fingerprint, score_cache
+
+Operator = Tuple[float, frozenset]
+"""A score delta and the subset (T for inserts, H for deletes) of the best operator for a pair of nodes."""
+
+
+class GaussianBIC:
+    """
+    Decomposable BIC score of a linear Gaussian model, computed from the covariance matrix.
+
+    The local scores go through a `LocalScoreCache` keyed by the dataset fingerprint, so an operator evaluated again
+    after an unrelated change of the graph, or by another model on the same data, costs a lookup.
+
+    Attributes:
+        n (int): The number of rows of the data.
+        covariance (np.ndarray): The covariance matrix of the data.
+        penalty_discount (float): Multiplier of the BIC penalty. Higher values give sparser graphs.
+        fingerprint (str): The fingerprint of the data, part of the cache keys.
+        cache (LocalScoreCache): The local score cache.
+    """
+
+    def __init__(self, x: np.ndarray, penalty_discount: float = 1.0, cache: LocalScoreCache = None):
+        x = np.asarray(x, dtype=float)
+        self.n = len(x)
+        self.covariance = np.cov(x, rowvar=False, bias=True).reshape(x.shape[1], x.shape[1])
+        self.penalty_discount = penalty_discount
+        self.fingerprint = dataset_fingerprint(x)
+        self.cache = cache or score_cache()
+
+    @property
+    def score_type(self) -> str:
+        """The name of the score in the cache keys, which includes its parameters."""
+        return f"gaussian_bic({self.penalty_discount})"
+
+    def local_score(self, node: int, parent_set: Iterable[int]) -> float:
+        """
+        Returns the BIC of a node given its parents. Higher is better.
+
+        Args:
+            node (int): The column index of the node.
+            parent_set (Iterable[int]): The column indexes of its parents.
+
+        Returns:
+            float: The local score.
+        """
+        parent_set = frozenset(parent_set)
+        key = (self.fingerprint, self.score_type, node, parent_set)
+        return self.cache.get_or_compute(key, lambda: self._compute(node, sorted(parent_set)))
+
+    def local_scores(self, node: int, parent_sets: Iterable[Iterable[int]]) -> np.ndarray:
+        """
+        Returns the BIC of a node given each of several parent sets, solving the uncached regressions in one batch.
+
+        Args:
+            node (int): The column index of the node.
+            parent_sets (Iterable[Iterable[int]]): The column indexes of the parents, one collection per score.
+
+        Returns:
+            np.ndarray: The local scores, in the order of `parent_sets`.
+        """
+        keys = [(self.fingerprint, self.score_type, node, frozenset(parent_set)) for parent_set in parent_sets]
+        return np.array(
+            self.cache.get_or_compute_many(
+                keys, lambda missed: self._compute_many(node, [sorted(k[3]) for k in missed])
+            )
+        )
+
+    def _compute(self, node: int, parent_list: list) -> float:
+        variance = self.covariance[node, node]
+        if parent_list:
+            s_pp = self.covariance[np.ix_(parent_list, parent_list)]
+            s_py = self.covariance[parent_list, node]
+            variance -= s_py @ np.linalg.lstsq(s_pp, s_py, rcond=None)[0]
+
+        variance = max(variance, 1e-12)
+        return -0.5 * self.n * np.log(variance) - 0.5 * self.penalty_discount * np.log(self.n) * (len(parent_list) + 1)
+
+    def _compute_many(self, node: int, parent_lists: List[list]) -> np.ndarray:
+        sizes = np.array([len(parent_list) for parent_list in parent_lists])
+        size = sizes.max()
+        variances = np.full(len(parent_lists), self.covariance[node, node])
+
+        if size:
+            # Shorter parent lists are padded with an identity block and a zero right-hand side, which adds zero
+            # coefficients without changing the others, so every regression fits in one stacked solve
+            s_pp = np.tile(np.eye(size), (len(parent_lists), 1, 1))
+            s_py = np.zeros((len(parent_lists), size))
+            for i, parent_list in enumerate(parent_lists):
+                k = len(parent_list)
+                s_pp[i, :k, :k] = self.covariance[np.ix_(parent_list, parent_list)]
+                s_py[i, :k] = self.covariance[parent_list, node]
+            try:
+                beta = np.linalg.solve(s_pp, s_py[..., None])[..., 0]
+            except np.linalg.LinAlgError:
+                # Collinear parents: the pseudo-inverse gives the minimum norm fit, as `lstsq` does
+                beta = (np.linalg.pinv(s_pp, rcond=np.finfo(float).eps * size) @ s_py[..., None])[..., 0]
+            variances -= np.einsum("ij,ij->i", s_py, beta)
+
+        variances = np.maximum(variances, 1e-12)
+        return -0.5 * self.n * np.log(variances) - 0.5 * self.penalty_discount * np.log(self.n) * (sizes + 1)
+
+
+class DiscreteBIC:
+    """
+    Decomposable BIC score of a categorical Bayesian network, computed from contingency tables of integer codes.
+
+    It has the interface of `GaussianBIC` and shares the same `LocalScoreCache`.
+
+    Attributes:
+        n (int): The number of rows of the data.
+        codes (np.ndarray): The integer codes of the data, see `encode_discrete`.
+        levels (np.ndarray): The number of levels of each column.
+        penalty_discount (float): Multiplier of the BIC penalty. Higher values give sparser graphs.
+        fingerprint (str): The fingerprint of the codes, part of the cache keys.
+        cache (LocalScoreCache): The local score cache.
+    """
+
+    def __init__(
+        self, x: np.ndarray, penalty_discount: float = 1.0, cache: LocalScoreCache = None, max_levels: int = 10
+    ):
+        self.codes, self.levels = encode_discrete(x, max_levels=max_levels)
+        self.n = len(self.codes)
+        self.penalty_discount = penalty_discount
+        self.fingerprint = dataset_fingerprint(self.codes)
+        self.cache = cache or score_cache()
+
+    @property
+    def score_type(self) -> str:
+        """The name of the score in the cache keys, which includes its parameters."""
+        return f"discrete_bic({self.penalty_discount})"
+
+    def local_score(self, node: int, parent_set: Iterable[int]) -> float:
+        """
+        Returns the BIC of a node given its parents. Higher is better.
+
+        Args:
+            node (int): The column index of the node.
+            parent_set (Iterable[int]): The column indexes of its parents.
+
+        Returns:
+            float: The local score.
+        """
+        parent_set = frozenset(parent_set)
+        key = (self.fingerprint, self.score_type, node, parent_set)
+        return self.cache.get_or_compute(key, lambda: self._compute(node, sorted(parent_set)))
+
+    def local_scores(self, node: int, parent_sets: Iterable[Iterable[int]]) -> np.ndarray:
+        """
+        Returns the BIC of a node given each of several parent sets.
+
+        Args:
+            node (int): The column index of the node.
+            parent_sets (Iterable[Iterable[int]]): The column indexes of the parents, one collection per score.
+
+        Returns:
+            np.ndarray: The local scores, in the order of `parent_sets`.
+        """
+        keys = [(self.fingerprint, self.score_type, node, frozenset(parent_set)) for parent_set in parent_sets]
+        return np.array(
+            self.cache.get_or_compute_many(keys, lambda missed: [self._compute(node, sorted(k[3])) for k in missed])
+        )
+
+    def _compute(self, node: int, parent_list: list) -> float:
+        r = int(self.levels[node])
+        configurations, q = joint_codes(self.codes, self.levels, parent_list)
+
+        counts = np.bincount(configurations * r + self.codes[:, node], minlength=q * r).reshape(q, r)
+        totals = counts.sum(axis=1, keepdims=True)
+        log_likelihood = np.sum(counts * np.log(np.where(counts > 0, counts, 1) / np.maximum(totals, 1)))
+        return log_likelihood - 0.5 * self.penalty_discount * np.log(self.n) * (r - 1) * q
+
+
+def _has_semi_directed_path(successors: List[List[int]], source: int, target: int, blocked: set) -> bool:
+    visited = {source}
+    frontier = [source]
+    while frontier:
+        node = frontier.pop()
+        for nxt in successors[node]:
+            if nxt == target:
+                return True
+            if nxt not in visited and nxt not in blocked:
+                visited.add(nxt)
+                frontier.append(nxt)
+    return False
+
+
+def _best_operators(
+    score: GaussianBIC, y: int, sources: List[int], subsets: List[List[frozenset]], bases: List[List[set]], sign: int
+) -> List[Optional[Operator]]:
+    """
+    Scores the valid subsets of every source of a target at once and keeps the best one per source.
+
+    The parent sets of `y` with and without each source go through a single `local_scores` call, so the uncached
+    regressions of the whole target are solved in one batch. The delta is the score with the source minus the score
+    without it for inserts (`sign` 1), and the opposite for deletes (`sign` -1).
+    """
+    with_x = [base | {x} for x, source_bases in zip(sources, bases) for base in source_bases]
+    without_x = [base for source_bases in bases for base in source_bases]
+    if not with_x:
+        return [None] * len(sources)
+
+    scores = score.local_scores(y, with_x + without_x)
+    deltas = sign * (scores[: len(with_x)] - scores[len(with_x) :])
+
+    best = []
+    start = 0
+    for source_subsets in subsets:
+        if not source_subsets:
+            best.append(None)
+            continue
+        i = int(np.argmax(deltas[start : start + len(source_subsets)]))
+        best.append((float(deltas[start + i]), source_subsets[i]))
+        start += len(source_subsets)
+    return best
+
+
+def _best_inserts(
+    g: np.ndarray, score: GaussianBIC, sources: List[int], y: int, candidates: np.ndarray, max_subset_size: int
+) -> List[Optional[Operator]]:
+    """Best Insert(x, y, T) operator of Chickering (2002) for each source x, or None if no valid operator exists."""
+    adjacency = g | g.T
+    successors = [np.flatnonzero(row).tolist() for row in g]
+    ne_y = neighbors(g, y)
+    pa = parents(g, y)
+
+    subsets, bases = [], []
+    for x in sources:
+        subsets.append([])
+        bases.append([])
+        if x == y or adjacency[x, y] or not candidates[x, y]:
+            continue
+
+        adj_x = set(np.flatnonzero(adjacency[x]).tolist())
+        na = ne_y & adj_x
+        t0 = sorted(ne_y - adj_x)
+        for size in range(min(len(t0), max_subset_size) + 1):
+            for t in itertools.combinations(t0, size):
+                s = na | set(t)
+                index = list(s)
+                if adjacency[np.ix_(index, index)].sum() != len(index) * (len(index) - 1):
+                    continue
+                if _has_semi_directed_path(successors, y, x, s):
+                    continue
+                subsets[-1].append(frozenset(t))
+                bases[-1].append(s | pa)
+
+    return _best_operators(score, y, sources, subsets, bases, sign=1)
+
+
+def _best_deletes(
+    g: np.ndarray, score: GaussianBIC, sources: List[int], y: int, candidates: np.ndarray, max_subset_size: int
+) -> List[Optional[Operator]]:
+    """Best Delete(x, y, H) operator of Chickering (2002) for each source x, or None if x and y are not adjacent."""
+    adjacency = g | g.T
+    ne_y = neighbors(g, y)
+    pa_y = parents(g, y)
+
+    subsets, bases = [], []
+    for x in sources:
+        subsets.append([])
+        bases.append([])
+        if x == y or not g[x, y]:
+            continue
+
+        na = sorted(ne_y & set(np.flatnonzero(adjacency[x]).tolist()))
+        pa = pa_y - {x}
+        for size in range(min(len(na), max_subset_size) + 1):
+            for h in itertools.combinations(na, size):
+                rest = set(na) - set(h)
+                index = list(rest)
+                if adjacency[np.ix_(index, index)].sum() != len(index) * (len(index) - 1):
+                    continue
+                subsets[-1].append(frozenset(h))
+                bases[-1].append(rest | pa)
+
+    return _best_operators(score, y, sources, subsets, bases, sign=-1)
+
+
+def _apply_insert(g: np.ndarray, x: int, y: int, t: frozenset):
+    g[x, y], g[y, x] = True, False
+    for node in t:
+        g[node, y], g[y, node] = True, False
+
+
+def _apply_delete(g: np.ndarray, x: int, y: int, h: frozenset):
+    g[x, y] = g[y, x] = False
+    for node in h:
+        g[y, node], g[node, y] = True, False
+        if g[x, node] and g[node, x]:
+            g[node, x] = False
+
+
+def _greedy_phase(
+    g: np.ndarray,
+    evaluate: Callable[[np.ndarray, List[int], int], List[Optional[Operator]]],
+    apply: Callable[[np.ndarray, int, int, frozenset], None],
+    executor,
+) -> np.ndarray:
+    """
+    Applies the best operator while it improves the score, keeping the operator deltas in a priority queue.
+
+    Only the deltas of the nodes touched by the last operator, and of their adjacents, are recomputed. Any other
+    delta is checked again when it reaches the top of the queue, and pushed back if it changed. `evaluate` returns the
+    best operators from several sources into one target, so the operators of a target are scored in one batch.
+    """
+    p = len(g)
+    heap = []
+    stamps = [0] * p
+    counter = itertools.count()
+
+    def evaluate_target(y):
+        operators = zip(range(p), evaluate(g, list(range(p)), y))
+        return y, [(x, op[0]) for x, op in operators if op is not None and op[0] > 1e-9]
+
+    def refresh(targets):
+        for y, operators in executor.map(evaluate_target, targets):
+            stamps[y] += 1
+            for x, delta in operators:
+                heapq.heappush(heap, (-delta, next(counter), stamps[y], x, y))
+
+    refresh(range(p))
+
+    while heap:
+        _, _, stamp, x, y = heapq.heappop(heap)
+        if stamp != stamps[y]:
+            continue
+
+        op = evaluate(g, [x], y)[0]
+        if op is None or op[0] <= 1e-9:
+            continue
+        if heap and op[0] < -heap[0][0]:
+            heapq.heappush(heap, (-op[0], next(counter), stamps[y], x, y))
+            continue
+
+        previous = g.copy()
+        apply(g, x, y, op[1])
+        dag = pdag_to_dag(g)
+        if dag is None:
+            g[:] = previous
+            continue
+        g[:] = dag_to_cpdag(dag)
+
+        touched = np.flatnonzero((g != previous).any(axis=0) | (g != previous).any(axis=1))
+        touched = set(touched.tolist()) | {x, y}
+        adjacency = g | g.T | previous | previous.T
+        targets = touched | set(np.flatnonzero(adjacency[list(touched)].any(axis=0)).tolist())
+        refresh(sorted(targets))
+
+    return g
+
+
+def fges(
+    x: np.ndarray,
+    penalty_discount: float = 1.0,
+    superstructure: np.ndarray = None,
+    initial_graph: np.ndarray = None,
+    max_subset_size: int = 3,
+    n_jobs: int = 1,
+    score: GaussianBIC = None,
+) -> np.ndarray:
+    """
+    Runs Fast Greedy Equivalence Search (Ramsey et al., 2017) with a Gaussian BIC score.
+
+    The forward phase inserts and the backward phase deletes edges of the CPDAG, always applying the operator with the
+    best cached score delta. After each operator, only the deltas it touched are recomputed. The operators into one
+    target are scored in one batch, so the uncached regressions of a target take a single stacked solve.
+
+    Args:
+        x (np.ndarray): The data, with one column per variable.
+        penalty_discount (float, optional): Multiplier of the BIC penalty. Defaults to 1.0.
+        superstructure (np.ndarray, optional): Boolean matrix of the candidate edges. Pairs outside it are never
+            inserted. Defaults to None, which allows every edge.
+        initial_graph (np.ndarray, optional): Adjacency matrix of a DAG to start the search from. Defaults to None,
+            which starts from the empty graph.
+        max_subset_size (int, optional): The maximum size of the T and H subsets evaluated per operator. Defaults to 3.
+        n_jobs (int, optional): The number of threads evaluating the targets. The graph checks hold the GIL, so the
+            threads only overlap in the batched solves. Defaults to 1.
+        score (GaussianBIC, optional): The score to use. Defaults to None, which creates a `GaussianBIC` of `x`.
+
+    Returns:
+        np.ndarray: Boolean adjacency matrix of the CPDAG, where i -> j if only (i, j) is set and i - j if both (i, j)
+            and (j, i) are set.
+    """
+    x = np.asarray(x, dtype=float)
+    p = x.shape[1]
+    score = score or GaussianBIC(x, penalty_discount=penalty_discount)
+    candidates = np.ones((p, p), dtype=bool) if superstructure is None else np.asarray(superstructure, dtype=bool)
+
+    g = np.zeros((p, p), dtype=bool)
+    if initial_graph is not None:
+        g = dag_to_cpdag(np.asarray(initial_graph) != 0)
+
+    def insert(graph, sources, b):
+        return _best_inserts(graph, score, sources, b, candidates, max_subset_size)
+
+    def delete(graph, sources, b):
+        return _best_deletes(graph, score, sources, b, candidates, max_subset_size)
+
+    with ThreadPoolExecutor(max_workers=max(n_jobs, 1)) as executor:
+        g = _greedy_phase(g, insert, _apply_insert, executor)
+        g = _greedy_phase(g, delete, _apply_delete, executor)
+
+    return g
@@ -0,0 +1,156 @@
+from typing import List
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import shortest_path
+
+
+def _stack(predictions: np.ndarray) -> np.ndarray:
+    predictions = np.asarray(predictions)
+    return predictions[None] if predictions.ndim == 2 else predictions
+
+
+def reachability(g: np.ndarray) -> np.ndarray:
+    """
+    Computes the reflexive transitive closure of a directed graph by repeated boolean matrix squaring.
+
+    Args:
+        g (np.ndarray): Boolean adjacency matrix, where (i, j) is set for the edge i -> j.
+
+    Returns:
+        np.ndarray: Boolean matrix where (i, j) is set if j is reachable from i, including i itself.
+    """
+    reach = np.asarray(g, dtype=bool) | np.eye(len(g), dtype=bool)
+    while True:
+        step = reach.astype(np.int64)
+        closure = (step @ step) > 0
+        if np.array_equal(closure, reach):
+            return reach
+        reach = closure
+
+
+def shd(truth: np.ndarray, predictions: np.ndarray) -> np.ndarray:
+    """
+    Computes the Structural Hamming Distance of candidate graphs to a ground truth.
+
+    Missing, extra and reversed edges count as one mistake each, as in `cdt.metrics.SHD` with
+    `double_for_anticausal=False`.
+
+    Args:
+        truth (np.ndarray): Boolean adjacency matrix of the ground truth.
+        predictions (np.ndarray): Adjacency matrix of a candidate graph, or a stack of them with shape (k, p, p).
+
+    Returns:
+        np.ndarray: The distance of each candidate.
+    """
+    diff = np.asarray(truth, dtype=bool)[None] != (_stack(predictions) != 0)
+    return (diff | diff.transpose(0, 2, 1)).sum(axis=(1, 2)) / 2
+
+
+def auc_pr(truth: np.ndarray, predictions: np.ndarray) -> np.ndarray:
+    """
+    Computes the area under the precision-recall curve of edge scores against a ground truth.
+
+    The curve and the trapezoidal area follow `sklearn.metrics.precision_recall_curve` and `sklearn.metrics.auc`, as
+    used by `cdt.metrics.precision_recall`.
+
+    Args:
+        truth (np.ndarray): Boolean adjacency matrix of the ground truth.
+        predictions (np.ndarray): Edge scores of a candidate graph, or a stack of them with shape (k, p, p).
+
+    Returns:
+        np.ndarray: The area of each candidate.
+    """
+    labels = np.asarray(truth, dtype=bool).ravel()
+    scores = _stack(predictions).reshape(-1, labels.size).astype(float)
+    order = np.argsort(scores, axis=1, kind="mergesort")[:, ::-1]
+    areas = np.empty(len(scores))
+
+    for k, (sorted_scores, sorted_labels) in enumerate(zip(np.take_along_axis(scores, order, 1), labels[order])):
+        thresholds = np.r_[np.flatnonzero(np.diff(sorted_scores)), sorted_scores.size - 1]
+        tps = np.cumsum(sorted_labels)[thresholds]
+        fps = thresholds + 1 - tps
+        precision = np.r_[(tps / (tps + fps))[::-1], 1.0]
+        recall = np.r_[(tps / tps[-1] if tps[-1] else np.ones(len(tps)))[::-1], 0.0]
+        areas[k] = -np.trapz(precision, recall)
+
+    return areas
+
+
+def _d_connected(
+    g: np.ndarray, conditioned: np.ndarray, ancestors: np.ndarray, blocked: int, starts: List[int]
+) -> np.ndarray:
+    """
+    Finds the nodes d-connected to a set of starting edge ends given the conditioned nodes (Bayes ball).
+
+    The state v (v < p) means the path arrived at v along an edge into v, and the state p + v means it arrived at v
+    from one of its children. Paths never cross the `blocked` node.
+
+    Returns:
+        np.ndarray: Boolean matrix with one row per start, where (s, v) is set if v is reached.
+    """
+    p = len(g)
+    free = ~conditioned[:, None]
+    down, up = g & free, g.T & free
+    # Colliders pass the path on when they are conditioned or have a conditioned descendant
+    transitions = np.block([[down, g.T & ancestors[:, None]], [down, up]])
+    transitions[[blocked, p + blocked], :] = False
+    transitions[:, [blocked, p + blocked]] = False
+    distances = shortest_path(sparse.csr_matrix(transitions), unweighted=True, indices=starts)
+    reached = np.isfinite(distances.reshape(len(starts), 2 * p))
+    return reached[:, :p] | reached[:, p:]
+
+
+def sid(truth: np.ndarray, predictions: np.ndarray) -> np.ndarray:
+    """
+    Computes the Structural Intervention Distance of candidate DAGs to a ground truth DAG.
+
+    The distance counts the pairs (i, j) whose interventional distribution p(x_j | do(x_i)) is wrongly inferred when
+    adjusting for the parents of i in the candidate. Following Peters and Bühlmann (2015), the parents Z of i are a
+    valid adjustment set when no node of Z descends from a node on a directed path from i to j, and Z blocks every
+    path between i and j except the directed ones. If j is a parent of i in the candidate, the effect is inferred as
+    zero, which is right when j does not descend from i. The reachability of the ground truth is shared by every
+    candidate, and the blocked paths from i are found for every j at once.
+
+    Args:
+        truth (np.ndarray): Boolean adjacency matrix of the ground truth.
+        predictions (np.ndarray): Adjacency matrix of a candidate graph, or a stack of them with shape (k, p, p).
+
+    Returns:
+        np.ndarray: The distance of each candidate.
+    """
+    g = np.asarray(truth, dtype=bool)
+    candidates = _stack(predictions) != 0
+    p = len(g)
+    reach = reachability(g)
+    distances = np.zeros(len(candidates))
+
+    for k, h in enumerate(candidates):
+        for i in range(p):
+            adjustment = h[:, i].copy()
+            adjustment[i] = False
+            if np.array_equal(adjustment, g[:, i]):
+                continue
+
+            ancestors = reach[:, adjustment].any(axis=1)
+            children = np.flatnonzero(g[i])
+            wrong = np.zeros(p, dtype=bool)
+
+            # Paths entering i through one of its parents
+            parents = np.flatnonzero(g[:, i])
+            if parents.size:
+                wrong |= _d_connected(g, adjustment, ancestors, i, (p + parents).tolist()).any(axis=0)
+
+            if children.size:
+                # Paths leaving i through a child that is not on a directed path to j
+                reached = _d_connected(g, adjustment, ancestors, i, children.tolist())
+                wrong |= (reached & ~reach[children]).any(axis=0)
+                # Adjustment nodes descending from a node on a directed path to j
+                spoiled = (reach[children] & adjustment).any(axis=1)
+                wrong |= (reach[children] & spoiled[:, None]).any(axis=0)
+
+            wrong = np.where(adjustment, reach[i], wrong)
+            wrong[i] = False
+            distances[k] += wrong.sum()
+
+    return distances
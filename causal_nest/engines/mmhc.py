@@ -0,0 +1,208 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set
+
+import numpy as np
+
+from causal_nest.engines.ci_tests import CITest, FisherZ
+from causal_nest.engines.fges import GaussianBIC
+
+
+def mmpc(test: CITest, target: int, alpha: float = 0.05, max_k: int = 3) -> Set[int]:
+    """
+    Max-Min Parents and Children (Tsamardinos et al., 2006) of a single variable.
+
+    For each candidate, the maximum p-value over the subsets of the current candidate set is kept between iterations,
+    so adding a variable only runs the tests of the subsets containing it. Each subset tests all candidates at once.
+
+    Args:
+        test (CITest): The conditional independence test.
+        target (int): The column index of the variable.
+        alpha (float, optional): The significance level. Defaults to 0.05.
+        max_k (int, optional): The maximum size of the conditioning sets. Defaults to 3.
+
+    Returns:
+        Set[int]: The candidate parents and children of `target`.
+    """
+    remaining = [v for v in range(test.n_variables) if v != target]
+    max_pvalues = test.pvalues(target, remaining, ())
+    cpc = []
+
+    # Forward phase: add the candidate with the strongest minimum association until all are independent
+    while remaining:
+        best = int(np.argmin(max_pvalues))
+        if max_pvalues[best] >= alpha:
+            break
+        new = remaining.pop(best)
+        max_pvalues = np.delete(max_pvalues, best)
+        cpc.append(new)
+
+        if remaining:
+            for size in range(min(len(cpc) - 1, max_k - 1) + 1):
+                for subset in itertools.combinations(cpc[:-1], size):
+                    max_pvalues = np.maximum(max_pvalues, test.pvalues(target, remaining, subset + (new,)))
+
+        keep = max_pvalues < alpha
+        remaining = [v for v, k in zip(remaining, keep) if k]
+        max_pvalues = max_pvalues[keep]
+
+    # Backward phase: remove the candidates made independent by a subset of the others
+    for v in list(cpc):
+        others = [c for c in cpc if c != v]
+        subsets = (s for size in range(min(len(others), max_k) + 1) for s in itertools.combinations(others, size))
+        if any(test.pvalue(target, v, s) >= alpha for s in subsets):
+            cpc.remove(v)
+
+    return set(cpc)
+
+
+def mmpc_skeleton(test: CITest, alpha: float = 0.05, max_k: int = 3, n_jobs: int = 1) -> np.ndarray:
+    """
+    Learns the candidate parents and children of every variable, in parallel, and keeps the symmetric pairs.
+
+    Args:
+        test (CITest): The conditional independence test.
+        alpha (float, optional): The significance level. Defaults to 0.05.
+        max_k (int, optional): The maximum size of the conditioning sets. Defaults to 3.
+        n_jobs (int, optional): The number of threads, one variable at a time. Defaults to 1.
+
+    Returns:
+        np.ndarray: Symmetric boolean matrix of the skeleton.
+    """
+    p = test.n_variables
+
+    def run(target):
+        return mmpc(test, target, alpha=alpha, max_k=max_k)
+
+    if n_jobs > 1:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            cpcs = list(executor.map(run, range(p)))
+    else:
+        cpcs = [run(t) for t in range(p)]
+
+    skeleton = np.zeros((p, p), dtype=bool)
+    for t, cpc in enumerate(cpcs):
+        skeleton[t, list(cpc)] = True
+    return skeleton & skeleton.T
+
+
+def _has_path(dag: np.ndarray, source: int, target: int) -> bool:
+    visited = {source}
+    frontier = [source]
+    while frontier:
+        node = frontier.pop()
+        for nxt in np.flatnonzero(dag[node]).tolist():
+            if nxt == target:
+                return True
+            if nxt not in visited:
+                visited.add(nxt)
+                frontier.append(nxt)
+    return False
+
+
+def hill_climb(score: GaussianBIC, candidates: np.ndarray, max_iter: int = 10_000) -> np.ndarray:
+    """
+    Greedy hill climbing over DAGs with edge additions, deletions and reversals restricted to candidate edges.
+
+    The deltas of adding and deleting each parent of a node only depend on the parents of that node, so after a move
+    only the columns of the nodes whose parents changed are rescored.
+
+    Args:
+        score (GaussianBIC): The decomposable score.
+        candidates (np.ndarray): Boolean matrix of the edges allowed in the search.
+        max_iter (int, optional): The maximum number of moves. Defaults to 10000.
+
+    Returns:
+        np.ndarray: Boolean adjacency matrix of the DAG, where (i, j) means i -> j.
+    """
+    p = len(candidates)
+    dag = np.zeros((p, p), dtype=bool)
+    local = np.array([score.local_score(j, ()) for j in range(p)])
+    add = np.full((p, p), -np.inf)
+    delete = np.full((p, p), -np.inf)
+
+    def rescore(j):
+        parents = set(np.flatnonzero(dag[:, j]).tolist())
+        local[j] = score.local_score(j, parents)
+        add[:, j] = delete[:, j] = -np.inf
+        for i in np.flatnonzero(candidates[:, j]).tolist():
+            if i in parents:
+                delete[i, j] = score.local_score(j, parents - {i}) - local[j]
+            elif i != j:
+                add[i, j] = score.local_score(j, parents | {i}) - local[j]
+
+    for j in range(p):
+        rescore(j)
+
+    for _ in range(max_iter):
+        adjacent = dag | dag.T
+        moves = [
+            ("add", np.where(adjacent, -np.inf, add)),
+            ("delete", delete),
+            ("reverse", np.where(dag, delete + add.T, -np.inf)),
+        ]
+        ranked = sorted(
+            ((values[i, j], kind, i, j) for kind, values in moves for i, j in zip(*np.nonzero(values > 1e-9))),
+            reverse=True,
+        )
+
+        for _, kind, i, j in ranked:
+            if kind == "add" and _has_path(dag, j, i):
+                continue
+            if kind == "reverse":
+                dag[i, j] = False
+                cyclic = _has_path(dag, i, j)
+                dag[i, j] = True
+                if cyclic:
+                    continue
+            break
+        else:
+            break
+
+        if kind == "add":
+            dag[i, j] = True
+            rescore(j)
+        elif kind == "delete":
+            dag[i, j] = False
+            rescore(j)
+        else:
+            dag[i, j], dag[j, i] = False, True
+            rescore(i)
+            rescore(j)
+
+    return dag
+
+
+def mmhc(
+    x: np.ndarray,
+    alpha: float = 0.05,
+    max_k: int = 3,
+    test: CITest = None,
+    score: GaussianBIC = None,
+    superstructure: np.ndarray = None,
+    n_jobs: int = 1,
+) -> np.ndarray:
+    """
+    Runs Max-Min Hill-Climbing (Tsamardinos et al., 2006): an MMPC skeleton followed by a restricted BIC hill climb.
+
+    Args:
+        x (np.ndarray): The data, with one column per variable.
+        alpha (float, optional): The significance level of the skeleton tests. Defaults to 0.05.
+        max_k (int, optional): The maximum size of the conditioning sets. Defaults to 3.
+        test (CITest, optional): The conditional independence test. Defaults to None, which uses a `FisherZ` of `x`.
+        score (GaussianBIC, optional): The score of the hill climb. Defaults to None, which uses a `GaussianBIC` of `x`.
+        superstructure (np.ndarray, optional): Boolean matrix of the candidate edges, intersected with the skeleton.
+            Defaults to None.
+        n_jobs (int, optional): The number of threads of the skeleton phase. Defaults to 1.
+
+    Returns:
+        np.ndarray: Boolean adjacency matrix of the DAG, where (i, j) means i -> j.
+    """
+    test = test or FisherZ(x)
+    score = score or GaussianBIC(x)
+
+    candidates = mmpc_skeleton(test, alpha=alpha, max_k=max_k, n_jobs=n_jobs)
+    if superstructure is not None:
+        candidates &= np.asarray(superstructure, dtype=bool)
+
+    return hill_climb(score, candidates)
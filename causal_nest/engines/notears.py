@@ -0,0 +1,106 @@
+from typing import Tuple
+
+import numpy as np
+import scipy.linalg as sla
+from scipy.optimize import minimize
+
+
+def _expm_acyclicity(w: np.ndarray) -> Tuple[float, np.ndarray]:
+    """h(W) = tr(exp(W * W)) - d of Zheng et al. (2018) and its gradient."""
+    e = sla.expm(w * w)
+    return np.trace(e) - len(w), e.T * 2 * w
+
+
+def _polynomial_acyclicity(w: np.ndarray) -> Tuple[float, np.ndarray]:
+    """h(W) = tr((I + W * W / d)^d) - d of Yu et al. (2019) and its gradient, cheaper than the exponential."""
+    d = len(w)
+    m = np.eye(d) + w * w / d
+    power = np.linalg.matrix_power(m, d - 1)
+    return np.sum(power.T * m) - d, power.T * 2 * w
+
+
+acyclicity_functions = {"expm": _expm_acyclicity, "polynomial": _polynomial_acyclicity}
+"""Acyclicity penalties, both zero exactly when the weighted graph is a DAG."""
+
+
+def notears_linear(
+    covariance: np.ndarray,
+    lambda1: float = 0.1,
+    acyclicity: str = "expm",
+    w_threshold: float = 0.3,
+    superstructure: np.ndarray = None,
+    max_iter: int = 100,
+    h_tol: float = 1e-8,
+    rho_max: float = 1e16,
+) -> np.ndarray:
+    """
+    Learns a linear DAG with the NOTEARS continuous optimization (Zheng et al., 2018).
+
+    Minimizes the least squares loss 0.5 / n * ||X - XW||^2 = 0.5 * tr((I - W)^T S (I - W)) plus an L1 penalty,
+    subject to an acyclicity constraint handled by an augmented Lagrangian. Each subproblem is solved by L-BFGS-B with
+    analytic gradients. Since the loss only depends on the covariance S, the cost of an iteration does not depend on
+    the number of rows.
+
+    Args:
+        covariance (np.ndarray): The covariance matrix of the data.
+        lambda1 (float, optional): The L1 penalty. Defaults to 0.1.
+        acyclicity (str, optional): The acyclicity penalty, one of `acyclicity_functions`. Defaults to "expm".
+        w_threshold (float, optional): The minimum absolute weight of the returned edges. Defaults to 0.3.
+        superstructure (np.ndarray, optional): Boolean matrix of the candidate edges. Weights outside it are fixed at
+            zero. Defaults to None, which allows every edge.
+        max_iter (int, optional): The maximum number of augmented Lagrangian iterations. Defaults to 100.
+        h_tol (float, optional): The acyclicity tolerance. Defaults to 1e-8.
+        rho_max (float, optional): The maximum augmented Lagrangian penalty. Defaults to 1e16.
+
+    Returns:
+        np.ndarray: The weighted adjacency matrix, where the entry (i, j) is the weight of the edge i -> j.
+
+    Raises:
+        ValueError: If `acyclicity` is not a known penalty.
+    """
+    if acyclicity not in acyclicity_functions:
+        raise ValueError(f"Argument 'acyclicity' must be one of {list(acyclicity_functions)}")
+    h_function = acyclicity_functions[acyclicity]
+
+    s = np.asarray(covariance, dtype=float)
+    d = len(s)
+    identity = np.eye(d)
+
+    # W = W+ - W-, with both parts non-negative so the L1 penalty is smooth
+    allowed = ~np.eye(d, dtype=bool)
+    if superstructure is not None:
+        allowed &= np.asarray(superstructure, dtype=bool)
+    bounds = [(0, 0) if not a else (0, None) for _ in range(2) for a in allowed.ravel()]
+
+    def adjacency(w_flat):
+        return (w_flat[: d * d] - w_flat[d * d :]).reshape(d, d)
+
+    def objective(w_flat, rho, alpha):
+        w = adjacency(w_flat)
+        residual = identity - w
+        loss = 0.5 * np.sum(residual * (s @ residual))
+        h, h_grad = h_function(w)
+
+        value = loss + 0.5 * rho * h * h + alpha * h + lambda1 * w_flat.sum()
+        grad = -s @ residual + (rho * h + alpha) * h_grad
+        return value, np.concatenate([grad.ravel() + lambda1, -grad.ravel() + lambda1])
+
+    w_flat = np.zeros(2 * d * d)
+    rho, alpha, h = 1.0, 0.0, np.inf
+
+    for _ in range(max_iter):
+        while rho < rho_max:
+            solution = minimize(objective, w_flat, args=(rho, alpha), method="L-BFGS-B", jac=True, bounds=bounds)
+            h_new, _ = h_function(adjacency(solution.x))
+            if h_new > 0.25 * h:
+                rho *= 10
+            else:
+                break
+        w_flat, h = solution.x, h_new
+        alpha += rho * h
+        if h <= h_tol or rho >= rho_max:
+            break
+
+    w = adjacency(w_flat)
+    w[np.abs(w) < w_threshold] = 0
+    return w
@@ -0,0 +1,162 @@
+from typing import Optional, Set
+
+import numpy as np
+
+
+def parents(g: np.ndarray, node: int) -> Set[int]:
+    """
+    Returns the parents of a node in a partially directed graph.
+
+    Args:
+        g (np.ndarray): Boolean adjacency matrix, where i -> j if only (i, j) is set and i - j if both (i, j) and (j, i)
+            are set.
+        node (int): The node.
+
+    Returns:
+        Set[int]: The nodes with a directed edge into `node`.
+    """
+    return set(np.flatnonzero(g[:, node] & ~g[node, :]).tolist())
+
+
+def neighbors(g: np.ndarray, node: int) -> Set[int]:
+    """
+    Returns the nodes linked to a node by an undirected edge in a partially directed graph.
+
+    Args:
+        g (np.ndarray): Boolean adjacency matrix, as in `parents`.
+        node (int): The node.
+
+    Returns:
+        Set[int]: The nodes with an undirected edge to `node`.
+    """
+    return set(np.flatnonzero(g[:, node] & g[node, :]).tolist())
+
+
+def adjacents(g: np.ndarray, node: int) -> Set[int]:
+    """
+    Returns the nodes adjacent to a node in a partially directed graph, whatever the edge orientation.
+
+    Args:
+        g (np.ndarray): Boolean adjacency matrix, as in `parents`.
+        node (int): The node.
+
+    Returns:
+        Set[int]: The nodes adjacent to `node`.
+    """
+    return set(np.flatnonzero(g[:, node] | g[node, :]).tolist())
+
+
+def is_clique(g: np.ndarray, nodes: Set[int]) -> bool:
+    """
+    Checks if every pair of the given nodes is adjacent.
+
+    Args:
+        g (np.ndarray): Boolean adjacency matrix, as in `parents`.
+        nodes (Set[int]): The nodes.
+
+    Returns:
+        bool: True if the nodes form a clique, False otherwise.
+    """
+    index = list(nodes)
+    adjacency = (g | g.T)[np.ix_(index, index)]
+    return bool(adjacency.sum() == len(index) * (len(index) - 1))
+
+
+def meek_rules(g: np.ndarray) -> np.ndarray:
+    """
+    Orients the undirected edges of a partially directed graph implied by Meek rules 1 to 3.
+
+    Args:
+        g (np.ndarray): Boolean adjacency matrix, as in `parents`.
+
+    Returns:
+        np.ndarray: A copy of `g` with the implied orientations.
+    """
+    g = g.copy()
+    changed = True
+
+    while changed:
+        changed = False
+        directed = g & ~g.T
+        undirected = g & g.T
+        adjacency = g | g.T
+
+        for b, c in zip(*np.nonzero(np.triu(undirected))):
+            for u, v in [(b, c), (c, b)]:
+                # Rule 1: a -> u - v with a and v not adjacent
+                rule1 = np.any(directed[:, u] & ~adjacency[:, v] & (np.arange(len(g)) != v))
+                # Rule 2: u -> a -> v with u - v
+                rule2 = np.any(directed[u, :] & directed[:, v])
+                # Rule 3: u - a -> v and u - d -> v with a and d not adjacent
+                kites = np.flatnonzero(undirected[u, :] & directed[:, v])
+                off_diagonal = ~np.eye(len(kites), dtype=bool)
+                rule3 = len(kites) > 1 and not adjacency[np.ix_(kites, kites)].all(where=off_diagonal)
+
+                if rule1 or rule2 or rule3:
+                    g[v, u] = False
+                    changed = True
+                    break
+            if changed:
+                break
+
+    return g
+
+
+def dag_to_cpdag(dag: np.ndarray) -> np.ndarray:
+    """
+    Returns the completed partially directed graph of the Markov equivalence class of a DAG.
+
+    Args:
+        dag (np.ndarray): Adjacency matrix of the DAG, where a non-zero entry (i, j) means i -> j.
+
+    Returns:
+        np.ndarray: Boolean adjacency matrix of the CPDAG, as in `parents`.
+    """
+    dag = dag.astype(bool)
+    adjacency = dag | dag.T
+    g = adjacency.copy()
+
+    # Only the edges of v-structures keep their orientation, the rest follows from the Meek rules
+    for y in range(len(dag)):
+        ps = np.flatnonzero(dag[:, y])
+        for i, a in enumerate(ps):
+            for b in ps[i + 1 :]:
+                if not adjacency[a, b]:
+                    g[y, a] = g[y, b] = False
+
+    return meek_rules(g)
+
+
+def pdag_to_dag(g: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Finds a DAG extension of a partially directed graph with the algorithm of Dor and Tarsi (1992).
+
+    Args:
+        g (np.ndarray): Boolean adjacency matrix, as in `parents`.
+
+    Returns:
+        Optional[np.ndarray]: Boolean adjacency matrix of a DAG with the same skeleton and v-structures, where
+            (i, j) means i -> j, or None if `g` has no extension.
+    """
+    g = g.astype(bool)
+    dag = g & ~g.T
+    remaining = list(range(len(g)))
+
+    while remaining:
+        sub = g[np.ix_(remaining, remaining)]
+        for k, x in enumerate(remaining):
+            # x must be a sink, and its undirected neighbors must be adjacent to all its other adjacents
+            if np.any(sub[k, :] & ~sub[:, k]):
+                continue
+            adjacent = np.flatnonzero(sub[k, :] | sub[:, k])
+            undirected = np.flatnonzero(sub[k, :] & sub[:, k])
+            adjacency = sub | sub.T
+            if all(adjacency[u, adjacent[adjacent != u]].all() for u in undirected):
+                for u in undirected:
+                    dag[remaining[u], x] = True
+                remaining.pop(k)
+                break
+        else:
+            return None
+
+    return dag
@@ -0,0 +1,191 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, MutableMapping, Sequence
+
+import numpy as np
+
+
+def dataset_fingerprint(x: np.ndarray) -> str:
+    """
+    Returns a digest identifying the contents of a data matrix, used to share local scores between models.
+
+    Args:
+        x (np.ndarray): The data matrix.
+
+    Returns:
+        str: A hexadecimal digest of the shape, type and values of `x`.
+    """
+    x = np.ascontiguousarray(x)
+    digest = hashlib.blake2b(x.tobytes(), digest_size=16)
+    digest.update(f"{x.shape}{x.dtype}".encode())
+    return digest.hexdigest()
+
+
+class LocalScoreCache:
+    """
+    Memo of the local scores, score(node | parents), evaluated by the score-based engines.
+
+    The keys are `(fingerprint, score type, node, frozenset(parents))`, so models scoring the same dataset with the same
+    score reuse each other's evaluations. The entries live in an in-process LRU and, optionally, in a `shared` mapping
+    (such as a `multiprocessing.Manager().dict()`) read and written by every pool worker. Each shared access is a round
+    trip to the manager process, so it pays off for expensive scores rather than for small linear regressions.
+
+    Attributes:
+        max_entries (int): The maximum number of entries of the in-process LRU.
+        shared (Optional[MutableMapping]): The mapping shared between processes, if any.
+        hits (int): The number of lookups answered from the LRU or the shared mapping.
+        misses (int): The number of lookups that had to compute the score.
+    """
+
+    def __init__(self, max_entries: int = 200_000, shared: MutableMapping = None):
+        self.max_entries = max_entries
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], float]) -> float:
+        """
+        Returns the cached score of a key, computing and storing it on a miss.
+
+        Args:
+            key (Hashable): The `(fingerprint, score type, node, frozenset(parents))` key.
+            compute (Callable[[], float]): Computes the score on a miss.
+
+        Returns:
+            float: The local score.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = self.shared.get(key) if self.shared is not None else None
+        if value is None:
+            value = compute()
+            if self.shared is not None:
+                self.shared[key] = value
+            hit = False
+        else:
+            hit = True
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._entries[key] = value
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def get_or_compute_many(
+        self, keys: Sequence[Hashable], compute: Callable[[List[Hashable]], Sequence[float]]
+    ) -> List[float]:
+        """
+        Returns the cached scores of several keys, computing all the missed ones with a single call.
+
+        The lock is taken once per batch rather than once per key, and `compute` can score the missed keys together.
+
+        Args:
+            keys (Sequence[Hashable]): The `(fingerprint, score type, node, frozenset(parents))` keys.
+            compute (Callable[[List[Hashable]], Sequence[float]]): Computes the scores of the missed keys, in order.
+
+        Returns:
+            List[float]: The local scores, in the order of `keys`.
+        """
+        values = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    values[key] = self._entries[key]
+        hits = len(values)
+
+        missed = [key for key in dict.fromkeys(keys) if key not in values]
+        if self.shared is not None:
+            for key in missed:
+                value = self.shared.get(key)
+                if value is not None:
+                    values[key] = value
+        computed = [key for key in missed if key not in values]
+        if computed:
+            for key, value in zip(computed, compute(computed)):
+                values[key] = float(value)
+                if self.shared is not None:
+                    self.shared[key] = values[key]
+
+        with self._lock:
+            self.hits += hits + len(missed) - len(computed)
+            self.misses += len(computed)
+            for key in missed:
+                self._entries[key] = values[key]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return [values[key] for key in keys]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit and miss counters.
+
+        Returns:
+            Dict[str, int]: The `hits` and `misses` since the cache was created.
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        """Removes the in-process entries and resets the counters. The shared mapping is left untouched."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_score_cache = LocalScoreCache()
+
+
+def score_cache() -> LocalScoreCache:
+    """
+    Returns the local score cache of the current process, used by default by the score-based engines.
+
+    Returns:
+        LocalScoreCache: The process-wide cache.
+    """
+    return _score_cache
+
+
+def configure_score_cache(max_entries: int = 200_000, shared: MutableMapping = None) -> LocalScoreCache:
+    """
+    Replaces the local score cache of the current process.
+
+    Called by the pool worker initializer to attach the workers to the mapping shared by the discovery stage.
+
+    Args:
+        max_entries (int, optional): The maximum number of entries of the in-process LRU. Defaults to 200000.
+        shared (MutableMapping, optional): A mapping shared between processes. Defaults to None.
+
+    Returns:
+        LocalScoreCache: The new process-wide cache.
+    """
+    global _score_cache
+    _score_cache = LocalScoreCache(max_entries=max_entries, shared=shared)
+    return _score_cache
+
+
+def score_cache_delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Returns the hits and misses between two `LocalScoreCache.stats` snapshots.
+
+    Args:
+        before (Dict[str, Any]): The earlier snapshot.
+        after (Dict[str, Any]): The later snapshot.
+
+    Returns:
+        Dict[str, int]: The `hits` and `misses` in between.
+    """
+    return {k: after[k] - before[k] for k in ("hits", "misses")}
@@ -1,14 +1,14 @@
 import time
 from concurrent.futures import TimeoutError
 from dataclasses import replace
-from multiprocessing import cpu_count
 
 from dowhy import CausalModel
 from pebble import ProcessPool
 
 from causal_nest.problem import Problem
+from causal_nest.resources import plan_thread_budget
 from causal_nest.results import DiscoveryResult, EstimationResult
-from causal_nest.utils import graph_to_pydot_string
+from causal_nest.workers import initialize_worker
 
 
 def estimate_model_effects(problem: Problem, dr: DiscoveryResult, timeout: int = 180):
@@ -61,7 +61,7 @@ def estimate_effect(problem: Problem, dr: DiscoveryResult, treatment: str) -> Es
         data=problem.dataset.data,
         treatment=treatment,
         outcome=problem.dataset.target,
-        graph=graph_to_pydot_string(dr.output_graph),
+        graph=dr.dowhy_graph(),
     )
 
     estimand = model.identify_effect(proceed_when_unidentifiable=True)
@@ -97,7 +97,8 @@ def estimate_all_effects(
         problem (Problem): The problem instance containing the dataset and discovery results.
         max_seconds_model (int, optional): The maximum time allowed for each model's estimation process. Defaults to 360 seconds.
         verbose (bool, optional): If True, prints warnings and errors. Defaults to False.
-        max_workers (int, optional): The maximum number of workers to use. Defaults to the number of CPU cores.
+        max_workers (int, optional): The maximum number of workers to use. Defaults to one per result, up to the
+            number of CPUs allowed by the container quota.
 
     Returns:
         Problem: The problem instance with the estimation results added.
@@ -108,10 +109,11 @@ def estimate_all_effects(
     )
     estimation_results = {sorted_results[i].model: None for i in range(len(sorted_results))}
 
-    if max_workers is None:
-        max_workers = cpu_count()
+    budget = plan_thread_budget(max_workers, tasks=len(sorted_results))
 
-    with ProcessPool(max_workers=max_workers) as pool:
+    with ProcessPool(
+        max_workers=budget.processes, initializer=initialize_worker, initargs=(budget.threads_per_process,)
+    ) as pool:
         futures = []
 
         for dr in sorted_results:
@@ -0,0 +1,238 @@
+from typing import Dict, Hashable, Iterator, List, Sequence, Tuple, Union
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+
+class ArrayGraph:
+    """
+    Compact directed graph over labelled nodes, stored as a boolean or weighted adjacency matrix.
+
+    The entry (i, j) of the matrix is the edge nodes[i] -> nodes[j]: True for an unweighted edge, or a non-zero weight.
+    The matrix is a dense NumPy array or, for large sparse graphs, a SciPy CSR matrix. The discovery engines produce
+    such matrices directly, so their graphs are built without per-edge Python objects, and `to_networkx` gives a
+    networkx view for the code relying on it. Pickled graphs only store their edge list.
+
+    Attributes:
+        nodes (List[Hashable]): The node labels, indexing the rows and columns of the matrix.
+        index (Dict[Hashable, int]): The position of each node label.
+        adjacency (Union[np.ndarray, sparse.csr_matrix]): The adjacency matrix.
+    """
+
+    def __init__(self, adjacency: Union[np.ndarray, sparse.spmatrix], nodes: Sequence[Hashable]):
+        if sparse.issparse(adjacency):
+            adjacency = sparse.csr_matrix(adjacency)
+            adjacency.eliminate_zeros()
+        else:
+            adjacency = np.asarray(adjacency)
+            if adjacency.dtype != bool and not np.issubdtype(adjacency.dtype, np.floating):
+                adjacency = adjacency != 0
+
+        if adjacency.ndim != 2 or adjacency.shape != (len(nodes), len(nodes)):
+            raise ValueError("Argument 'adjacency' must be a square matrix with one row per node")
+
+        self.nodes = list(nodes)
+        self.index = {n: i for i, n in enumerate(self.nodes)}
+        self.adjacency = adjacency
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph, nodes: Sequence[Hashable] = None, weight: str = None) -> "ArrayGraph":
+        """
+        Builds an array graph from a networkx graph.
+
+        Args:
+            graph (nx.DiGraph): The networkx graph.
+            nodes (Sequence[Hashable], optional): The node labels of the result. Nodes of the graph that are not in
+                `nodes` are ignored, and nodes missing from the graph have no edges. Defaults to None, which keeps the
+                nodes of the graph.
+            weight (str, optional): The edge attribute holding the weights, which default to 1 on edges without it.
+                Defaults to None, which builds a boolean graph.
+
+        Returns:
+            ArrayGraph: The array graph.
+        """
+        nodes = list(graph.nodes()) if nodes is None else list(nodes)
+        index = {n: i for i, n in enumerate(nodes)}
+        adjacency = np.zeros((len(nodes), len(nodes)), dtype=float if weight else bool)
+        for u, v, data in graph.edges(data=True):
+            if u in index and v in index:
+                adjacency[index[u], index[v]] = data.get(weight, 1) if weight else True
+
+        return cls(adjacency, nodes)
+
+    @property
+    def weighted(self) -> bool:
+        """Whether the adjacency holds weights rather than booleans."""
+        return self.adjacency.dtype != bool
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The dense boolean adjacency matrix, True where an edge exists."""
+        dense = self.adjacency.toarray() if sparse.issparse(self.adjacency) else self.adjacency
+        return dense if dense.dtype == bool else dense != 0
+
+    @property
+    def weights(self) -> np.ndarray:
+        """The dense weighted adjacency matrix, where unweighted edges weigh 1."""
+        dense = self.adjacency.toarray() if sparse.issparse(self.adjacency) else self.adjacency
+        return dense.astype(float)
+
+    def edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the edges as index arrays.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The source and target positions of every edge and its weight.
+        """
+        if sparse.issparse(self.adjacency):
+            coo = self.adjacency.tocoo()
+            return coo.row, coo.col, coo.data.astype(float)
+        rows, cols = np.nonzero(self.adjacency)
+        return rows, cols, self.adjacency[rows, cols].astype(float)
+
+    def number_of_nodes(self) -> int:
+        """Returns the number of nodes."""
+        return len(self.nodes)
+
+    def number_of_edges(self) -> int:
+        """Returns the number of edges."""
+        if sparse.issparse(self.adjacency):
+            return int(self.adjacency.nnz)
+        return int(np.count_nonzero(self.adjacency))
+
+    def edges(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        """Iterates over the edges as pairs of node labels."""
+        rows, cols, _ = self.edge_arrays()
+        return ((self.nodes[i], self.nodes[j]) for i, j in zip(rows.tolist(), cols.tolist()))
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool:
+        """Checks if the edge u -> v exists."""
+        if u not in self.index or v not in self.index:
+            return False
+        return bool(self.adjacency[self.index[u], self.index[v]] != 0)
+
+    def _column(self, node: Hashable) -> np.ndarray:
+        column = self.adjacency[:, [self.index[node]]]
+        return np.asarray(column.toarray() if sparse.issparse(column) else column).ravel() != 0
+
+    def _row(self, node: Hashable) -> np.ndarray:
+        row = self.adjacency[[self.index[node]], :]
+        return np.asarray(row.toarray() if sparse.issparse(row) else row).ravel() != 0
+
+    def predecessors(self, node: Hashable) -> List[Hashable]:
+        """Returns the parents of a node."""
+        return [self.nodes[i] for i in np.flatnonzero(self._column(node))]
+
+    def successors(self, node: Hashable) -> List[Hashable]:
+        """Returns the children of a node."""
+        return [self.nodes[i] for i in np.flatnonzero(self._row(node))]
+
+    def in_degree(self, node: Hashable) -> int:
+        """Returns the number of parents of a node."""
+        return int(self._column(node).sum())
+
+    def out_degree(self, node: Hashable) -> int:
+        """Returns the number of children of a node."""
+        return int(self._row(node).sum())
+
+    def reindex(self, nodes: Sequence[Hashable]) -> "ArrayGraph":
+        """
+        Returns the graph over other node labels, in their order.
+
+        Args:
+            nodes (Sequence[Hashable]): The node labels of the result. Nodes missing from the graph have no edges.
+
+        Returns:
+            ArrayGraph: The reindexed graph.
+        """
+        nodes = list(nodes)
+        if nodes == self.nodes:
+            return self
+        positions = np.array([self.index.get(n, -1) for n in nodes], dtype=int)
+        known = positions >= 0
+        dense = self.adjacency.toarray() if sparse.issparse(self.adjacency) else self.adjacency
+        adjacency = np.zeros((len(nodes), len(nodes)), dtype=dense.dtype)
+        adjacency[np.ix_(known, known)] = dense[np.ix_(positions[known], positions[known])]
+        return ArrayGraph(adjacency, nodes)
+
+    def strongly_connected_components(self) -> List[np.ndarray]:
+        """
+        Returns the strongly connected components with more than one node.
+
+        Returns:
+            List[np.ndarray]: The sorted node positions of each component.
+        """
+        n_components, labels = connected_components(sparse.csr_matrix(self.matrix), directed=True, connection="strong")
+        sizes = np.bincount(labels, minlength=n_components)
+        return [np.flatnonzero(labels == c) for c in np.flatnonzero(sizes > 1)]
+
+    def is_acyclic(self) -> bool:
+        """Checks if the graph has no directed cycle, including self-loops."""
+        return not self.matrix.diagonal().any() and not self.strongly_connected_components()
+
+    def to_networkx(self) -> nx.DiGraph:
+        """
+        Returns a networkx view of the graph. Weighted graphs carry their weights in the "weight" edge attribute.
+
+        Returns:
+            nx.DiGraph: A new networkx graph.
+        """
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.nodes)
+        rows, cols, weights = self.edge_arrays()
+        sources = [self.nodes[i] for i in rows.tolist()]
+        targets = [self.nodes[j] for j in cols.tolist()]
+        if self.weighted:
+            graph.add_weighted_edges_from(zip(sources, targets, weights.tolist()))
+        else:
+            graph.add_edges_from(zip(sources, targets))
+        return graph
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self.index
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ArrayGraph):
+            return NotImplemented
+        return self.nodes == other.nodes and np.array_equal(self.weights, other.weights)
+
+    def __getstate__(self) -> Dict:
+        rows, cols, weights = self.edge_arrays()
+        return {
+            "nodes": self.nodes,
+            "dtype": self.adjacency.dtype.str,
+            "sparse": sparse.issparse(self.adjacency),
+            "rows": rows.astype(np.int32),
+            "cols": cols.astype(np.int32),
+            "weights": weights if self.weighted else None,
+        }
+
+    def __setstate__(self, state: Dict):
+        n = len(state["nodes"])
+        values = state["weights"] if state["weights"] is not None else np.ones(len(state["rows"]), dtype=bool)
+        adjacency = sparse.csr_matrix((values, (state["rows"], state["cols"])), shape=(n, n))
+        adjacency = adjacency.astype(np.dtype(state["dtype"]))
+        self.__init__(adjacency if state["sparse"] else adjacency.toarray(), state["nodes"])
+
+
+def as_array_graph(graph: Union[nx.DiGraph, ArrayGraph], nodes: Sequence[Hashable] = None, weight: str = None):
+    """
+    Returns an array graph for a networkx or array graph, optionally over other node labels.
+
+    Args:
+        graph (Union[nx.DiGraph, ArrayGraph]): The graph.
+        nodes (Sequence[Hashable], optional): The node labels of the result. Defaults to None, which keeps the nodes
+            of the graph.
+        weight (str, optional): The edge attribute holding the weights of a networkx graph. Defaults to None.
+
+    Returns:
+        ArrayGraph: The array graph.
+    """
+    if isinstance(graph, ArrayGraph):
+        return graph if nodes is None else graph.reindex(nodes)
+    return ArrayGraph.from_networkx(graph, nodes=nodes, weight=weight)
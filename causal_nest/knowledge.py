@@ -1,5 +1,71 @@
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+class EdgeList(list):
+    """
+    List of edges indexed by a hash map, so membership checks take constant time.
+
+    It behaves as a plain list, and the index follows every change made through the list methods.
+    """
+
+    def __init__(self, edges: Iterable[Tuple[str, str]] = ()):
+        super().__init__(edges)
+        self._counts = Counter(self)
+
+    def __contains__(self, edge) -> bool:
+        return self._counts.get(edge, 0) > 0
+
+    def __reduce__(self):
+        return EdgeList, (list(self),)
+
+    def _reindex(self):
+        self._counts = Counter(self)
+
+    def append(self, edge: Tuple[str, str]):
+        super().append(edge)
+        self._counts[edge] += 1
+
+    def extend(self, edges: Iterable[Tuple[str, str]]):
+        super().extend(edges)
+        self._reindex()
+
+    def insert(self, index: int, edge: Tuple[str, str]):
+        super().insert(index, edge)
+        self._counts[edge] += 1
+
+    def remove(self, edge: Tuple[str, str]):
+        super().remove(edge)
+        self._counts[edge] -= 1
+
+    def pop(self, index: int = -1) -> Tuple[str, str]:
+        edge = super().pop(index)
+        self._counts[edge] -= 1
+        return edge
+
+    def clear(self):
+        super().clear()
+        self._counts.clear()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def __iadd__(self, edges: Iterable[Tuple[str, str]]):
+        self.extend(edges)
+        return self
+
+    def __imul__(self, times: int):
+        super().__imul__(times)
+        self._reindex()
+        return self
 
 
 @dataclass
@@ -7,17 +73,28 @@ class Knowledge:
     """
     A class to represent the knowledge of required and forbidden edges in a causal graph.
 
+    Temporal tiers are stored as the tier of each node rather than expanded into forbidden edges: an edge from a node
+    to a node of an earlier tier is forbidden, and so is any edge between two nodes of the same exclusive tier.
+
     Attributes:
         required_edges (List[Tuple[str, str]]): A list of tuples representing the required edges.
-        forbidden_edges (List[Tuple[str, str]]): A list of tuples representing the forbidden edges.
+        forbidden_edges (List[Tuple[str, str]]): A list of tuples representing the explicitly forbidden edges.
+        tiers (Dict[str, int]): The temporal tier of each node in a tier.
+        exclusive_tiers (List[int]): The tiers whose nodes can not cause each other.
     """
 
     required_edges: List[Tuple[str, str]] = field(default_factory=list)
     forbidden_edges: List[Tuple[str, str]] = field(default_factory=list)
+    tiers: Dict[str, int] = field(default_factory=dict)
+    exclusive_tiers: List[int] = field(default_factory=list)
 
     def __post_init__(self):
         self._validate_edges(self.required_edges, "required_edges")
         self._validate_edges(self.forbidden_edges, "forbidden_edges")
+        if not all(isinstance(node, str) and isinstance(tier, int) for node, tier in self.tiers.items()):
+            raise ValueError("All elements of tiers must map a string to an integer")
+        self.required_edges = EdgeList(self.required_edges)
+        self.forbidden_edges = EdgeList(self.forbidden_edges)
 
     def _validate_edges(self, edges: List[Tuple[str, str]], attribute_name: str):
         """
@@ -35,23 +112,101 @@ class Knowledge:
         ):
             raise ValueError(f"All elements of {attribute_name} must be tuples of two strings")
 
+    def is_forbidden(self, u: str, v: str) -> bool:
+        """
+        Checks in constant time if the edge u -> v is forbidden, explicitly or by the temporal tiers.
+
+        Args:
+            u (str): The source node.
+            v (str): The target node.
+
+        Returns:
+            bool: True if the edge is forbidden, False otherwise.
+        """
+        if (u, v) in self.forbidden_edges:
+            return True
+        if u not in self.tiers or v not in self.tiers or u == v:
+            return False
+        tier_u, tier_v = self.tiers[u], self.tiers[v]
+        return tier_u > tier_v or (tier_u == tier_v and tier_u in self.exclusive_tiers)
+
+    def is_required(self, u: str, v: str) -> bool:
+        """
+        Checks in constant time if the edge u -> v is required.
+
+        Args:
+            u (str): The source node.
+            v (str): The target node.
+
+        Returns:
+            bool: True if the edge is required, False otherwise.
+        """
+        return (u, v) in self.required_edges
+
+    def nodes(self) -> List[str]:
+        """
+        Returns the nodes mentioned by the knowledge, in order of appearance.
+
+        Returns:
+            List[str]: The nodes of the required edges, the forbidden edges and the tiers.
+        """
+        edges = [n for edge in [*self.required_edges, *self.forbidden_edges] for n in edge]
+        return list(dict.fromkeys([*edges, *self.tiers]))
+
+    def _edge_matrix(self, edges: List[Tuple[str, str]], nodes: List[str]) -> np.ndarray:
+        index = {n: i for i, n in enumerate(nodes)}
+        matrix = np.zeros((len(nodes), len(nodes)), dtype=bool)
+        pairs = [(index[u], index[v]) for u, v in edges if u in index and v in index]
+        if pairs:
+            matrix[tuple(np.array(pairs).T)] = True
+        return matrix
+
+    def forbidden_matrix(self, nodes: List[str]) -> np.ndarray:
+        """
+        Returns the forbidden edges between the given nodes, comparing their tiers at once.
+
+        Args:
+            nodes (List[str]): The nodes indexing the rows and columns of the matrix.
+
+        Returns:
+            np.ndarray: Boolean matrix where (i, j) is set if the edge nodes[i] -> nodes[j] is forbidden.
+        """
+        tiers = np.array([self.tiers.get(n, np.nan) for n in nodes], dtype=float)
+        exclusive = np.isin(tiers, self.exclusive_tiers)
+        later = tiers[:, None] > tiers[None, :]
+        same = (tiers[:, None] == tiers[None, :]) & exclusive[:, None] & ~np.eye(len(nodes), dtype=bool)
+        return later | same | self._edge_matrix(self.forbidden_edges, nodes)
+
+    def required_matrix(self, nodes: List[str]) -> np.ndarray:
+        """
+        Returns the required edges between the given nodes.
+
+        Args:
+            nodes (List[str]): The nodes indexing the rows and columns of the matrix.
+
+        Returns:
+            np.ndarray: Boolean matrix where (i, j) is set if the edge nodes[i] -> nodes[j] is required.
+        """
+        return self._edge_matrix(self.required_edges, nodes)
+
 
 def parse_knowledge_file(file_path: str) -> Knowledge:
     """
-    Parses a knowledge file to extract required and forbidden edges.
+    Parses a knowledge file to extract required and forbidden edges and temporal tiers.
 
     Args:
         file_path (str): The path to the knowledge file.
 
     Returns:
-        Knowledge: An instance of the Knowledge class containing the parsed edges.
+        Knowledge: An instance of the Knowledge class containing the parsed edges and tiers.
 
     Raises:
         ValueError: If the file format is incorrect.
     """
     required_edges = set()
     forbidden_edges = set()
-    temporal_tiers = {}
+    tiers = {}
+    exclusive_tiers = []
 
     with open(file_path, "r") as file:
         lines = file.readlines()
@@ -77,14 +232,11 @@ def parse_knowledge_file(file_path: str) -> Knowledge:
             if line:
                 parts = line.split()
                 tier = parts[0]
-                nodes = parts[1:]
                 if tier.endswith("*"):
                     tier = tier.rstrip("*")
-                    for i in range(len(nodes)):
-                        for j in range(i + 1, len(nodes)):
-                            forbidden_edges.add((nodes[i], nodes[j]))
-                            forbidden_edges.add((nodes[j], nodes[i]))
-                temporal_tiers[int(tier)] = nodes
+                    exclusive_tiers.append(int(tier))
+                for node in parts[1:]:
+                    tiers[node] = int(tier)
 
         if section == "forbidden":
             if line:
@@ -98,14 +250,9 @@ def parse_knowledge_file(file_path: str) -> Knowledge:
                 if len(nodes) == 2:
                     required_edges.add((nodes[0], nodes[1]))
 
-    # Process temporal tiers to create forbidden edges
-    tiers_sorted = sorted(temporal_tiers.keys(), reverse=True)
-    for i in range(len(tiers_sorted)):
-        for j in range(i + 1, len(tiers_sorted)):
-            higher_tier_nodes = temporal_tiers[tiers_sorted[i]]
-            lower_tier_nodes = temporal_tiers[tiers_sorted[j]]
-            for higher_node in higher_tier_nodes:
-                for lower_node in lower_tier_nodes:
-                    forbidden_edges.add((higher_node, lower_node))
-
-    return Knowledge(required_edges=list(required_edges), forbidden_edges=list(forbidden_edges))
+    return Knowledge(
+        required_edges=list(required_edges),
+        forbidden_edges=list(forbidden_edges),
+        tiers=tiers,
+        exclusive_tiers=exclusive_tiers,
+    )
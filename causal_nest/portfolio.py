@@ -0,0 +1,309 @@
+import json
+import math
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from causal_nest.dataset import Dataset
+
+
+@dataclass
+class CostProfile:
+    """
+    A rough cost model for a discovery method, used to predict its runtime from the dataset shape.
+
+    The estimate is `overhead_seconds + base_seconds * (n / 1000) ** row_exponent * (p / 10) ** feature_exponent`,
+    where `n` is the number of rows and `p` the number of columns handed to the method. Methods whose search space
+    grows exponentially with the number of features (e.g. exact search) multiply the estimate by `2 ** (p - 10)`.
+
+    Attributes:
+        overhead_seconds (float): Fixed startup cost, such as spawning an R session or building a torch model.
+        base_seconds (float): Runtime on a reference dataset with 1000 rows and 10 features, excluding the overhead.
+        row_exponent (float): How the runtime scales with the number of rows.
+        feature_exponent (float): How the runtime scales with the number of features.
+        exponential_in_features (bool): Indicates if the search space is exponential in the number of features.
+    """
+
+    overhead_seconds: float = 0.0
+    base_seconds: float = 1.0
+    row_exponent: float = 1.0
+    feature_exponent: float = 2.0
+    exponential_in_features: bool = False
+
+    def estimate_seconds(self, n_rows: int, n_features: int) -> float:
+        """
+        Estimates the runtime of the method for a dataset of the given shape.
+
+        Args:
+            n_rows (int): The number of rows in the dataset.
+            n_features (int): The number of columns used by the method.
+
+        Returns:
+            float: The estimated runtime in seconds.
+        """
+        rows = max(n_rows, 1) / 1000
+        features = max(n_features, 1) / 10
+
+        seconds = self.base_seconds * rows**self.row_exponent * features**self.feature_exponent
+        if self.exponential_in_features:
+            # Clamp the exponent so absurdly wide datasets yield a huge estimate instead of an overflow
+            seconds *= 2 ** min(max(n_features - 10, 0), 512)
+
+        return self.overhead_seconds + seconds
+
+
+@dataclass
+class ModelHistory:
+    """
+    Aggregated outcomes of previous runs of a discovery method.
+
+    Attributes:
+        runs (int): Number of recorded runs.
+        successes (int): Number of runs that returned a graph.
+        timeouts (int): Number of runs that exceeded their time limit.
+        failures (int): Number of runs that crashed or raised an error.
+        runtime_ratio_sum (float): Sum of the observed runtime divided by the cost model estimate, over successful runs.
+        rank_sum (float): Sum of the normalized ranks (0 is the best, 1 the worst) over successful runs.
+        ranked_runs (int): Number of successful runs that were ranked against other methods.
+    """
+
+    runs: int = 0
+    successes: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    runtime_ratio_sum: float = 0.0
+    rank_sum: float = 0.0
+    ranked_runs: int = 0
+
+
+@dataclass
+class PortfolioHistory:
+    """
+    Historical success, timeout and ranking statistics for the discovery methods.
+
+    The history is updated by `causal_nest.discovery.discover_with_all_models` after each run and can be saved to and
+    loaded from a JSON file, so the portfolio selection improves across problems.
+
+    Attributes:
+        models (Dict[str, ModelHistory]): Map of statistics. The key is the discovery method name.
+    """
+
+    models: Dict[str, ModelHistory] = field(default_factory=dict)
+
+    def _get(self, model_name: str) -> ModelHistory:
+        if model_name not in self.models:
+            self.models[model_name] = ModelHistory()
+        return self.models[model_name]
+
+    def record_success(self, model_name: str, runtime: float, estimated_seconds: float):
+        """
+        Records a run that returned a graph.
+
+        Args:
+            model_name (str): The discovery method name.
+            runtime (float): The observed runtime in seconds.
+            estimated_seconds (float): The runtime predicted by the method cost profile.
+        """
+        h = self._get(model_name)
+        h.runs += 1
+        h.successes += 1
+        h.runtime_ratio_sum += runtime / max(estimated_seconds, 1e-6)
+
+    def record_timeout(self, model_name: str):
+        """
+        Records a run that exceeded its time limit.
+
+        Args:
+            model_name (str): The discovery method name.
+        """
+        h = self._get(model_name)
+        h.runs += 1
+        h.timeouts += 1
+
+    def record_failure(self, model_name: str):
+        """
+        Records a run that crashed or raised an error.
+
+        Args:
+            model_name (str): The discovery method name.
+        """
+        h = self._get(model_name)
+        h.runs += 1
+        h.failures += 1
+
+    def record_rank(self, model_name: str, normalized_rank: float):
+        """
+        Records how well a successful run ranked against the other methods on the same problem.
+
+        Args:
+            model_name (str): The discovery method name.
+            normalized_rank (float): The rank scaled to [0, 1], where 0 is the best result.
+        """
+        h = self._get(model_name)
+        h.rank_sum += normalized_rank
+        h.ranked_runs += 1
+
+    def success_rate(self, model_name: str) -> float:
+        """
+        Returns the smoothed rate of successful runs, assuming one success and one failure as prior.
+
+        Args:
+            model_name (str): The discovery method name.
+
+        Returns:
+            float: The smoothed success rate.
+        """
+        h = self.models.get(model_name, ModelHistory())
+        return (h.successes + 1) / (h.runs + 2)
+
+    def timeout_rate(self, model_name: str) -> float:
+        """
+        Returns the smoothed rate of timed out runs, assuming one timeout in ten runs as prior.
+
+        Args:
+            model_name (str): The discovery method name.
+
+        Returns:
+            float: The smoothed timeout rate.
+        """
+        h = self.models.get(model_name, ModelHistory())
+        return (h.timeouts + 1) / (h.runs + 10)
+
+    def runtime_calibration(self, model_name: str) -> float:
+        """
+        Returns the average ratio between the observed and the estimated runtime, or 1 without successful runs.
+
+        Args:
+            model_name (str): The discovery method name.
+
+        Returns:
+            float: The factor to apply to the cost profile estimate.
+        """
+        h = self.models.get(model_name, ModelHistory())
+        return h.runtime_ratio_sum / h.successes if h.successes else 1.0
+
+    def expected_quality(self, model_name: str) -> float:
+        """
+        Returns the expected quality of a method result in (0, 1], derived from its average normalized rank.
+
+        Args:
+            model_name (str): The discovery method name.
+
+        Returns:
+            float: The expected quality. Methods without ranked runs get a neutral 0.5.
+        """
+        h = self.models.get(model_name, ModelHistory())
+        return 1 - (h.rank_sum + 0.5) / (h.ranked_runs + 1)
+
+    def save(self, file_path: str):
+        """
+        Saves the history to a JSON file.
+
+        Args:
+            file_path (str): The path to the JSON file.
+        """
+        with open(file_path, "w") as file:
+            json.dump({name: asdict(h) for name, h in self.models.items()}, file, indent=2)
+
+    @classmethod
+    def load(cls, file_path: str) -> "PortfolioHistory":
+        """
+        Loads a history from a JSON file.
+
+        Args:
+            file_path (str): The path to the JSON file.
+
+        Returns:
+            PortfolioHistory: The loaded history.
+        """
+        with open(file_path, "r") as file:
+            content = json.load(file)
+
+        return cls(models={name: ModelHistory(**h) for name, h in content.items()})
+
+
+def estimate_model_seconds(model, dataset: Dataset, history: Optional[PortfolioHistory] = None) -> float:
+    """
+    Estimates the runtime of a discovery method on a dataset, calibrated by the history when available.
+
+    Args:
+        model (type): The discovery method class, exposing a `cost_profile` attribute.
+        dataset (Dataset): The dataset the method will run on.
+        history (Optional[PortfolioHistory]): Previous outcomes used to calibrate the estimate.
+
+    Returns:
+        float: The estimated runtime in seconds.
+    """
+    n_rows = len(dataset.data)
+    n_features = len(dataset.feature_mapping) + 1
+
+    seconds = model.cost_profile.estimate_seconds(n_rows, n_features)
+    if history is not None:
+        seconds *= history.runtime_calibration(model.__name__)
+
+    return seconds
+
+
+def select_portfolio(
+    dataset: Dataset,
+    models: List,
+    time_budget: float,
+    max_seconds_model: float,
+    max_workers: int = 1,
+    history: Optional[PortfolioHistory] = None,
+    max_timeout_rate: float = 0.5,
+) -> Tuple[List, Dict[str, str]]:
+    """
+    Picks the subset of discovery methods most likely to finish and rank well under a time budget.
+
+    Each method gets an expected runtime from its cost profile and the historical calibration. Methods predicted to
+    exceed `max_seconds_model` or with a historical timeout rate above `max_timeout_rate` are skipped. The remaining
+    ones are ranked by `success rate * expected quality / expected runtime` and greedily admitted while the sum of
+    their expected runtimes fits in `time_budget * max_workers` worker-seconds.
+
+    Args:
+        dataset (Dataset): The dataset the methods will run on.
+        models (List): The applicable discovery method classes.
+        time_budget (float): The wall-clock budget in seconds for the whole discovery stage.
+        max_seconds_model (float): The time limit in seconds for each method.
+        max_workers (int, optional): The number of methods running in parallel. Defaults to 1.
+        history (Optional[PortfolioHistory]): Previous outcomes used to calibrate the selection.
+        max_timeout_rate (float, optional): The highest accepted historical timeout rate. Defaults to 0.5.
+
+    Returns:
+        Tuple[List, Dict[str, str]]: The selected methods, in the original order, and a map of skipped methods to
+        the reason why they were skipped.
+    """
+    if history is None:
+        history = PortfolioHistory()
+
+    skipped = {}
+    candidates = []
+
+    for m in models:
+        name = m.__name__
+        seconds = estimate_model_seconds(m, dataset, history)
+
+        if seconds > max_seconds_model:
+            skipped[name] = f"estimated runtime of {seconds:.1f}s exceeds the {max_seconds_model}s model limit"
+            continue
+
+        timeout_rate = history.timeout_rate(name)
+        if timeout_rate > max_timeout_rate:
+            skipped[name] = f"historical timeout rate of {timeout_rate:.0%} is above {max_timeout_rate:.0%}"
+            continue
+
+        utility = history.success_rate(name) * history.expected_quality(name) / max(seconds, 1e-3)
+        candidates.append((utility, seconds, m))
+
+    capacity = time_budget * max(max_workers, 1)
+    selected = set()
+
+    for utility, seconds, m in sorted(candidates, key=lambda c: c[0], reverse=True):
+        if seconds > capacity and not math.isclose(seconds, capacity):
+            skipped[m.__name__] = f"estimated runtime of {seconds:.1f}s does not fit in the remaining time budget"
+            continue
+
+        capacity -= seconds
+        selected.add(m)
+
+    return [m for m in models if m in selected], skipped
@@ -24,6 +24,7 @@ class Problem:
         discovery_results (Optional[Dict[str, DiscoveryResult]]): Map of discovery results. The key is the discovery method name and the value is the result.
         estimation_results (Optional[Dict[str, List[EstimationResult]]]): Map of estimation results. The key is the discovery method name and the value is the list of feature estimations.
         refutation_results (Optional[Dict[str, List[RefutationResult]]]): Map of refutation results. The key is the discovery method name and the value is the list of feature refutations.
+        skipped_models (Optional[Dict[str, str]]): Map of discovery methods left out by the portfolio selection. The key is the discovery method name and the value is the reason.
     """
 
     dataset: Dataset
@@ -33,6 +34,7 @@ class Problem:
     discovery_results: Optional[Dict[str, DiscoveryResult]] = None
     estimation_results: Optional[Dict[str, List[EstimationResult]]] = None
     refutation_results: Optional[Dict[str, List[RefutationResult]]] = None
+    skipped_models: Optional[Dict[str, str]] = None
 
     def __post_init__(self):
         """
@@ -0,0 +1,87 @@
+from dataclasses import dataclass, replace
+from typing import FrozenSet, Optional
+
+from causal_nest.dataset import Dataset, FeatureType
+from causal_nest.distribution import is_linear, is_normal
+
+
+@dataclass
+class DatasetProfile:
+    """
+    Summary of a dataset used to decide which discovery methods apply to it, computed once and cached on the dataset.
+
+    The normality and linearity verdicts are only computed the first time a method with the matching assumption asks
+    for them, since their tests need numeric data with enough rows.
+    """
+
+    n_rows: int
+    """The number of rows of the data."""
+
+    n_features: int
+    """The number of mapped features."""
+
+    feature_types: FrozenSet[FeatureType]
+    """The types found in the feature mapping."""
+
+    normal: Optional[bool] = None
+    """The verdict of `is_normal`, or None if it was not computed yet."""
+
+    linear: Optional[bool] = None
+    """The verdict of `is_linear`, or None if it was not computed yet."""
+
+
+def dataset_profile(dataset: Dataset, normality: bool = False, linearity: bool = False) -> DatasetProfile:
+    """
+    Returns the profile of a dataset, built once and cached on it until its data, target or feature mapping change.
+
+    Args:
+        dataset (Dataset): The dataset.
+        normality (bool, optional): If True, makes sure the normality verdict is computed. Defaults to False.
+        linearity (bool, optional): If True, makes sure the linearity verdict is computed. Defaults to False.
+
+    Returns:
+        DatasetProfile: The profile of the dataset.
+
+    Raises:
+        ValueError: If the provided dataset is not an instance of `Dataset`.
+    """
+    if not isinstance(dataset, Dataset):
+        raise ValueError("Argument 'dataset' must be a CausalNest `Dataset` instance")
+
+    key = "profile"
+    if key not in dataset.cache:
+        dataset.cache[key] = DatasetProfile(
+            n_rows=len(dataset.data),
+            n_features=len(dataset.feature_mapping),
+            feature_types=frozenset(f.type for f in dataset.feature_mapping),
+        )
+
+    profile = dataset.cache[key]
+    if normality and profile.normal is None:
+        profile.normal = is_normal(dataset)
+    if linearity and profile.linear is None:
+        profile.linear = is_linear(dataset)
+    return profile
+
+
+def inherit_profile(source: Dataset, subsample: Dataset) -> Dataset:
+    """
+    Gives a subsample of a dataset the applicability verdicts of the full dataset, so the methods allowed on the full
+    dataset are not tested again on each subsample.
+
+    The subsample must keep a subset of the rows and features of the source. Its shape and feature types are its own.
+
+    Args:
+        source (Dataset): The full dataset.
+        subsample (Dataset): The subsample, which is updated in place.
+
+    Returns:
+        Dataset: The subsample.
+    """
+    if subsample is source or "profile" not in source.cache:
+        return subsample
+
+    own = dataset_profile(subsample)
+    inherited = source.cache["profile"]
+    subsample.cache["profile"] = replace(own, normal=inherited.normal, linear=inherited.linear)
+    return subsample
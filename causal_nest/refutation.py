@@ -1,7 +1,6 @@
 import time
 from concurrent.futures import FIRST_COMPLETED, TimeoutError, wait
 from dataclasses import replace
-from multiprocessing import cpu_count
 from timeit import default_timer as timer
 from typing import Dict, List
 
@@ -9,7 +8,9 @@ from pebble import ProcessPool
 
 from causal_nest.problem import Problem
 from causal_nest.refutation_models import PlaceboPermute, RandomCommonCause, RefutationMethodModel, SubsetRemoval
+from causal_nest.resources import plan_thread_budget
 from causal_nest.results import EstimationResult
+from causal_nest.workers import initialize_worker
 
 known_methods = [PlaceboPermute, RandomCommonCause, SubsetRemoval]
 
@@ -77,7 +78,8 @@ def refute_all_results(
         max_seconds_global (int, optional): The maximum time allowed for the global refutation process. Defaults to 180 seconds.
         max_seconds_model (int, optional): The maximum time allowed for each model's refutation process. Defaults to 25 seconds.
         verbose (bool, optional): If True, prints warnings and errors. Defaults to False.
-        max_workers (int, optional): The maximum number of workers to use. Defaults to the number of CPU cores.
+        max_workers (int, optional): The maximum number of workers to use. Defaults to one per result, up to the
+            number of CPUs allowed by the container quota.
 
     Returns:
         Problem: The problem instance with the refutation results added.
@@ -91,13 +93,14 @@ def refute_all_results(
     )
     refutation_results = {key: [] for key in problem.estimation_results.keys()}
 
-    if max_workers is None:
-        max_workers = cpu_count()
+    budget = plan_thread_budget(max_workers, tasks=len(sorted_results))
 
     start_time = time.time()
     elapsed_time = 0
 
-    with ProcessPool(max_workers=max_workers) as pool:
+    with ProcessPool(
+        max_workers=budget.processes, initializer=initialize_worker, initargs=(budget.threads_per_process,)
+    ) as pool:
         futures = []
 
         for er in sorted_results:
@@ -0,0 +1,152 @@
+import math
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+from threadpoolctl import threadpool_limits
+
+cgroup_root = "/sys/fs/cgroup"
+"""Mount point of the cgroup filesystem, read to find the container CPU quota."""
+
+thread_limit_variables = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+"""Environment variables read by the native thread pools (OpenMP, BLAS, NumExpr) when they start."""
+
+
+def _read(file_path: str) -> Optional[str]:
+    try:
+        with open(file_path, "r") as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_quota(root: str = None) -> Optional[float]:
+    """
+    Reads the CPU quota of the current cgroup, supporting both cgroup v2 and v1 layouts.
+
+    Args:
+        root (str, optional): The cgroup mount point. Defaults to `cgroup_root`.
+
+    Returns:
+        Optional[float]: The number of CPUs the quota allows, or None if there is no quota.
+    """
+    root = root or cgroup_root
+
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    content = _read(os.path.join(root, "cpu.max"))
+    if content:
+        quota, _, period = content.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+
+    # cgroup v1: a negative quota means unlimited
+    for directory in ["cpu", "cpu,cpuacct", "cpuacct,cpu"]:
+        quota = _read(os.path.join(root, directory, "cpu.cfs_quota_us"))
+        period = _read(os.path.join(root, directory, "cpu.cfs_period_us"))
+        if quota and period:
+            return int(quota) / int(period) if int(quota) > 0 else None
+
+    return None
+
+
+def available_cpus(root: str = None) -> int:
+    """
+    Returns the number of CPUs this process can actually use.
+
+    Unlike `multiprocessing.cpu_count`, which reports the host cores, it accounts for the CPU affinity mask and the
+    container cgroup quota.
+
+    Args:
+        root (str, optional): The cgroup mount point. Defaults to `cgroup_root`.
+
+    Returns:
+        int: The number of usable CPUs, at least 1.
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+    quota = cgroup_cpu_quota(root)
+    if quota is not None:
+        cpus = min(cpus, math.floor(quota))
+
+    return max(cpus, 1)
+
+
+@dataclass
+class ThreadBudget:
+    """
+    Split of the available CPUs between worker processes and the threads inside each worker.
+
+    Attributes:
+        processes (int): The number of worker processes.
+        threads_per_process (int): The number of threads each worker may use for BLAS, OpenMP and torch.
+    """
+
+    processes: int
+    threads_per_process: int
+
+
+def plan_thread_budget(max_workers: int = None, tasks: int = None) -> ThreadBudget:
+    """
+    Splits the available CPUs between worker processes and per-process threads.
+
+    Without an explicit `max_workers`, one process is used per task, up to the number of available CPUs. The CPUs
+    left are shared as threads, so fewer long tasks can still use the whole quota.
+
+    Args:
+        max_workers (int, optional): The number of worker processes. Defaults to None, which picks it automatically.
+        tasks (int, optional): The number of tasks that will be submitted to the pool. Defaults to None.
+
+    Returns:
+        ThreadBudget: The number of processes and threads per process.
+    """
+    cpus = available_cpus()
+
+    processes = max_workers if max_workers is not None else cpus
+    if max_workers is None and tasks is not None:
+        processes = min(processes, max(tasks, 1))
+
+    return ThreadBudget(processes=processes, threads_per_process=max(cpus // processes, 1))
+
+
+def limit_threads(threads: int):
+    """
+    Limits the native thread pools of the current process.
+
+    Sets the thread environment variables for pools that have not started yet (including R and its BLAS), resizes the
+    already loaded BLAS and OpenMP pools and, when loaded, torch and the cdt default number of jobs.
+
+    Args:
+        threads (int): The maximum number of threads.
+    """
+    for variable in thread_limit_variables:
+        os.environ[variable] = str(threads)
+
+    threadpool_limits(limits=threads)
+
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+
+    if "cdt" in sys.modules:
+        sys.modules["cdt"].SETTINGS.NJOBS = threads
+
+
+def thread_limit() -> int:
+    """
+    Returns the number of threads the current process may use, which sizes the thread pools of the native engines.
+
+    Inside a pool worker this is the `ThreadBudget.threads_per_process` set by `limit_threads`. Elsewhere it is the
+    limit of the thread environment variables, if the user set one, or the number of available CPUs.
+
+    Returns:
+        int: The number of threads, at least 1.
+    """
+    value = os.environ.get(thread_limit_variables[0], "")
+    return int(value) if value.isdigit() and int(value) > 0 else available_cpus()
@@ -120,7 +120,7 @@ def generate_result_graph(
 
     for u, v in dr.output_graph.edges():
         color = "black"
-        if problem.knowledge is not None and (u, v) in problem.knowledge.forbidden_edges:
+        if problem.knowledge is not None and problem.knowledge.is_forbidden(u, v):
             color = "red"
 
         dot.append(f'   "{u}" -> "{v}"[color={color}];')
@@ -1,8 +1,11 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
 
 import networkx as nx
 
+from causal_nest.graph import ArrayGraph
+from causal_nest.utils import graph_to_gml_string
+
 
 @dataclass
 class DiscoveryResult:
@@ -20,6 +23,18 @@ class DiscoveryResult:
         knowledge_integrity_score (Optional[float]): The knowledge integrity score.
         forbidden_edges_violation_rate (Optional[float]): The rate of forbidden edges violations.
         required_edges_compliance_rate (Optional[float]): The rate of required edges compliance.
+        warm_started_from (Optional[str]): The name of the model whose graph was used as the search starting point.
+        degraded (bool): Indicates if the result comes from a retry in a cheaper configuration.
+        degradation (Optional[str]): A description of the cheaper configuration of a degraded result.
+        score_cache_hits (Optional[int]): The local scores the model found in the shared score cache.
+        score_cache_misses (Optional[int]): The local scores the model had to compute.
+        rows_used (Optional[int]): The number of rows the graph was discovered from, when the model ran on a subsample
+            of the dataset (a sample size controller or a degraded retry). None means every row was used.
+        cache (Dict[Any, Any]): Values derived from the output graph, such as its dowhy representation, computed once
+            and shared by every treatment. Copies made with `dataclasses.replace` start with an empty cache.
+
+    Pickled results, sent to worker processes or serialized for the gRPC service, store the output graph as an
+    `ArrayGraph` edge list whenever it only carries edge weights, and restore it as a networkx graph.
     """
 
     output_graph: nx.DiGraph = None
@@ -32,6 +47,37 @@ class DiscoveryResult:
     knowledge_integrity_score: Optional[float] = None
     forbidden_edges_violation_rate: Optional[float] = None
     required_edges_compliance_rate: Optional[float] = None
+    warm_started_from: Optional[str] = None
+    degraded: bool = False
+    degradation: Optional[str] = None
+    score_cache_hits: Optional[int] = None
+    score_cache_misses: Optional[int] = None
+    rows_used: Optional[int] = None
+    cache: Dict[Any, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def dowhy_graph(self) -> str:
+        """
+        Returns the output graph in the GML format dowhy parses natively, converted once per result.
+
+        Returns:
+            str: The GML string representation of the output graph.
+        """
+        if "dowhy_graph" not in self.cache:
+            self.cache["dowhy_graph"] = graph_to_gml_string(self.output_graph)
+        return self.cache["dowhy_graph"]
+
+    def __getstate__(self) -> Dict:
+        state = dict(self.__dict__)
+        graph = self.output_graph
+        if isinstance(graph, nx.DiGraph) and _is_plain_graph(graph):
+            weighted = any("weight" in data for _, _, data in graph.edges(data=True))
+            state["output_graph"] = ArrayGraph.from_networkx(graph, weight="weight" if weighted else None)
+        return state
+
+    def __setstate__(self, state: Dict):
+        if isinstance(state.get("output_graph"), ArrayGraph):
+            state = dict(state, output_graph=state["output_graph"].to_networkx())
+        self.__dict__.update(state)
 
     def print(self):
         """
@@ -53,6 +99,27 @@ class DiscoveryResult:
         print("\t\tIntegrity Score: {}".format(self.knowledge_integrity_score))
         print("\t\tForbidden Edges Violation Rate: {}".format(self.forbidden_edges_violation_rate))
         print("\t\tRequired Edges Compliance Rate: {}".format(self.required_edges_compliance_rate))
+        if self.rows_used is not None:
+            print("\t\tRows Used: {}".format(self.rows_used))
+        if self.warm_started_from is not None:
+            print("\t\tWarm Started From: {}".format(self.warm_started_from))
+        if self.degraded:
+            print("\t\tDegraded: {}".format(self.degradation))
+        if self.score_cache_hits or self.score_cache_misses:
+            print("\t\tScore Cache Hits/Misses: {}/{}".format(self.score_cache_hits, self.score_cache_misses))
         print("\n")
 
         return ""
+
+
+def _is_plain_graph(graph: nx.DiGraph) -> bool:
+    """Checks if an `ArrayGraph` holds the whole graph: no attributes except non-zero numeric edge weights."""
+    return (
+        type(graph) is nx.DiGraph
+        and not graph.graph
+        and not any(graph.nodes[n] for n in graph.nodes)
+        and all(
+            set(data) <= {"weight"} and isinstance(data.get("weight", 1), (int, float)) and data.get("weight", 1) != 0
+            for _, _, data in graph.edges(data=True)
+        )
+    )
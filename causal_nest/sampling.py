@@ -0,0 +1,126 @@
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+import networkx as nx
+import numpy as np
+
+from causal_nest.dataset import Dataset, problem_type_for_dataset
+
+
+def stratified_order(dataset: Dataset, n_bins: int = 10, random_state: int = 0) -> np.ndarray:
+    """
+    Returns an ordering of the rows whose every prefix is a stratified random sample, computed once per dataset.
+
+    The strata are the target classes for a classification target and the target deciles otherwise. Each row is keyed
+    by its random rank within its stratum divided by the stratum size, so sorting by the keys interleaves the strata in
+    proportion to their sizes, and growing subsamples are nested.
+
+    Args:
+        dataset (Dataset): The dataset.
+        n_bins (int, optional): The number of quantile bins of a regression target. Defaults to 10.
+        random_state (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        np.ndarray: The row positions in sampling order.
+    """
+    key = ("stratified_order", n_bins, random_state)
+    if key in dataset.cache:
+        return dataset.cache[key]
+
+    target = dataset.data[dataset.target].to_numpy()
+    if problem_type_for_dataset(dataset) == "classification":
+        _, strata = np.unique(target, return_inverse=True)
+    else:
+        edges = np.nanquantile(target.astype(float), np.linspace(0, 1, n_bins + 1)[1:-1])
+        strata = np.searchsorted(edges, target.astype(float))
+
+    rng = np.random.default_rng(random_state)
+    n = len(target)
+    shuffled = rng.permutation(n)
+    by_stratum = shuffled[np.argsort(strata[shuffled], kind="stable")]
+    sizes = np.bincount(strata)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    ranks = np.empty(n)
+    ranks[by_stratum] = np.arange(n) - np.repeat(starts, sizes)
+    keys = (ranks + rng.random(n)) / sizes[strata]
+
+    dataset.cache[key] = np.argsort(keys, kind="stable")
+    return dataset.cache[key]
+
+
+def stratified_subsample(dataset: Dataset, n_rows: int, random_state: int = 0) -> Dataset:
+    """
+    Generates a copy of the dataset with a stratified random subset of rows, nested across sizes.
+
+    Args:
+        dataset (Dataset): The dataset definition.
+        n_rows (int): The number of rows to keep.
+        random_state (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        Dataset: A copy of the dataset with at most `n_rows` rows.
+    """
+    if n_rows >= len(dataset.data):
+        return dataset
+    rows = np.sort(stratified_order(dataset, random_state=random_state)[:n_rows])
+    return replace(dataset, data=dataset.data.iloc[rows])
+
+
+@dataclass
+class SampleSizeController:
+    """
+    Runs a discovery model on growing stratified subsamples and stops once the graph is stable.
+
+    Sizes start at `initial_rows` and grow geometrically by `growth_factor` up to `max_rows` or the full dataset. The
+    graph is stable when the directed edges that changed between two consecutive sizes are at most `tolerance` times
+    the edges of the larger graph.
+
+    Attributes:
+        initial_rows (int): The rows of the first subsample.
+        growth_factor (float): The ratio between consecutive sizes, greater than 1.
+        max_rows (Optional[int]): The maximum number of rows. None allows the full dataset.
+        tolerance (float): The share of changed edges still considered stable.
+    """
+
+    initial_rows: int = 1000
+    growth_factor: float = 2.0
+    max_rows: Optional[int] = None
+    tolerance: float = 0.0
+
+    def __post_init__(self):
+        if self.initial_rows < 1:
+            raise ValueError("Argument 'initial_rows' must be positive")
+        if self.growth_factor <= 1:
+            raise ValueError("Argument 'growth_factor' must be greater than 1")
+
+    def sizes(self, n_rows: int) -> List[int]:
+        """
+        Returns the increasing subsample sizes for a dataset.
+
+        Args:
+            n_rows (int): The number of rows of the dataset.
+
+        Returns:
+            List[int]: The sizes, the last one being `n_rows` or `max_rows`, whichever is smaller.
+        """
+        limit = min(n_rows, self.max_rows) if self.max_rows is not None else n_rows
+        sizes = []
+        size = float(self.initial_rows)
+        while size < limit:
+            sizes.append(int(size))
+            size *= self.growth_factor
+        return sizes + [limit]
+
+    def is_stable(self, previous: nx.DiGraph, current: nx.DiGraph) -> bool:
+        """
+        Checks if the graph stopped changing between two consecutive sizes.
+
+        Args:
+            previous (nx.DiGraph): The graph of the smaller subsample.
+            current (nx.DiGraph): The graph of the larger subsample.
+
+        Returns:
+            bool: True if the changed edges are within the tolerance, False otherwise.
+        """
+        changed = set(previous.edges()) ^ set(current.edges())
+        return len(changed) <= self.tolerance * current.number_of_edges()
@@ -1,140 +1,256 @@
-import networkx as nx
-from cdt.metrics import SHD, SID, precision_recall
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
 from networkx import DiGraph
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components, shortest_path
 
+from causal_nest.engines import auc_pr, shd, sid
+from causal_nest.graph import ArrayGraph, as_array_graph
 from causal_nest.knowledge import Knowledge
 
 
-def calculate_auc_pr(graph_1: DiGraph, graph_2: DiGraph) -> float:
+def _aligned_matrices(graph_1, graphs, weight: str = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the adjacency matrix of a graph and the stacked matrices of other graphs over its nodes, in its order.
+
+    Nodes of the other graphs missing from the first are ignored, and nodes missing from them have no edges.
+    """
+    truth = as_array_graph(graph_1)
+    aligned = [as_array_graph(g, truth.nodes, weight=weight) for g in graphs]
+    stack = [a.weights if weight else a.matrix for a in aligned]
+    return truth.matrix, np.stack(stack) if stack else np.zeros((0, len(truth), len(truth)))
+
+
+def calculate_ground_truth_metrics(
+    ground_truth: Union[DiGraph, ArrayGraph], graphs: List[Union[DiGraph, ArrayGraph]]
+) -> Dict[str, List[float]]:
+    """
+    Scores several graphs against a ground truth at once.
+
+    The graphs are aligned on the nodes of the ground truth and stacked, so each metric is computed by one call to the
+    vectorized implementations of `causal_nest.engines.metrics`.
+
+    Args:
+        ground_truth (Union[DiGraph, ArrayGraph]): The ground truth directed graph.
+        graphs (List[Union[DiGraph, ArrayGraph]]): The directed graphs to evaluate.
+
+    Returns:
+        Dict[str, List[float]]: The "auc_pr", "shd" and "sid" values of each graph.
+    """
+    truth, matrices = _aligned_matrices(ground_truth, graphs)
+    _, weights = _aligned_matrices(ground_truth, graphs, weight="weight")
+    return {
+        "auc_pr": auc_pr(truth, weights).tolist(),
+        "shd": shd(truth, matrices).tolist(),
+        "sid": sid(truth, matrices).tolist(),
+    }
+
+
+def calculate_auc_pr(graph_1: Union[DiGraph, ArrayGraph], graph_2: Union[DiGraph, ArrayGraph]) -> float:
     """
     Calculates the Area Under the Precision-Recall Curve (AUC-PR) between two graphs.
 
+    The "weight" attribute of the edges of the second graph, 1 by default, is the confidence of each edge.
+
     Args:
-        graph_1 (DiGraph): The first directed graph.
-        graph_2 (DiGraph): The second directed graph.
+        graph_1 (Union[DiGraph, ArrayGraph]): The first directed graph, taken as the ground truth.
+        graph_2 (Union[DiGraph, ArrayGraph]): The second directed graph.
 
     Returns:
         float: The AUC-PR value.
     """
-    auc_pr, _curve = precision_recall(graph_1, graph_2)
-    return auc_pr
+    return float(auc_pr(*_aligned_matrices(graph_1, [graph_2], weight="weight"))[0])
 
 
-def calculate_shd(graph_1: DiGraph, graph_2: DiGraph) -> float:
+def calculate_shd(graph_1: Union[DiGraph, ArrayGraph], graph_2: Union[DiGraph, ArrayGraph]) -> float:
     """
     Calculates the Structural Hamming Distance (SHD) between two graphs.
 
+    Missing, extra and reversed edges count as one mistake each.
+
     Args:
-        graph_1 (DiGraph): The first directed graph.
-        graph_2 (DiGraph): The second directed graph.
+        graph_1 (Union[DiGraph, ArrayGraph]): The first directed graph, taken as the ground truth.
+        graph_2 (Union[DiGraph, ArrayGraph]): The second directed graph.
 
     Returns:
         float: The SHD value.
     """
-    return SHD(graph_1, graph_2, double_for_anticausal=False)
+    return float(shd(*_aligned_matrices(graph_1, [graph_2]))[0])
 
 
-def calculate_sid(graph_1: DiGraph, graph_2: DiGraph) -> float:
+def calculate_sid(graph_1: Union[DiGraph, ArrayGraph], graph_2: Union[DiGraph, ArrayGraph]) -> float:
     """
     Calculates the Structural Intervention Distance (SID) between two graphs.
 
+    Both graphs must be acyclic.
+
     Args:
-        graph_1 (DiGraph): The first directed graph.
-        graph_2 (DiGraph): The second directed graph.
+        graph_1 (Union[DiGraph, ArrayGraph]): The first directed graph, taken as the ground truth.
+        graph_2 (Union[DiGraph, ArrayGraph]): The second directed graph.
 
     Returns:
         float: The SID value.
     """
-    return SID(graph_1, graph_2)
+    return float(sid(*_aligned_matrices(graph_1, [graph_2]))[0])
+
 
+def _total_betweenness(graph: ArrayGraph, max_exact_nodes: int, n_pivots: int, random_state: int) -> float:
+    """
+    Returns the sum of the normalized betweenness centrality of every node of a graph.
 
-def calculate_graph_ranking_score(graph: DiGraph, target: str) -> float:
+    Every shortest path from s to t crosses d(s, t) - 1 intermediate nodes, so the sum over the nodes of the share of
+    shortest paths through them is the sum of d(s, t) - 1 over the connected pairs, which only needs breadth-first
+    distances. Graphs with more than `max_exact_nodes` nodes estimate it from `n_pivots` random sources.
+    """
+    n = len(graph)
+    if n <= 2:
+        return 0.0
+
+    sources, scale = None, 1 / ((n - 1) * (n - 2))
+    if n > max_exact_nodes and n_pivots < n:
+        sources = np.random.default_rng(random_state).choice(n, size=n_pivots, replace=False)
+        scale *= n / n_pivots
+
+    distances = shortest_path(sparse.csr_matrix(graph.matrix), unweighted=True, indices=sources)
+    connected = np.isfinite(distances) & (distances > 0)
+    return float((distances[connected] - 1).sum() * scale)
+
+
+def calculate_graph_ranking_scores(
+    graphs: List[Union[DiGraph, ArrayGraph]],
+    target: str,
+    max_exact_nodes: int = 500,
+    n_pivots: int = 256,
+    random_state: int = 0,
+) -> List[float]:
+    """
+    Calculates the ranking score of several graphs at once. See `calculate_graph_ranking_score`.
+
+    The graphs are stacked in a block diagonal adjacency matrix, so the distances to the target, the in-degrees, the
+    densities and the weak connectivity of every graph come from single passes over it. The betweenness centrality is
+    exact for graphs with up to `max_exact_nodes` nodes and sampled from `n_pivots` sources for larger ones.
+
+    Args:
+        graphs (List[Union[DiGraph, ArrayGraph]]): The directed graphs to evaluate.
+        target (str): The target node in the graphs.
+        max_exact_nodes (int, optional): The largest graph whose betweenness is computed exactly. Defaults to 500.
+        n_pivots (int, optional): The sources sampled to estimate the betweenness of larger graphs. Defaults to 256.
+        random_state (int, optional): The random seed of the sampled sources. Defaults to 0.
+
+    Returns:
+        List[float]: The ranking score of each graph.
+    """
+    arrays = [as_array_graph(g) for g in graphs]
+    scores = np.zeros(len(arrays))
+    ranked = [i for i, a in enumerate(arrays) if target in a]
+    if not ranked:
+        return scores.tolist()
+
+    arrays = [arrays[i] for i in ranked]
+    sizes = np.array([len(a) for a in arrays])
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    owner = np.repeat(np.arange(len(arrays)), sizes)
+    targets = offsets + np.array([a.index[target] for a in arrays])
+    blocks = sparse.block_diag([sparse.csr_matrix(a.matrix) for a in arrays], format="csr")
+
+    # Fraction of the nodes that are direct causes of the target
+    edge_score = np.asarray(blocks.sum(axis=0)).ravel()[targets] / sizes
+
+    # One reverse breadth-first search from every target, through an extra node linked to all of them
+    total = len(owner)
+    sources, destinations = blocks.nonzero()
+    reverse = sparse.csr_matrix(
+        (
+            np.ones(len(sources) + len(targets)),
+            (np.concatenate([destinations, np.full(len(targets), total)]), np.concatenate([sources, targets])),
+        ),
+        shape=(total + 1, total + 1),
+    )
+    distances = shortest_path(reverse, unweighted=True, indices=total)[:total] - 1
+    reached = np.isfinite(distances)
+    counts = np.bincount(owner[reached], minlength=len(arrays))
+    avg_distance = np.bincount(owner[reached], weights=distances[reached], minlength=len(arrays)) / counts
+    distance_score = 1 / (avg_distance + 1)
+
+    edges = np.bincount(owner[sources], minlength=len(arrays))
+    density_score = np.where(sizes > 1, edges / np.maximum(sizes * (sizes - 1), 1), 0)
+
+    # Graphs whose nodes all share one weakly connected component
+    n_components, labels = connected_components(blocks, directed=True, connection="weak")
+    component_owner = np.zeros(n_components, dtype=int)
+    component_owner[labels] = owner
+    connectivity_score = np.bincount(component_owner, minlength=len(arrays)) == 1
+
+    betweenness_score = np.array([_total_betweenness(a, max_exact_nodes, n_pivots, random_state) for a in arrays])
+
+    scores[ranked] = 100 * edge_score * distance_score * density_score * connectivity_score * betweenness_score
+    return scores.tolist()
+
+
+def calculate_graph_ranking_score(graph: Union[DiGraph, ArrayGraph], target: str) -> float:
     """
     Calculates a ranking score for the graph based on various metrics.
 
+    The score is the product of the fraction of nodes with an edge into the target, the inverse of one plus the average
+    distance of the nodes reaching the target, the density, the weak connectivity and the sum of the normalized
+    betweenness centrality of the nodes, times 100. Graphs without the target score 0.
+
     Args:
-        graph (nx.DiGraph): The directed graph to evaluate.
+        graph (Union[nx.DiGraph, ArrayGraph]): The directed graph to evaluate.
         target (str): The target node in the graph.
 
     Returns:
         float: The calculated ranking score.
     """
-    # Score 0 para grafos sem o alvo
-    if target not in graph.nodes():
-        return 0
-
-    # Verifica se há arestas chegando ao vértice alvo
-    num_in_edges = graph.in_degree(target)
-
-    # Calcula a distância média de cada nó para o vértice alvo
-    num_nodes = len(graph.nodes())
-    distances = []
-    for node in graph.nodes():
-        try:
-            distance = nx.shortest_path_length(graph, source=node, target=target)
-            distances.append(distance)
-        except nx.NetworkXNoPath:
-            pass
-    avg_distance = sum(distances) / len(distances) if distances else 0
-
-    # Calcula a densidade do grafo
-    density = nx.density(graph)
-    # Verifica se o grafo é conexo
-    is_connected = nx.is_weakly_connected(graph)
-    # Calcula a centralidade de intermediação (betweenness centrality)
-    betweenness_centrality = nx.betweenness_centrality(graph)
-
-    # Aumenta o score proporcionalmente ao número de arestas chegando ao vértice alvo
-    edge_score = num_in_edges / num_nodes
-    # Aumenta o score inversamente proporcional à distância média dos nós até o vértice alvo, para penalizar grafos com nós distantes do alvo
-    distance_score = 1 / (avg_distance + 1)
-    # Aumenta o score proporcionalmente à densidade do grafo, indicando uma maior interconectividade
-    density_score = density
-    # Aumenta o score se o grafo for conexo, indicando que todas as variáveis estão conectadas de alguma forma
-    connectivity_score = 1 if is_connected else 0
-    # Aumenta o score proporcionalmente à soma da centralidade de intermediação de todos os nós, indicando a importância dos nós na rede
-    betweenness_score = sum(betweenness_centrality.values())
+    return calculate_graph_ranking_scores([graph], target)[0]
 
-    # Score final baseado nas métricas
-    score = 100 * (edge_score * distance_score * density_score * connectivity_score * betweenness_score)
 
-    return score
+def _knowledge_nodes(graph: Union[DiGraph, ArrayGraph], knowledge: Knowledge) -> List[str]:
+    """Returns the nodes of the graph followed by the other nodes mentioned by the knowledge."""
+    return list(dict.fromkeys([*as_array_graph(graph).nodes, *knowledge.nodes()]))
 
 
-def forbidden_edges_violation_rate(graph: nx.DiGraph, knowledge: Knowledge) -> float:
+def forbidden_edges_violation_rate(graph: Union[DiGraph, ArrayGraph], knowledge: Knowledge) -> float:
     """
     Calculates the rate of forbidden edges violations in the graph.
 
+    The forbidden edges, explicit or implied by the temporal tiers, are compared at once with the adjacency matrix.
+
     Args:
-        graph (nx.DiGraph): The directed graph to evaluate.
+        graph (Union[nx.DiGraph, ArrayGraph]): The directed graph to evaluate.
         knowledge (Knowledge): The knowledge instance containing forbidden edges.
 
     Returns:
         float: The rate of forbidden edges violations.
     """
-    if len(knowledge.forbidden_edges) == 0:
+    nodes = _knowledge_nodes(graph, knowledge)
+    forbidden = knowledge.forbidden_matrix(nodes)
+    if not forbidden.any():
         return 0.0
 
-    violated_edges = sum(1 for forbidden_edge in knowledge.forbidden_edges if graph.has_edge(*forbidden_edge))
-    return violated_edges / len(knowledge.forbidden_edges)
+    violated_edges = np.count_nonzero(as_array_graph(graph, nodes).matrix & forbidden)
+    return violated_edges / np.count_nonzero(forbidden)
 
 
-def required_edges_compliance_rate(graph: nx.DiGraph, knowledge: Knowledge) -> float:
+def required_edges_compliance_rate(graph: Union[DiGraph, ArrayGraph], knowledge: Knowledge) -> float:
     """
     Calculates the compliance rate of required edges in the graph.
 
     Args:
-        graph (nx.DiGraph): The directed graph to evaluate.
+        graph (Union[nx.DiGraph, ArrayGraph]): The directed graph to evaluate.
         knowledge (Knowledge): The knowledge instance containing required edges.
 
     Returns:
         float: The compliance rate of required edges.
     """
-    if len(knowledge.required_edges) == 0:
+    nodes = _knowledge_nodes(graph, knowledge)
+    required = knowledge.required_matrix(nodes)
+    if not required.any():
         return 1.0
 
-    required_edges = sum(1 for required_edge in knowledge.required_edges if graph.has_edge(*required_edge))
-    return required_edges / len(knowledge.required_edges)
+    required_edges = np.count_nonzero(as_array_graph(graph, nodes).matrix & required)
+    return required_edges / np.count_nonzero(required)
 
 
 def graph_integrity_score(violation_rate: float, compliance_rate: float) -> float:
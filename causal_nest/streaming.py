@@ -0,0 +1,91 @@
+from typing import List, Sequence
+
+import numpy as np
+import torch as th
+from torch.utils.data import Dataset as TorchDataset
+
+from causal_nest.dataset import Dataset, featured_only_data
+
+
+def dataset_buffer(dataset: Dataset) -> np.ndarray:
+    """
+    Returns the features and target of a dataset as one float32 array, built once per dataset and shared by the
+    neural discovery methods.
+
+    Args:
+        dataset (Dataset): The dataset.
+
+    Returns:
+        np.ndarray: Array of shape (rows, features + 1), in the column order of `featured_only_data`.
+    """
+    key = "float32_buffer"
+    if key not in dataset.cache:
+        dataset.cache[key] = np.ascontiguousarray(featured_only_data(dataset).to_numpy(dtype=np.float32))
+    return dataset.cache[key]
+
+
+def subsample_rows(n_rows: int, max_rows: int = None, random_state: int = 0) -> np.ndarray:
+    """
+    Returns sorted row indexes of a random subsample without replacement.
+
+    Args:
+        n_rows (int): The number of rows of the data.
+        max_rows (int, optional): The size of the subsample. Defaults to None, which keeps every row.
+        random_state (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        np.ndarray: The row indexes.
+    """
+    if max_rows is None or max_rows >= n_rows:
+        return np.arange(n_rows)
+    return np.sort(np.random.default_rng(random_state).choice(n_rows, size=max_rows, replace=False))
+
+
+class RowSampler(TorchDataset):
+    """
+    Torch dataset streaming standardized rows of a shared buffer, with the interface of `cdt.utils.io.MetaDataset`.
+
+    Rows are read and standardized one mini-batch at a time, so no full-size tensor is ever built. With
+    `rows_per_epoch`, an epoch is that many rows drawn at random from the whole buffer, so the cost of an epoch does
+    not grow with the number of rows.
+
+    Attributes:
+        buffer (np.ndarray): The shared float32 data, not copied.
+        names (List[str]): The column names.
+        rows_per_epoch (int): The number of rows of an epoch, or None for every row.
+    """
+
+    def __init__(self, buffer: np.ndarray, names: List[str], rows_per_epoch: int = None, random_state: int = 0):
+        super().__init__()
+        self.buffer = buffer
+        self.names = list(names)
+        self.rows_per_epoch = rows_per_epoch
+        self.mean = buffer.mean(axis=0, dtype=np.float64).astype(np.float32)
+        std = buffer.std(axis=0, dtype=np.float64).astype(np.float32)
+        self.std = np.where(std > 0, std, 1).astype(np.float32)
+        self.rng = np.random.default_rng(random_state)
+
+    def get_names(self) -> List[str]:
+        """Returns the column names in the order of the columns."""
+        return self.names
+
+    def to(self, device) -> "RowSampler":
+        """Returns the dataset itself, since batches are built on the CPU when requested."""
+        return self
+
+    def __len__(self) -> int:
+        if self.rows_per_epoch is None:
+            return len(self.buffer)
+        return min(self.rows_per_epoch, len(self.buffer))
+
+    def __featurelen__(self) -> int:
+        return self.buffer.shape[1]
+
+    def __getitems__(self, indexes: Sequence[int]) -> List[th.Tensor]:
+        if self.rows_per_epoch is not None and self.rows_per_epoch < len(self.buffer):
+            indexes = self.rng.integers(0, len(self.buffer), size=len(indexes))
+        # One vectorized read and standardization per batch, split into row views for the default collate
+        return list(th.from_numpy((self.buffer[np.asarray(indexes)] - self.mean) / self.std))
+
+    def __getitem__(self, index: int) -> th.Tensor:
+        return self.__getitems__([index])[0]
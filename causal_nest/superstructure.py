@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import List
+
+import numpy as np
+from scipy.stats import norm
+from sklearn.covariance import GraphicalLasso
+
+from causal_nest.dataset import Dataset, featured_only_data
+
+
+class ScreeningMethod(Enum):
+    """An enumeration of the cheap screening tests used to build a superstructure."""
+
+    PARTIAL_CORRELATION = "partial_correlation"
+    """Keeps the pairs whose partial correlation, given all other variables, is significant under a Fisher z-test."""
+
+    GRAPHICAL_LASSO = "graphical_lasso"
+    """Keeps the pairs with a non-zero entry in the sparse precision matrix estimated by the graphical lasso."""
+
+    DISTANCE_CORRELATION = "distance_correlation"
+    """Keeps the pairs whose distance correlation, which also captures nonlinear dependence, exceeds a threshold.
+    Computed on a row subsample, since it is quadratic in the number of rows."""
+
+
+@dataclass
+class Superstructure:
+    """
+    Set of candidate edges a discovery method is allowed to consider. Any pair outside it is a forbidden edge.
+
+    Attributes:
+        nodes (List[str]): The node labels indexing the rows and columns of `candidates`.
+        candidates (np.ndarray): Symmetric boolean matrix where the entry (i, j) is True if nodes i and j may be
+            adjacent.
+        method (ScreeningMethod): The screening test used to build the superstructure.
+    """
+
+    nodes: List[str]
+    candidates: np.ndarray
+    method: ScreeningMethod
+
+    def allows(self, u: str, v: str) -> bool:
+        """
+        Checks if an edge between two nodes is a candidate, in either direction.
+
+        Args:
+            u (str): The first node.
+            v (str): The second node.
+
+        Returns:
+            bool: True if the edge is a candidate, False otherwise. Nodes outside the superstructure are unrestricted.
+        """
+        if u not in self.nodes or v not in self.nodes:
+            return True
+        return bool(self.candidates[self.nodes.index(u), self.nodes.index(v)])
+
+    def matrix(self, nodes: List[str]) -> np.ndarray:
+        """
+        Returns the candidate matrix reindexed to the given node order.
+
+        Args:
+            nodes (List[str]): The node labels indexing the rows and columns of the result. Nodes outside the
+                superstructure may be adjacent to any node.
+
+        Returns:
+            np.ndarray: The boolean candidate matrix over `nodes`, with a False diagonal.
+        """
+        index = {n: i for i, n in enumerate(self.nodes)}
+        positions = np.array([index.get(n, -1) for n in nodes])
+        known = positions >= 0
+
+        result = np.ones((len(nodes), len(nodes)), dtype=bool)
+        result[np.ix_(known, known)] = self.candidates[np.ix_(positions[known], positions[known])]
+        np.fill_diagonal(result, False)
+        return result
+
+    def density(self) -> float:
+        """
+        Returns the share of node pairs kept as candidates.
+
+        Returns:
+            float: The share of candidate pairs, between 0 and 1.
+        """
+        p = len(self.nodes)
+        return float(self.candidates.sum() / (p * (p - 1))) if p > 1 else 0.0
+
+
+def _standardize(x: np.ndarray) -> np.ndarray:
+    std = x.std(axis=0)
+    return (x - x.mean(axis=0)) / np.where(std > 0, std, 1)
+
+
+def _partial_correlation_candidates(x: np.ndarray, alpha: float) -> np.ndarray:
+    n, p = x.shape
+    precision = np.linalg.pinv(np.corrcoef(x, rowvar=False))
+    d = np.sqrt(np.abs(np.diag(precision)))
+    partial = np.clip(-precision / np.outer(d, d), -0.999999, 0.999999)
+
+    # Fisher z-test conditioning on the p - 2 remaining variables
+    dof = max(n - p - 1, 1)
+    z = np.sqrt(dof) * np.abs(np.arctanh(partial))
+    return 2 * norm.sf(z) < alpha
+
+
+def _graphical_lasso_candidates(x: np.ndarray, penalty: float) -> np.ndarray:
+    model = GraphicalLasso(alpha=penalty, max_iter=200).fit(_standardize(x))
+    return np.abs(model.precision_) > 1e-8
+
+
+def _centered_distances(columns: np.ndarray) -> np.ndarray:
+    # Double-centered distance matrices of the given columns, flattened: shape (k, n * n)
+    distances = np.abs(columns.T[:, :, None] - columns.T[:, None, :])
+    grand_mean = distances.mean(axis=(1, 2), keepdims=True)
+    distances -= distances.mean(axis=1, keepdims=True) + distances.mean(axis=2, keepdims=True)
+    distances += grand_mean
+    return distances.reshape(distances.shape[0], -1)
+
+
+def _distance_correlation_candidates(
+    x: np.ndarray, threshold: float, max_rows: int, max_bytes: int = 256 * 2**20
+) -> np.ndarray:
+    if len(x) > max_rows:
+        x = x[np.random.default_rng(0).choice(len(x), size=max_rows, replace=False)]
+
+    # Two blocks of centered matrices are held at a time, so memory does not grow with the number of columns
+    n, p = x.shape
+    block = max(1, min(p, max_bytes // (2 * 8 * n * n)))
+    starts = range(0, p, block)
+    dcov = np.empty((p, p))
+    for i in starts:
+        left = _centered_distances(x[:, i : i + block])
+        for j in starts:
+            if j < i:
+                continue
+            right = left if j == i else _centered_distances(x[:, j : j + block])
+            dcov[i : i + block, j : j + block] = left @ right.T / (n * n)
+            dcov[j : j + block, i : i + block] = dcov[i : i + block, j : j + block].T
+
+    dvar = np.sqrt(np.clip(np.diag(dcov), 0, None))
+    dcor = np.sqrt(np.clip(dcov, 0, None) / np.where(np.outer(dvar, dvar) > 0, np.outer(dvar, dvar), np.inf))
+
+    return dcor > threshold
+
+
+def compute_superstructure(
+    dataset: Dataset,
+    method: ScreeningMethod = ScreeningMethod.PARTIAL_CORRELATION,
+    alpha: float = 0.05,
+    penalty: float = 0.1,
+    threshold: float = 0.1,
+    max_rows: int = 1000,
+) -> Superstructure:
+    """
+    Screens all pairs of columns of a dataset and keeps the ones that may be adjacent in the causal graph.
+
+    Args:
+        dataset (Dataset): The dataset to screen.
+        method (ScreeningMethod, optional): The screening test. Defaults to ScreeningMethod.PARTIAL_CORRELATION.
+        alpha (float, optional): The significance level of the partial correlation test. Defaults to 0.05.
+        penalty (float, optional): The L1 penalty of the graphical lasso, on standardized data. Defaults to 0.1.
+        threshold (float, optional): The minimum distance correlation of a candidate pair. Defaults to 0.1.
+        max_rows (int, optional): The row subsample size of the distance correlation. Defaults to 1000.
+
+    Returns:
+        Superstructure: The candidate edges over the dataset features and target.
+    """
+    fod = featured_only_data(dataset)
+    x = fod.to_numpy(dtype=float)
+
+    if method == ScreeningMethod.PARTIAL_CORRELATION:
+        candidates = _partial_correlation_candidates(x, alpha)
+    elif method == ScreeningMethod.GRAPHICAL_LASSO:
+        candidates = _graphical_lasso_candidates(x, penalty)
+    elif method == ScreeningMethod.DISTANCE_CORRELATION:
+        candidates = _distance_correlation_candidates(x, threshold, max_rows)
+    else:
+        raise ValueError("Argument 'method' must be a `ScreeningMethod` enum value")
+
+    candidates = candidates | candidates.T
+    np.fill_diagonal(candidates, False)
+
+    return Superstructure(nodes=list(fod.columns), candidates=candidates, method=method)
+
+
+def dataset_superstructure(
+    dataset: Dataset, method: ScreeningMethod = ScreeningMethod.PARTIAL_CORRELATION
+) -> Superstructure:
+    """
+    Returns the superstructure of a dataset, computing it only once per dataset and screening method.
+
+    Args:
+        dataset (Dataset): The dataset to screen.
+        method (ScreeningMethod, optional): The screening test. Defaults to ScreeningMethod.PARTIAL_CORRELATION.
+
+    Returns:
+        Superstructure: The candidate edges over the dataset features and target.
+    """
+    key = ("superstructure", method)
+    if key not in dataset.cache:
+        dataset.cache[key] = compute_superstructure(dataset, method)
+    return dataset.cache[key]
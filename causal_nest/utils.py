@@ -1,8 +1,11 @@
-from copy import deepcopy
+from typing import List
 
 import networkx as nx
+import numpy as np
 from networkx.drawing.nx_pydot import to_pydot
 
+from causal_nest.graph import ArrayGraph, as_array_graph
+
 
 def graph_to_pydot_string(graph: nx.DiGraph):
     """
@@ -20,12 +23,128 @@ def graph_to_pydot_string(graph: nx.DiGraph):
     return to_pydot(graph).to_string()
 
 
+def graph_to_gml_string(graph: nx.DiGraph) -> str:
+    """
+    Converts a NetworkX directed graph to a GML string representation.
+
+    GML is read by dowhy with the networkx parser, which is much faster than building and parsing DOT through pydot.
+    Node labels are converted to strings, as in the DOT representation.
+
+    Args:
+        graph (nx.DiGraph): The NetworkX directed graph to convert.
+
+    Returns:
+        str: The GML string representation of the graph.
+    """
+    return "\n".join(nx.generate_gml(graph, stringizer=str))
+
+
+def adjacency_matrix(graph: nx.DiGraph, nodes: List[str]) -> np.ndarray:
+    """
+    Converts a NetworkX directed graph to a binary adjacency matrix over the given nodes.
+
+    Nodes of the graph that are not in `nodes` are ignored, and nodes missing from the graph have no edges.
+
+    Args:
+        graph (nx.DiGraph): The NetworkX directed graph to convert.
+        nodes (List[str]): The node labels indexing the rows and columns of the matrix.
+
+    Returns:
+        np.ndarray: A matrix where the entry (i, j) is 1 if the graph has the edge nodes[i] -> nodes[j].
+    """
+    return as_array_graph(graph, nodes).matrix.astype(float)
+
+
+def _weighted_edge_order(weights: np.ndarray, exists: np.ndarray, last: int = None) -> List[int]:
+    """
+    Orders the nodes of a strongly connected component with the Eades-Lin-Smyth feedback arc set heuristic.
+
+    Sinks are moved to the end and sources to the front. Otherwise, the node with the largest difference between its
+    outgoing and incoming edge weights inside the component goes to the front, so the edges pointing backwards in the
+    order, which must be reversed or removed, are light. Ties follow the node order. Runs in O(V^2).
+
+    Args:
+        weights (np.ndarray): The weights of the edges of the component.
+        exists (np.ndarray): Boolean matrix of the edges of the component.
+        last (int, optional): A node forced to the end of the order, so none of its incoming edges points backwards.
+
+    Returns:
+        List[int]: The positions of the nodes in order.
+    """
+    remaining = np.ones(len(exists), dtype=bool)
+    if last is not None:
+        remaining[last] = False
+
+    w = np.where(exists, weights, 0)
+    e = exists.astype(int)
+    out_weight, in_weight = w @ remaining, remaining @ w
+    out_degree, in_degree = e @ remaining, remaining @ e
+
+    def remove(nodes):
+        remaining[nodes] = False
+        out_weight[:] -= w[:, nodes].sum(axis=1)
+        in_weight[:] -= w[nodes, :].sum(axis=0)
+        out_degree[:] -= e[:, nodes].sum(axis=1)
+        in_degree[:] -= e[nodes, :].sum(axis=0)
+
+    head, tail = [], []
+    while remaining.any():
+        sinks = np.flatnonzero(remaining & (out_degree == 0))
+        sources = np.flatnonzero(remaining & (in_degree == 0))
+        if sinks.size:
+            tail.extend(sinks.tolist())
+            remove(sinks)
+        elif sources.size:
+            head.extend(sources.tolist())
+            remove(sources)
+        else:
+            u = int(np.argmax(np.where(remaining, out_weight - in_weight, -np.inf)))
+            head.append(u)
+            remove([u])
+
+    return head + tail[::-1] + ([last] if last is not None else [])
+
+
+def _dagify(g: nx.DiGraph, target_node=None) -> nx.DiGraph:
+    """
+    Breaks the cycles of every strongly connected component, in place, with `_weighted_edge_order`.
+
+    The components and orders are computed on an `ArrayGraph`, and only the changed edges touch the networkx graph.
+    Self-loops are removed. The edges pointing backwards in the order of their component are reversed, keeping their
+    attributes, or removed when the reversed edge already exists. The result is acyclic, since every remaining edge
+    points forwards either in the order of a component or in the condensation of the graph.
+    """
+    g.remove_edges_from(list(nx.selfloop_edges(g)))
+    structure = ArrayGraph.from_networkx(g)
+    weights = ArrayGraph.from_networkx(g, weight="weight").weights
+    exists = structure.matrix
+
+    for component in structure.strongly_connected_components():
+        target = structure.index.get(target_node)
+        last = int(np.flatnonzero(component == target)[0]) if target in component else None
+        block = np.ix_(component, component)
+        order = _weighted_edge_order(weights[block], exists[block], last=last)
+
+        position = np.empty(len(component), dtype=int)
+        position[order] = np.arange(len(component))
+        backward = exists[block] & (position[:, None] > position[None, :])
+        for i, j in zip(*np.nonzero(backward)):
+            u, v = structure.nodes[component[i]], structure.nodes[component[j]]
+            data = g[u][v]
+            g.remove_edge(u, v)
+            if not g.has_edge(v, u):
+                g.add_edge(v, u, **data)
+
+    return g
+
+
 def dagify_graph(g: nx.DiGraph) -> nx.DiGraph:
     """
     Input a graph and output a DAG.
 
-    The heuristic is to reverse the edge with the lowest score of the cycle
-    if possible, else remove it.
+    The heuristic orders the nodes of each strongly connected component so that the edges against the order have the
+    lowest total weight, then reverses those edges, or removes them when the reversed edge already exists. Edges
+    without a weight count as 1. It runs in polynomial time, O(V^2), and modifies the graph in place.
 
     Args:
         g (networkx.DiGraph): Graph to modify to output a DAG
@@ -33,49 +152,16 @@ def dagify_graph(g: nx.DiGraph) -> nx.DiGraph:
     Returns:
         networkx.DiGraph: DAG made out of the input graph.
     """
-    ncycles = len(list(nx.simple_cycles(g)))
-    while not nx.is_directed_acyclic_graph(g):
-        cycle = next(nx.simple_cycles(g))
-        if len(cycle) == 2:
-            source_node = cycle[0]
-            target_node = cycle[1]
-            if g.has_edge(source_node, target_node):
-                g.remove_edge(source_node, target_node)
-        else:
-            edges = [(cycle[-1], cycle[0])]
-            if g.has_edge(cycle[-1], cycle[0]):
-                scores = [g[cycle[-1]][cycle[0]].get("weight", 1)]
-            else:
-                scores = [1]  # Default weight for unweighted edges
-            for i, j in zip(cycle[:-1], cycle[1:]):
-                edges.append((i, j))
-                if g.has_edge(i, j):
-                    scores.append(g[i][j].get("weight", 1))
-                else:
-                    scores.append(1)  # Default weight for unweighted edges
-
-            i, j = edges[scores.index(min(scores))]
-            gc = deepcopy(g)
-            gc.remove_edge(i, j)
-            gc.add_edge(j, i)
-            ngc = len(list(nx.simple_cycles(gc)))
-            if ngc < ncycles:
-                if g.has_edge(j, i):
-                    g.add_edge(j, i, weight=min(scores))
-                else:
-                    g.add_edge(j, i)
-            g.remove_edge(i, j)
-            ncycles = ngc
-    return g
+    return _dagify(g)
 
 
 def dagify_graph_v2(g: nx.DiGraph, target_node) -> nx.DiGraph:
     """
     Input a graph and output a DAG while handling cycles involving a target node.
 
-    The function modifies the graph to output a DAG. If a cycle contains an edge
-    X -> Y where Y is the target_node, it preserves this edge. If edges are not
-    oriented and one of the nodes in it is the target_node, it orients it as X -> target_node.
+    The function modifies the graph to output a DAG, as `dagify_graph` does, but places the target node last in the
+    order of its strongly connected component. Every edge X -> target_node is therefore preserved, and edges leaving
+    the target inside a cycle are oriented as X -> target_node.
 
     Args:
         g (networkx.DiGraph): Graph to modify to output a DAG.
@@ -84,55 +170,4 @@ def dagify_graph_v2(g: nx.DiGraph, target_node) -> nx.DiGraph:
     Returns:
         networkx.DiGraph: DAG made out of the input graph.
     """
-    ncycles = len(list(nx.simple_cycles(g)))
-    while not nx.is_directed_acyclic_graph(g):
-        cycle = next(nx.simple_cycles(g))
-        if len(cycle) == 2:
-            source_node = cycle[0]
-            target_node_in_cycle = cycle[1]
-            if target_node_in_cycle == target_node:
-                continue  # Preserve the edge X -> target_node
-            if g.has_edge(source_node, target_node_in_cycle):
-                g.remove_edge(source_node, target_node_in_cycle)
-        else:
-            edges = [(cycle[-1], cycle[0])]
-            if g.has_edge(cycle[-1], cycle[0]):
-                scores = [g[cycle[-1]][cycle[0]].get("weight", 1)]
-            else:
-                scores = [1]  # Default weight for unweighted edges
-            for i, j in zip(cycle[:-1], cycle[1:]):
-                edges.append((i, j))
-                if g.has_edge(i, j):
-                    scores.append(g[i][j].get("weight", 1))
-                else:
-                    scores.append(1)  # Default weight for unweighted edges
-
-            # Check if any edge in the cycle points towards target_node
-            edge_to_preserve = None
-            for edge in edges:
-                if edge[1] == target_node:
-                    edge_to_preserve = edge
-                    break
-
-            if edge_to_preserve:
-                # Preserve the edge X -> target_node
-                i, j = edge_to_preserve
-                if not g.has_edge(i, j):
-                    g.add_edge(i, j)
-                continue
-
-            # Otherwise, find the edge with the minimum score to reverse
-            i, j = edges[scores.index(min(scores))]
-            gc = deepcopy(g)
-            gc.remove_edge(i, j)
-            gc.add_edge(j, i)
-            ngc = len(list(nx.simple_cycles(gc)))
-            if ngc < ncycles:
-                if g.has_edge(j, i):
-                    g.add_edge(j, i, weight=min(scores))
-                else:
-                    g.add_edge(j, i)
-            g.remove_edge(i, j)
-            ncycles = ngc
-
-    return g
+    return _dagify(g, target_node)
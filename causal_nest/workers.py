@@ -0,0 +1,78 @@
+import os
+import signal
+from queue import Empty
+from typing import Iterable, MutableMapping, Set
+
+from causal_nest.engines import configure_score_cache
+from causal_nest.resources import limit_threads
+
+
+def isolate_process_group():
+    """
+    Makes the current process the leader of a new process group.
+
+    Used as the initializer of the worker pools, so the subprocesses spawned by a worker (such as the `Rscript`
+    sessions started by cdt) share its process group and can be killed together with `kill_process_groups`.
+    """
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+
+def initialize_worker(threads: int, score_store: MutableMapping = None, pid_queue=None):
+    """
+    Initializer of the worker pools: isolates the worker process group and applies its share of the thread budget.
+
+    Args:
+        threads (int): The number of threads the worker may use, usually `ThreadBudget.threads_per_process`.
+        score_store (MutableMapping, optional): A mapping shared between the workers, attached to their local score
+            cache. Defaults to None, which keeps each worker cache private.
+        pid_queue (multiprocessing.Queue, optional): A queue created for the pool, where the worker reports its PID so
+            only the process groups of this pool are killed. Defaults to None.
+    """
+    isolate_process_group()
+    limit_threads(threads)
+    if score_store is not None:
+        configure_score_cache(shared=score_store)
+    if pid_queue is not None:
+        pid_queue.put(os.getpid())
+
+
+def reported_pids(pid_queue) -> Set[int]:
+    """
+    Returns the worker PIDs reported so far by `initialize_worker`, without waiting for new ones.
+
+    Args:
+        pid_queue (multiprocessing.Queue): The queue given to the initializer of the pool.
+
+    Returns:
+        Set[int]: The PIDs taken from the queue.
+    """
+    pids = set()
+    while True:
+        try:
+            pids.add(pid_queue.get_nowait())
+        except Empty:
+            return pids
+
+
+def kill_process_groups(pids: Iterable[int]):
+    """
+    Kills the process groups led by the given worker PIDs, including any orphaned subprocesses.
+
+    Workers that were not isolated with `isolate_process_group` or whose groups are already gone are ignored.
+
+    Args:
+        pids (Iterable[int]): The PIDs of the workers leading the process groups.
+    """
+    if not hasattr(os, "killpg"):
+        return
+
+    own_group = os.getpgrp()
+
+    for pid in pids:
+        if pid == own_group:
+            continue
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def non_gaussian_chain_data():
+    """Uniform noise data of the chain x0 -> x1 -> x2 and an independent x3, in the column order x2, x3, x0, x1."""
+    n = 2000
+    rng = np.random.default_rng(0)
+    e = rng.uniform(-1, 1, size=(n, 4))
+    x0 = e[:, 0]
+    x1 = 2 * x0 + e[:, 1]
+    x2 = -1.5 * x1 + e[:, 2]
+    x3 = e[:, 3]
+    # Columns shuffled so the order is not the column order
+    return np.c_[x2, x3, x0, x1]
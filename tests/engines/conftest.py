@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def collider_data():
+    """Gaussian data where A -> C <- B, C -> D and E is independent of the rest."""
+    n = 3000
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=n)
+    b = rng.normal(size=n)
+    c = a + b + rng.normal(size=n)
+    d = 2 * c + rng.normal(size=n)
+    e = rng.normal(size=n)
+    return np.c_[a, b, c, d, e]
+
+
+@pytest.fixture
+def linear_chain_covariance():
+    """Covariance matrix of the Gaussian chain A -> B -> C, with weights 1.5 and -1."""
+    n = 2000
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=n)
+    b = 1.5 * a + rng.normal(size=n)
+    c = -1.0 * b + rng.normal(size=n)
+    return np.cov(np.c_[a, b, c], rowvar=False, bias=True)
+
+
+@pytest.fixture
+def discrete_chain_data():
+    """Discrete data of the chain A -> B -> C, where each child copies its parent 80% of the time, and a free D."""
+    n = 5000
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 3, n)
+    b = np.where(rng.random(n) < 0.8, a, rng.integers(0, 3, n))
+    c = np.where(rng.random(n) < 0.8, b, rng.integers(0, 3, n))
+    d = rng.integers(0, 4, n)
+    return np.c_[a, b, c, d]
+
+
+@pytest.fixture
+def nonlinear_chain_data():
+    """Data of the nonlinear chain A -> B -> C, with B = A^2 and C = cos(B), and an independent D."""
+    n = 2000
+    rng = np.random.default_rng(1)
+    a = rng.normal(size=n)
+    b = a**2 + 0.3 * rng.normal(size=n)
+    c = np.cos(b) + 0.3 * rng.normal(size=n)
+    d = rng.normal(size=n)
+    return np.c_[a, b, c, d]
+
+
+@pytest.fixture
+def additive_chain_data():
+    """Data of the additive chain A -> B -> C, with B = sin(2A) and C = B^2, and an independent D."""
+    n = 1000
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=n)
+    b = np.sin(2 * a) + 0.3 * rng.normal(size=n)
+    c = b**2 + 0.3 * rng.normal(size=n)
+    d = rng.normal(size=n)
+    return np.c_[a, b, c, d]
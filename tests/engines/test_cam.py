@@ -0,0 +1,39 @@
+import numpy as np
+
+from causal_nest.engines import SplineBases, cam
+from causal_nest.engines.cam import greedy_dag_search, preliminary_neighbourhoods, prune_dag
+
+
+def test_spline_bases_batched_rss_matches_individual_fits(additive_chain_data):
+    bases = SplineBases(additive_chain_data)
+    batched = bases.rss_with_each(2, [0], [1, 3])
+    assert np.allclose(batched, [bases.rss(2, [0, 1]), bases.rss(2, [0, 3])])
+
+
+def test_preliminary_neighbourhoods_keeps_strongest_candidates(additive_chain_data):
+    candidates = preliminary_neighbourhoods(SplineBases(additive_chain_data), max_neighbours=1)
+    assert candidates[:, 2].tolist() == [False, True, False, False]
+    assert candidates.sum(axis=0).tolist() == [1, 1, 1, 1]
+
+
+def test_greedy_search_is_acyclic_and_pruning_removes_spurious_edges(additive_chain_data):
+    bases = SplineBases(additive_chain_data)
+    dag = greedy_dag_search(bases, ~np.eye(4, dtype=bool))
+    assert np.all(np.linalg.matrix_power(dag.astype(int), 4) == 0)
+
+    pruned = prune_dag(bases, dag)
+    assert not (pruned & ~dag).any()
+
+
+def test_cam_recovers_nonlinear_chain_in_parallel(additive_chain_data):
+    expected = np.zeros((4, 4), dtype=bool)
+    expected[0, 1] = expected[1, 2] = True
+    assert (cam(additive_chain_data) == expected).all()
+    assert (cam(additive_chain_data, n_jobs=2) == expected).all()
+
+
+def test_cam_respects_superstructure(additive_chain_data):
+    superstructure = ~np.eye(4, dtype=bool)
+    superstructure[1, 2] = superstructure[2, 1] = False
+    dag = cam(additive_chain_data, superstructure=superstructure)
+    assert not dag[1, 2] and not dag[2, 1]
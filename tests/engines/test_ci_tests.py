@@ -0,0 +1,75 @@
+import numpy as np
+
+from causal_nest.engines import (
+    ChiSquare,
+    DiscreteBIC,
+    FisherZ,
+    GSquare,
+    RandomFourierCITest,
+    encode_discrete,
+    joint_codes,
+)
+
+
+def test_encode_discrete_keeps_levels_and_bins_continuous_columns():
+    data = np.c_[np.array(["x", "y", "x", "z"] * 25, dtype=object), np.linspace(0, 1, 100)]
+    codes, levels = encode_discrete(data, max_levels=10, bins=4)
+    assert list(levels) == [3, 4]
+    assert list(codes[:4, 0]) == [0, 1, 0, 2]
+    assert np.bincount(codes[:, 1]).tolist() == [25, 25, 25, 25]
+
+
+def test_joint_codes_number_observed_combinations():
+    codes = np.array([[0, 1], [2, 0], [0, 1], [1, 1]])
+    combined, size = joint_codes(codes, np.array([3, 2]), [0, 1])
+    assert size == 3
+    assert combined[0] == combined[2]
+    assert len(set(combined.tolist())) == 3
+
+
+def test_discrete_tests_detect_conditional_independence(discrete_chain_data):
+    for test in (GSquare(discrete_chain_data), ChiSquare(discrete_chain_data)):
+        assert test.pvalue(0, 2) < 0.01
+        assert test.pvalue(0, 2, [1]) > 0.01
+        assert test.pvalue(0, 3) > 0.01
+
+
+def test_discrete_tests_batch_and_chunk_consistently(discrete_chain_data):
+    test = GSquare(discrete_chain_data)
+    batched = test.pvalues(0, [2, 3], [1])
+    test.max_table_size = 1
+    assert np.allclose(batched, [test.pvalue(0, 2, [1]), test.pvalue(0, 3, [1])])
+
+
+def test_discrete_bic_prefers_true_parents(discrete_chain_data):
+    score = DiscreteBIC(discrete_chain_data)
+    assert score.local_score(2, [1]) > score.local_score(2, [])
+    assert score.local_score(2, [1]) > score.local_score(2, [1, 3])
+    assert score.local_score(2, [1]) > score.local_score(2, [0])
+
+
+def test_random_fourier_test_detects_nonlinear_conditional_independence(nonlinear_chain_data):
+    x = nonlinear_chain_data
+    test = RandomFourierCITest(x)
+    assert FisherZ(x).pvalue(0, 1) > 0.01
+    assert test.pvalue(0, 1) < 0.01
+    assert test.pvalue(0, 2) < 0.01
+    assert test.pvalue(0, 2, [1]) > 0.01
+    assert test.pvalue(0, 3) > 0.01
+
+
+def test_random_fourier_test_caches_feature_maps(nonlinear_chain_data):
+    test = RandomFourierCITest(nonlinear_chain_data)
+    batched = test.pvalues(0, [2, 3], [1])
+    assert set(test._features) == {0, 2, 3}
+    assert list(test._bases) == [(1,)]
+    assert np.allclose(batched, [test.pvalue(0, 2, [1]), test.pvalue(0, 3, [1])])
+
+
+def test_random_fourier_test_accumulates_row_blocks_consistently(nonlinear_chain_data):
+    whole = RandomFourierCITest(nonlinear_chain_data)
+    blocked = RandomFourierCITest(nonlinear_chain_data)
+    blocked.max_block_bytes = 8 * 3 * blocked.n_features**2 * 100
+    assert len(blocked._row_blocks(3)) == 20
+    assert np.allclose(blocked.pvalues(0, [1, 2, 3], [1]), whole.pvalues(0, [1, 2, 3], [1]))
+    assert np.allclose(blocked.pvalues(0, [2, 3]), whole.pvalues(0, [2, 3]))
@@ -0,0 +1,28 @@
+import numpy as np
+
+from causal_nest.engines import causal_order, direct_lingam, prune_order
+
+
+def test_causal_order_recovers_chain_order(non_gaussian_chain_data):
+    order = causal_order(non_gaussian_chain_data)
+    assert [i for i in order if i != 1] == [2, 3, 0]
+
+
+def test_causal_order_is_the_same_with_parallel_candidates(non_gaussian_chain_data):
+    x = non_gaussian_chain_data
+    assert causal_order(x, n_jobs=3) == causal_order(x)
+
+
+def test_prune_order_keeps_only_direct_edges(non_gaussian_chain_data):
+    x = non_gaussian_chain_data
+    adjacency = prune_order(x, [2, 3, 0, 1])
+    assert np.isclose(adjacency[2, 3], 2, atol=0.1)
+    assert np.isclose(adjacency[3, 0], -1.5, atol=0.1)
+    assert set(zip(*np.nonzero(adjacency))) == {(2, 3), (3, 0)}
+
+
+def test_direct_lingam_returns_order_and_adjacency(non_gaussian_chain_data):
+    order, adjacency = direct_lingam(non_gaussian_chain_data)
+    assert sorted(order) == [0, 1, 2, 3]
+    assert adjacency.shape == (4, 4)
+    assert set(zip(*np.nonzero(adjacency))) == {(2, 3), (3, 0)}
@@ -0,0 +1,61 @@
+import numpy as np
+
+from causal_nest.engines import GaussianBIC, LocalScoreCache, dag_to_cpdag, fges, pdag_to_dag
+
+
+def test_gaussian_bic_prefers_true_parents_and_memoizes(collider_data):
+    score = GaussianBIC(collider_data[:, :4])
+    assert score.local_score(2, {0, 1}) > score.local_score(2, {0})
+    assert score.local_score(2, {0, 1}) > score.local_score(2, {0, 1, 3}) - 1e6
+    assert score.local_score(2, [1, 0]) == score.local_score(2, {0, 1})
+
+
+def test_gaussian_bic_scores_parent_sets_in_one_batch(collider_data):
+    x = np.c_[collider_data[:, :4], collider_data[:, 0] + collider_data[:, 1]]
+    parent_sets = [(), (0,), (0, 1), (0, 1, 3), (0, 1, 4)]
+    expected = [GaussianBIC(x, cache=LocalScoreCache()).local_score(2, s) for s in parent_sets]
+
+    score = GaussianBIC(x, cache=LocalScoreCache())
+    assert np.allclose(score.local_scores(2, parent_sets), expected)
+    assert score.cache.stats() == {"hits": 0, "misses": 5}
+    assert np.allclose(score.local_scores(2, parent_sets[::-1]), expected[::-1])
+    assert score.cache.stats() == {"hits": 5, "misses": 5}
+
+
+def test_dag_to_cpdag_keeps_only_compelled_edges():
+    chain = np.array([[0, 1, 0], [0, 0, 1], [0, 0, 0]])
+    assert (dag_to_cpdag(chain) == np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]], dtype=bool)).all()
+
+    collider = np.array([[0, 0, 1, 0], [0, 0, 1, 0], [0, 0, 0, 1], [0, 0, 0, 0]])
+    assert (dag_to_cpdag(collider) == collider.astype(bool)).all()
+
+
+def test_pdag_to_dag_extends_without_new_v_structures():
+    pdag = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]], dtype=bool)
+    dag = pdag_to_dag(pdag)
+    assert ((dag | dag.T) == pdag).all()
+    assert (dag_to_cpdag(dag) == pdag).all()
+
+
+def test_fges_recovers_collider(collider_data):
+    cpdag = fges(collider_data[:, :4])
+    expected = np.array([[0, 0, 1, 0], [0, 0, 1, 0], [0, 0, 0, 1], [0, 0, 0, 0]], dtype=bool)
+    assert (cpdag == expected).all()
+
+
+def test_fges_never_inserts_edges_outside_superstructure(collider_data):
+    superstructure = np.ones((4, 4), dtype=bool)
+    superstructure[2, 3] = superstructure[3, 2] = False
+    cpdag = fges(collider_data[:, :4], superstructure=superstructure)
+    assert not cpdag[2, 3] and not cpdag[3, 2]
+
+
+def test_fges_from_initial_graph_reaches_the_same_result(collider_data):
+    initial = np.array([[0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1], [0, 0, 0, 0]])
+    x = collider_data[:, :4]
+    assert (fges(x, initial_graph=initial) == fges(x)).all()
+
+
+def test_fges_with_parallel_scoring_matches_serial(collider_data):
+    x = collider_data[:, :4]
+    assert (fges(x, n_jobs=3) == fges(x)).all()
@@ -0,0 +1,85 @@
+import networkx as nx
+import numpy as np
+import pytest
+from sklearn.metrics import auc, precision_recall_curve
+
+from causal_nest.engines import auc_pr, reachability, shd, sid
+
+# Example of Peters and Bühlmann (2015): both candidates are one edge away from the truth, but only the second one
+# gets interventional distributions wrong
+TRUTH = np.array(
+    [[0, 1, 1, 1, 1], [0, 0, 1, 1, 1], [0, 0, 0, 0, 0], [0, 0, 0, 0, 0], [0, 0, 0, 0, 0]],
+    dtype=bool,
+)
+EXTRA_EDGE = TRUTH.copy()
+EXTRA_EDGE[2, 3] = True
+REVERSED_EDGE = TRUTH.copy()
+REVERSED_EDGE[0, 1], REVERSED_EDGE[1, 0] = False, True
+
+
+def test_reachability():
+    chain = np.array([[0, 1, 0], [0, 0, 1], [0, 0, 0]], dtype=bool)
+    assert reachability(chain).tolist() == [[True, True, True], [False, True, True], [False, False, True]]
+
+
+def test_shd_scores_a_stack_of_candidates():
+    distances = shd(TRUTH, np.stack([TRUTH, EXTRA_EDGE, REVERSED_EDGE, np.zeros_like(TRUTH)]))
+    assert distances.tolist() == [0, 1, 1, 7]
+
+
+def test_sid_matches_published_example():
+    assert sid(TRUTH, np.stack([TRUTH, EXTRA_EDGE, REVERSED_EDGE])).tolist() == [0, 0, 8]
+
+
+def test_sid_counts_missing_confounder_adjustment():
+    truth = np.array([[0, 1, 1], [0, 0, 1], [0, 0, 0]], dtype=bool)
+    # Without the edge 0 -> 1, the effects of 1 on 0 and on 2 are not adjusted for 0
+    candidate = truth.copy()
+    candidate[0, 1] = False
+    assert sid(truth, candidate).tolist() == [2]
+
+
+def random_dag(rng, p, density):
+    order = rng.permutation(p)
+    upper = np.triu(rng.random((p, p)) < density, k=1)
+    return upper[np.ix_(np.argsort(order), np.argsort(order))]
+
+
+def brute_force_sid(truth, candidate):
+    # Counts the pairs (i, j) for which the parents of i in the candidate are not a valid adjustment set in the truth
+    g = nx.DiGraph(truth)
+    distance = 0
+    for i in g.nodes():
+        parents = set(np.flatnonzero(candidate[:, i]))
+        descendants = nx.descendants(g, i)
+        for j in g.nodes():
+            if j == i:
+                continue
+            if j in parents:
+                distance += j in descendants
+                continue
+            on_causal_paths = {w for w in descendants if w == j or j in nx.descendants(g, w)}
+            forbidden = set().union(*(nx.descendants(g, w) | {w} for w in on_causal_paths))
+            back_door = g.copy()
+            back_door.remove_edges_from([(i, k) for k in g.successors(i) if k in on_causal_paths])
+            valid = not parents & forbidden and nx.d_separated(back_door, {i}, {j}, parents)
+            distance += not valid
+    return distance
+
+
+def test_sid_matches_adjustment_criterion_on_random_dags():
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        p = int(rng.integers(2, 8))
+        truth, candidate = random_dag(rng, p, 0.4), random_dag(rng, p, 0.4)
+        assert sid(truth, candidate).tolist() == [brute_force_sid(truth, candidate)]
+
+
+def test_auc_pr_matches_sklearn():
+    rng = np.random.default_rng(0)
+    truth = rng.random((6, 6)) < 0.3
+    weights = rng.choice([0.5, 1.0, 2.0], size=(3, 6, 6))
+    scores = np.where(rng.random((3, 6, 6)) < 0.4, weights, 0)
+    for area, candidate in zip(auc_pr(truth, scores), scores):
+        precision, recall, _ = precision_recall_curve(truth.ravel(), candidate.ravel())
+        assert area == pytest.approx(auc(recall, precision))
@@ -0,0 +1,42 @@
+import numpy as np
+
+from causal_nest.engines import FisherZ, GaussianBIC, hill_climb, mmhc, mmpc, mmpc_skeleton
+
+
+def test_fisher_z_batches_tests_with_the_same_conditioning_set(collider_data):
+    test = FisherZ(collider_data)
+    batched = test.pvalues(0, [1, 3], [2])
+    assert np.allclose(batched, [test.pvalue(0, 1, [2]), test.pvalue(0, 3, [2])])
+    assert test.pvalue(0, 1) > 0.01
+    assert test.pvalue(0, 1, [2]) < 0.01
+    assert test.pvalue(0, 3, [2]) > 0.01
+
+
+def test_mmpc_finds_parents_and_children(collider_data):
+    test = FisherZ(collider_data)
+    assert mmpc(test, 2) == {0, 1, 3}
+    assert mmpc(test, 4) == set()
+
+
+def test_mmpc_skeleton_is_symmetric_and_parallel_safe(collider_data):
+    test = FisherZ(collider_data)
+    skeleton = mmpc_skeleton(test)
+    assert (skeleton == skeleton.T).all()
+    assert (mmpc_skeleton(test, n_jobs=3) == skeleton).all()
+    assert {tuple(e) for e in np.argwhere(np.triu(skeleton))} == {(0, 2), (1, 2), (2, 3)}
+
+
+def test_hill_climb_only_adds_candidate_edges(collider_data):
+    x = collider_data
+    candidates = np.zeros((5, 5), dtype=bool)
+    candidates[0, 2] = candidates[2, 0] = True
+    dag = hill_climb(GaussianBIC(x), candidates)
+    assert not (dag & ~candidates).any()
+    assert dag[0, 2] or dag[2, 0]
+
+
+def test_mmhc_recovers_collider(collider_data):
+    dag = mmhc(collider_data)
+    expected = np.zeros((5, 5), dtype=bool)
+    expected[0, 2] = expected[1, 2] = expected[2, 3] = True
+    assert (dag == expected).all()
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from causal_nest.engines import notears_linear
+
+
+@pytest.mark.parametrize("acyclicity", ["expm", "polynomial"])
+def test_notears_linear_recovers_chain(acyclicity, linear_chain_covariance):
+    w = notears_linear(linear_chain_covariance, acyclicity=acyclicity)
+    assert set(zip(*np.nonzero(w))) == {(0, 1), (1, 2)}
+    assert np.isclose(w[0, 1], 1.5, atol=0.2)
+
+
+def test_notears_linear_respects_superstructure(linear_chain_covariance):
+    superstructure = np.ones((3, 3), dtype=bool)
+    superstructure[1, 2] = superstructure[2, 1] = False
+    w = notears_linear(linear_chain_covariance, superstructure=superstructure)
+    assert w[1, 2] == 0 and w[2, 1] == 0
+
+
+def test_notears_linear_rejects_unknown_acyclicity():
+    with pytest.raises(ValueError, match=r"Argument 'acyclicity' must be one of"):
+        notears_linear(np.eye(2), acyclicity="unknown")
@@ -0,0 +1,73 @@
+import numpy as np
+
+from causal_nest.engines import GaussianBIC, LocalScoreCache, dataset_fingerprint, fges
+
+
+def test_dataset_fingerprint_depends_on_values_and_shape():
+    x = np.arange(6, dtype=float).reshape(3, 2)
+    assert dataset_fingerprint(x) == dataset_fingerprint(x.copy())
+    assert dataset_fingerprint(x) != dataset_fingerprint(x.reshape(2, 3))
+    assert dataset_fingerprint(x) != dataset_fingerprint(x + 1)
+
+
+def test_local_score_cache_counts_hits_and_misses():
+    cache = LocalScoreCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 1.5
+
+    assert cache.get_or_compute("key", compute) == 1.5
+    assert cache.get_or_compute("key", compute) == 1.5
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_local_score_cache_evicts_least_recently_used():
+    cache = LocalScoreCache(max_entries=2)
+    cache.get_or_compute("a", lambda: 1.0)
+    cache.get_or_compute("b", lambda: 2.0)
+    cache.get_or_compute("a", lambda: 1.0)
+    cache.get_or_compute("c", lambda: 3.0)
+
+    assert cache.get_or_compute("a", lambda: -1.0) == 1.0
+    assert cache.get_or_compute("b", lambda: -2.0) == -2.0
+
+
+def test_local_score_cache_reads_and_writes_shared_mapping():
+    shared = {}
+    LocalScoreCache(shared=shared).get_or_compute("key", lambda: 4.0)
+    assert shared == {"key": 4.0}
+
+    other = LocalScoreCache(shared=shared)
+    assert other.get_or_compute("key", lambda: -1.0) == 4.0
+    assert other.stats() == {"hits": 1, "misses": 0}
+
+
+def test_local_score_cache_computes_missed_keys_in_one_call():
+    shared = {"b": 2.0}
+    cache = LocalScoreCache(shared=shared)
+    cache.get_or_compute("a", lambda: 1.0)
+    calls = []
+
+    def compute(keys):
+        calls.append(keys)
+        return [3.0 for _ in keys]
+
+    assert cache.get_or_compute_many(["a", "b", "c", "d"], compute) == [1.0, 2.0, 3.0, 3.0]
+    assert calls == [["c", "d"]]
+    assert shared == {"a": 1.0, "b": 2.0, "c": 3.0, "d": 3.0}
+    assert cache.stats() == {"hits": 2, "misses": 3}
+
+
+def test_scores_are_reused_across_searches_on_the_same_data():
+    x = np.random.default_rng(0).normal(size=(500, 4))
+    cache = LocalScoreCache()
+
+    fges(x, score=GaussianBIC(x, cache=cache))
+    misses = cache.misses
+    fges(x, score=GaussianBIC(x, cache=cache))
+
+    assert cache.misses == misses
+    assert cache.hits > 0
@@ -0,0 +1,63 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+from networkx import DiGraph
+
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
+from causal_nest.discovery_models import BES
+from causal_nest.superstructure import compute_superstructure
+
+
+def make_chain_dataset():
+    a = np.random.normal(0, 1, size=500)
+    b = 2 * a + np.random.normal(0, 1, size=500)
+    c = -3 * b + np.random.normal(0, 1, size=500)
+    df = pd.DataFrame({"A": a, "B": b, "C": c})
+
+    return Dataset(
+        data=df,
+        target="C",
+        feature_mapping=[
+            FeatureTypeMap(feature="A", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="B", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+
+def test_create_graph_from_data_generates_valid_graph_with_valid_input():
+    c = BES()
+    graph = c.create_graph_from_data(make_chain_dataset())
+    assert isinstance(graph, DiGraph)
+    assert set(graph.nodes()) == {"A", "B", "C"}
+
+
+def test_create_graph_from_data_restricts_search_to_warm_start_skeleton():
+    warm_start = nx.DiGraph()
+    warm_start.add_nodes_from(["A", "B", "C"])
+    warm_start.add_edge("A", "B")
+
+    c = BES()
+    graph = c.create_graph_from_data(make_chain_dataset(), warm_start=warm_start)
+    assert not graph.has_edge("B", "C") and not graph.has_edge("C", "B")
+    assert not graph.has_edge("A", "C") and not graph.has_edge("C", "A")
+
+
+def test_degrade_limits_parents():
+    c = BES()
+    assert c.max_parents is None
+    assert c.degrade()
+    assert c.max_parents == 2
+    graph = c.create_graph_from_data(make_chain_dataset())
+    assert all(graph.in_degree(n) <= 2 for n in graph.nodes())
+
+
+def test_create_graph_from_data_restricts_search_to_superstructure():
+    dataset = make_chain_dataset()
+    superstructure = compute_superstructure(dataset)
+    superstructure.candidates[:] = False
+    superstructure.candidates[0, 1] = superstructure.candidates[1, 0] = True
+
+    c = BES()
+    graph = c.create_graph_from_data(dataset, superstructure=superstructure)
+    assert graph.has_edge("A", "B") or graph.has_edge("B", "A")
+    assert not graph.has_edge("B", "C") and not graph.has_edge("C", "B")
@@ -4,6 +4,7 @@ import re
 import numpy as np
 import pandas as pd
 import pytest
+from unittest.mock import patch
 from networkx import DiGraph
 
 from causal_nest.discovery_models import CAM
@@ -35,7 +36,7 @@ def test_is_method_allowed_returns_false_with_non_numeric_feature_present():
     assert c.is_method_allowed(dataset) == False
 
 
-def test_is_method_allowed_returns_false_with_non_normal_feature_present():
+def test_is_method_allowed_returns_true_with_non_normal_feature_present():
     df = pd.DataFrame(data=np.random.normal(0, 5, size=(100, 3)), columns=["foo", "bar", "test"])
     df["non_normal"] = [(random.randint(0, 200) if random.random() < 0.1 else 0) for _i in range(0, 100)]
 
@@ -50,26 +51,26 @@ def test_is_method_allowed_returns_false_with_non_normal_feature_present():
     )
 
     c = CAM()
-    assert c.is_method_allowed(dataset) == False
+    assert c.is_method_allowed(dataset)
 
 
-@pytest.mark.skip(reason="TODO: Encontrar uma base pra teste não-linear")
-def test_is_method_allowed_returns_false_with_non_linear_relationship_present():
-    df = pd.DataFrame(data=np.random.normal(0, 5, size=(100, 3)), columns=["foo", "bar", "test"])
-    df["non_linear"] = np.random.uniform(-5000, 5000, size=(100, 1))
+def test_is_method_allowed_returns_true_with_non_linear_relationship_present():
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=500)
+    b = np.sin(2 * a) + 0.3 * rng.normal(size=500)
+    df = pd.DataFrame({"A": a, "B": b, "C": b**2 + 0.3 * rng.normal(size=500)})
 
     dataset = Dataset(
         data=df,
-        target="non_linear",
+        target="C",
         feature_mapping=[
-            FeatureTypeMap(feature="foo", type=FeatureType.CONTINUOUS),
-            FeatureTypeMap(feature="bar", type=FeatureType.CONTINUOUS),
-            FeatureTypeMap(feature="test", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="A", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="B", type=FeatureType.CONTINUOUS),
         ],
     )
 
     c = CAM()
-    assert c.is_method_allowed(dataset) == False
+    assert c.is_method_allowed(dataset)
 
 
 def test_is_method_allowed_returns_true_with_valid_input():
@@ -97,7 +98,7 @@ def test_create_graph_from_data_validates_dataset_as_cn_instance():
 
 def test_create_graph_from_data_validates_method_is_allowed():
     df = pd.DataFrame(data=np.random.normal(0, 5, size=(100, 3)), columns=["foo", "bar", "test"])
-    df["non_normal"] = [(random.randint(0, 200) if random.random() < 0.1 else 0) for _i in range(0, 100)]
+    df["random_column"] = [random.choice(["a", "b", "c", "d"]) for _i in range(0, 100)]
 
     dataset = Dataset(
         data=df,
@@ -105,7 +106,7 @@ def test_create_graph_from_data_validates_method_is_allowed():
         feature_mapping=[
             FeatureTypeMap(feature="foo", type=FeatureType.CONTINUOUS),
             FeatureTypeMap(feature="bar", type=FeatureType.CONTINUOUS),
-            FeatureTypeMap(feature="non_normal", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="random_column", type=FeatureType.CATEGORICAL),
         ],
     )
 
@@ -133,3 +134,23 @@ def test_create_graph_from_data_generates_valid_graph_with_valid_input():
     c = CAM()
     graph = c.create_graph_from_data(dataset)
     assert isinstance(graph, DiGraph)
+
+
+def test_create_graph_from_data_fits_large_datasets_on_a_row_sample():
+    df = pd.DataFrame(data=np.random.normal(0, 1, size=(300, 3)), columns=["foo", "bar", "test"])
+    dataset = Dataset(
+        data=df,
+        target="test",
+        feature_mapping=[
+            FeatureTypeMap(feature="foo", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="bar", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+    c = CAM(max_rows=100)
+    with patch.object(c, "is_method_allowed", return_value=True), patch(
+        "causal_nest.discovery_models.cam.cam", return_value=np.zeros((3, 3), dtype=bool)
+    ) as engine:
+        graph = c.create_graph_from_data(dataset)
+    assert engine.call_args.args[0].shape == (100, 3)
+    assert set(graph.nodes()) == {"foo", "bar", "test"}
@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+from networkx import DiGraph
+
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
+from causal_nest.discovery_models import FGES, GES
+
+
+def make_collider_dataset():
+    rng = np.random.default_rng(2)
+    a = rng.normal(size=2000)
+    b = rng.normal(size=2000)
+    c = a + b + rng.normal(size=2000)
+    df = pd.DataFrame({"A": a, "B": b, "C": c})
+
+    return Dataset(
+        data=df,
+        target="C",
+        feature_mapping=[
+            FeatureTypeMap(feature="A", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="B", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+
+def test_create_graph_from_data_generates_valid_graph_with_valid_input():
+    c = FGES()
+    graph = c.create_graph_from_data(make_collider_dataset())
+    assert isinstance(graph, DiGraph)
+    assert set(graph.edges()) == {("A", "C"), ("B", "C")}
+
+
+def test_create_graph_from_data_accepts_warm_start():
+    warm_start = nx.DiGraph([("A", "B"), ("B", "C")])
+    c = FGES()
+    graph = c.create_graph_from_data(make_collider_dataset(), warm_start=warm_start)
+    assert set(graph.edges()) == {("A", "C"), ("B", "C")}
+
+
+def test_ges_with_fges_backend():
+    c = GES(backend="fges")
+    graph = c.create_graph_from_data(make_collider_dataset())
+    assert set(graph.edges()) == {("A", "C"), ("B", "C")}
+
+
+def test_ges_with_fges_backend_passes_n_jobs():
+    c = GES(backend="fges", n_jobs=3)
+    with patch("causal_nest.discovery_models.ges.fges", return_value=np.zeros((3, 3))) as engine:
+        c.create_graph_from_data(make_collider_dataset())
+    assert engine.call_args.kwargs["n_jobs"] == 3
+
+
+def test_ges_with_fges_backend_uses_the_thread_budget_by_default():
+    with patch("causal_nest.discovery_models.ges.thread_limit", return_value=4):
+        with patch("causal_nest.discovery_models.ges.fges", return_value=np.zeros((3, 3))) as engine:
+            GES(backend="fges").create_graph_from_data(make_collider_dataset())
+    assert engine.call_args.kwargs["n_jobs"] == 4
+
+
+def test_ges_rejects_unknown_backend():
+    with pytest.raises(ValueError, match=r"Argument 'backend' must be one of"):
+        GES(backend="unknown")
+
+
+def test_is_method_allowed_rejects_categorical_features():
+    dataset = make_collider_dataset()
+    dataset.feature_mapping = [
+        FeatureTypeMap(feature="A", type=FeatureType.CATEGORICAL),
+        FeatureTypeMap(feature="B", type=FeatureType.CONTINUOUS),
+    ]
+    assert not FGES().is_method_allowed(dataset)
+
+
+def test_ges_with_fges_backend_rejects_categorical_features():
+    dataset = make_collider_dataset()
+    dataset.feature_mapping = [
+        FeatureTypeMap(feature="A", type=FeatureType.CATEGORICAL),
+        FeatureTypeMap(feature="B", type=FeatureType.CONTINUOUS),
+    ]
+    assert not GES(backend="fges").is_method_allowed(dataset)
+    assert GES().is_method_allowed(dataset)
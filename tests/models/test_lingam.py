@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+from networkx import DiGraph
+
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
+from causal_nest.discovery_models import LINGAM
+
+
+def test_create_graph_from_data_generates_valid_graph_with_valid_input():
+    df = pd.DataFrame(data=np.random.normal(0, 5, size=(500, 3)), columns=["foo", "bar", "test"])
+    dataset = Dataset(
+        data=df,
+        target="test",
+        feature_mapping=[
+            FeatureTypeMap(feature="foo", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="bar", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+    c = LINGAM()
+    graph = c.create_graph_from_data(dataset)
+    assert isinstance(graph, DiGraph)
+    assert set(graph.nodes()) == {"foo", "bar", "test"}
+
+
+def test_is_method_allowed_returns_true_with_non_gaussian_noise(non_gaussian_chain_data):
+    df = pd.DataFrame(data=non_gaussian_chain_data, columns=["x2", "x3", "x0", "x1"])
+    dataset = Dataset(
+        data=df,
+        target="x3",
+        feature_mapping=[
+            FeatureTypeMap(feature="x2", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="x0", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="x1", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+    c = LINGAM()
+    assert c.is_method_allowed(dataset)
+    graph = c.create_graph_from_data(dataset)
+    assert {("x0", "x1"), ("x1", "x2")} <= set(graph.edges())
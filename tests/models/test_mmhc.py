@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from networkx import DiGraph
+
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
+from causal_nest.discovery_models import MMHC
+
+
+def test_create_graph_from_data_generates_valid_graph_with_valid_input():
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=1000)
+    b = rng.normal(size=1000)
+    c = a + b + rng.normal(size=1000)
+    dataset = Dataset(
+        data=pd.DataFrame({"A": a, "B": b, "C": c}),
+        target="C",
+        feature_mapping=[
+            FeatureTypeMap(feature="A", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="B", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+    c = MMHC()
+    graph = c.create_graph_from_data(dataset)
+    assert isinstance(graph, DiGraph)
+    assert set(graph.edges()) == {("A", "C"), ("B", "C")}
+
+
+def test_rejects_unknown_ci_test():
+    with pytest.raises(ValueError, match=r"Argument 'ci_test' must be one of"):
+        MMHC(ci_test="unknown")
+
+
+def test_create_graph_from_data_accepts_categorical_features_with_discrete_test():
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 3, 2000)
+    b = np.where(rng.random(2000) < 0.8, a, rng.integers(0, 3, 2000))
+    dataset = Dataset(
+        data=pd.DataFrame({"A": np.array(["x", "y", "z"])[a], "B": b, "C": rng.normal(size=2000)}),
+        target="C",
+        feature_mapping=[
+            FeatureTypeMap(feature="A", type=FeatureType.CATEGORICAL),
+            FeatureTypeMap(feature="B", type=FeatureType.DISCRETE),
+        ],
+    )
+
+    assert not MMHC().is_method_allowed(dataset)
+    graph = MMHC(ci_test="gsq").create_graph_from_data(dataset)
+    assert isinstance(graph, DiGraph)
+    assert {frozenset(e) for e in graph.edges()} == {frozenset(("A", "B"))}
+
+
+def test_random_fourier_test_drops_linearity_assumption():
+    assert MMHC().linearity_assumption
+    assert not MMHC(ci_test="rff").linearity_assumption
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+from networkx import DiGraph
+
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
+from causal_nest.discovery_models import NOTEARS
+
+
+def test_create_graph_from_data_generates_valid_graph_with_valid_input():
+    rng = np.random.default_rng(0)
+    a = rng.uniform(-1, 1, size=1000)
+    b = 2 * a + rng.uniform(-1, 1, size=1000)
+    c = -2 * b + rng.uniform(-1, 1, size=1000)
+    dataset = Dataset(
+        data=pd.DataFrame({"A": a, "B": b, "C": c}),
+        target="C",
+        feature_mapping=[
+            FeatureTypeMap(feature="A", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="B", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+    c = NOTEARS()
+    graph = c.create_graph_from_data(dataset)
+    assert isinstance(graph, DiGraph)
+    assert set(graph.nodes()) == {"A", "B", "C"}
+    assert {frozenset(e) for e in graph.edges()} == {frozenset(("A", "B")), frozenset(("B", "C"))}
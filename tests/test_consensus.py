@@ -0,0 +1,57 @@
+import networkx as nx
+
+from causal_nest.consensus import ConsensusStoppingRule
+from causal_nest.results import DiscoveryResult
+
+
+def make_result(edges, model="model"):
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["A", "B", "C", "T"])
+    graph.add_edges_from(edges)
+    return DiscoveryResult(output_graph=graph, model=model)
+
+
+def test_parents_agree_when_k_results_share_target_parents():
+    rule = ConsensusStoppingRule(k=2)
+    results = [make_result([("A", "T"), ("B", "T")]), make_result([("B", "T"), ("A", "T"), ("A", "C")])]
+    assert rule.should_stop(results, "T")
+
+
+def test_parents_do_not_agree_with_different_parent_sets():
+    rule = ConsensusStoppingRule(k=2)
+    results = [make_result([("A", "T")]), make_result([("B", "T")])]
+    assert not rule.should_stop(results, "T")
+
+
+def test_parents_agree_requires_k_results():
+    rule = ConsensusStoppingRule(k=3)
+    results = [make_result([("A", "T")]), make_result([("A", "T")])]
+    assert not rule.should_stop(results, "T")
+
+
+def test_votes_stable_with_decisive_identical_results():
+    rule = ConsensusStoppingRule(k=None, vote_threshold=0.9, min_results=3)
+    results = [make_result([("A", "B"), ("B", "T")]) for _ in range(3)]
+    assert rule.should_stop(results, "T")
+
+
+def test_votes_not_stable_when_majority_changes():
+    rule = ConsensusStoppingRule(k=None, vote_threshold=0.5, min_results=2)
+    results = [make_result([("A", "B")]), make_result([("B", "C")])]
+    assert not rule.should_stop(results, "T")
+
+
+def test_votes_not_stable_below_threshold():
+    rule = ConsensusStoppingRule(k=None, vote_threshold=0.9, min_results=3)
+    results = [
+        make_result([("A", "B"), ("B", "T")]),
+        make_result([("A", "B"), ("C", "T")]),
+        make_result([("A", "B"), ("B", "T")]),
+    ]
+    assert not rule.should_stop(results, "T")
+
+
+def test_disabled_rule_never_stops():
+    rule = ConsensusStoppingRule(k=None, vote_threshold=None)
+    results = [make_result([("A", "T")]) for _ in range(5)]
+    assert not rule.should_stop(results, "T")
@@ -3,7 +3,7 @@ import re
 import pandas as pd
 import pytest
 
-from causal_nest.dataset import MissingDataHandlingMethod, Dataset, FeatureType, FeatureTypeMap, handle_missing_data
+from causal_nest.dataset import MissingDataHandlingMethod, Dataset, FeatureType, FeatureTypeMap, handle_missing_data, subsample_dataset
 
 
 # Feature types
@@ -177,4 +177,22 @@ def test_handle_missing_data_does_not_mutate_the_dataset():
 
     updated_ds = handle_missing_data(ds, method=MissingDataHandlingMethod.DROP)
     assert df.shape[0] == 3
-    assert updated_ds.data.shape[0] == 2
\ No newline at end of file
+    assert updated_ds.data.shape[0] == 2
+
+def test_subsample_dataset_keeps_most_important_features_and_fewer_rows():
+    df = pd.DataFrame({"a": range(100), "b": range(100), "c": range(100), "t": range(100)})
+    dataset = Dataset(
+        data=df,
+        target="t",
+        feature_mapping=[
+            FeatureTypeMap(feature="b", type=FeatureType.CONTINUOUS, importance=0.6),
+            FeatureTypeMap(feature="a", type=FeatureType.CONTINUOUS, importance=0.3),
+            FeatureTypeMap(feature="c", type=FeatureType.CONTINUOUS, importance=0.1),
+        ],
+    )
+
+    subsample = subsample_dataset(dataset, max_rows=10, max_features=2)
+    assert len(subsample.data) == 10
+    assert [f.feature for f in subsample.feature_mapping] == ["b", "a"]
+    assert len(dataset.data) == 100
+    assert len(dataset.feature_mapping) == 3
@@ -1,16 +1,26 @@
+import time
+
+import networkx as nx
+import numpy as np
+import pandas as pd
 import pytest
 from unittest.mock import MagicMock, patch
+from causal_nest.consensus import ConsensusStoppingRule
+from causal_nest.engines import GaussianBIC
 from causal_nest.problem import Problem
 from causal_nest.discovery_models import DiscoveryMethodModel
 from causal_nest.results import DiscoveryResult
-from causal_nest.dataset import Dataset
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
 from causal_nest.knowledge import Knowledge
+from causal_nest.sampling import SampleSizeController
+from causal_nest.superstructure import ScreeningMethod, Superstructure
 
 from causal_nest.discovery import (
     applyable_models,
     discover_with_model,
     discover_with_all_models,
     _run_discover_with_model_task,
+    DegradedRetryPolicy,
 )
 
 @pytest.fixture
@@ -43,6 +53,7 @@ def test_discover_with_model(mock_problem, mock_model):
     mock_problem.ground_truth = MagicMock()
     mock_problem.knowledge = MagicMock(spec=Knowledge)
     mock_problem.knowledge.forbidden_edges = []
+    mock_problem.knowledge.tiers = {}
 
     mock_model().create_graph_from_data.return_value = MagicMock()
 
@@ -86,4 +97,187 @@ def test_run_discover_with_model_task(mock_problem, mock_model):
 #             assert "MockModel" in result.discovery_results
 #             assert result.discovery_results["MockModel"] is not None
 #         result = _run_discover_with_model_task(args)
-#         assert result == "result"
\ No newline at end of file
+#         assert result == "result"
+
+class FastAgreeingModel(DiscoveryMethodModel):
+    def create_graph_from_data(self, dataset, **kwargs):
+        graph = nx.DiGraph()
+        graph.add_edges_from([("A", "T"), ("B", "T")])
+        return graph
+
+
+class OtherFastAgreeingModel(FastAgreeingModel):
+    pass
+
+
+class SlowModel(DiscoveryMethodModel):
+    def create_graph_from_data(self, dataset, **kwargs):
+        time.sleep(60)
+        return nx.DiGraph()
+
+
+def make_real_problem():
+    df = pd.DataFrame(np.random.normal(0, 1, size=(50, 3)), columns=["A", "B", "T"])
+    dataset = Dataset(
+        data=df,
+        target="T",
+        feature_mapping=[
+            FeatureTypeMap(feature="A", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="B", type=FeatureType.CONTINUOUS),
+        ],
+    )
+    return Problem(dataset=dataset)
+
+
+def test_discover_with_all_models_stops_on_consensus():
+    problem = make_real_problem()
+    models = [FastAgreeingModel, OtherFastAgreeingModel, SlowModel]
+
+    with patch("causal_nest.discovery.applyable_models", return_value=models):
+        start = time.time()
+        result = discover_with_all_models(
+            problem, max_seconds_model=60, max_workers=3, stopping_rule=ConsensusStoppingRule(k=2)
+        )
+        elapsed = time.time() - start
+
+    assert elapsed < 30
+    assert result.discovery_results["FastAgreeingModel"] is not None
+    assert result.discovery_results["OtherFastAgreeingModel"] is not None
+    assert result.discovery_results["SlowModel"] is None
+    assert "consensus" in result.skipped_models["SlowModel"]
+
+
+class WarmStartableModel(DiscoveryMethodModel):
+    supports_warm_start = True
+
+    def create_graph_from_data(self, dataset, warm_start=None):
+        return warm_start.copy() if warm_start is not None else nx.DiGraph()
+
+
+def test_discover_with_all_models_chains_warm_starts():
+    problem = make_real_problem()
+    models = [WarmStartableModel, FastAgreeingModel]
+
+    with patch("causal_nest.discovery.applyable_models", return_value=models):
+        with patch("causal_nest.discovery.warm_start_chain", {"WarmStartableModel": ["FastAgreeingModel"]}):
+            result = discover_with_all_models(problem, max_seconds_model=60, max_workers=2, warm_start=True)
+
+    warm = result.discovery_results["WarmStartableModel"]
+    assert warm.warm_started_from == "FastAgreeingModel"
+    assert set(warm.output_graph.edges()) == {("A", "T"), ("B", "T")}
+
+
+def test_discover_with_all_models_runs_cold_when_providers_fail():
+    problem = make_real_problem()
+    models = [WarmStartableModel, SlowModel]
+
+    with patch("causal_nest.discovery.applyable_models", return_value=models):
+        with patch("causal_nest.discovery.warm_start_chain", {"WarmStartableModel": ["SlowModel"]}):
+            result = discover_with_all_models(problem, max_seconds_model=2, max_workers=2, warm_start=True)
+
+    assert result.discovery_results["SlowModel"] is None
+    assert result.discovery_results["WarmStartableModel"].warm_started_from is None
+
+
+class DegradableModel(DiscoveryMethodModel):
+    def __init__(self):
+        super().__init__()
+        self.sleep = 60
+
+    def degrade(self):
+        self.sleep = 0
+        return "no sleep"
+
+    def create_graph_from_data(self, dataset, **kwargs):
+        time.sleep(self.sleep)
+        graph = nx.DiGraph()
+        graph.add_nodes_from(dataset.data.columns)
+        return graph
+
+
+def test_discover_with_all_models_retries_timed_out_models_degraded():
+    problem = make_real_problem()
+
+    with patch("causal_nest.discovery.applyable_models", return_value=[DegradableModel]):
+        result = discover_with_all_models(
+            problem, max_seconds_model=2, max_workers=1, retry_policy=DegradedRetryPolicy(max_rows=10, max_features=1)
+        )
+
+    dr = result.discovery_results["DegradableModel"]
+    assert dr is not None
+    assert dr.degraded
+    assert dr.degradation == "10 rows, 1 features, no sleep"
+    assert set(dr.output_graph.nodes()) == {"A", "B", "T"}
+
+
+def test_discover_with_all_models_without_retry_policy_leaves_failed_models_empty():
+    problem = make_real_problem()
+
+    with patch("causal_nest.discovery.applyable_models", return_value=[DegradableModel]):
+        result = discover_with_all_models(problem, max_seconds_model=2, max_workers=1)
+
+    assert result.discovery_results["DegradableModel"] is None
+
+
+class ScreenedModel(DiscoveryMethodModel):
+    supports_superstructure = True
+
+    def create_graph_from_data(self, dataset, superstructure=None, **kwargs):
+        graph = nx.DiGraph()
+        graph.add_nodes_from(["A", "B", "T"])
+        if isinstance(superstructure, Superstructure):
+            graph.add_edge("A", "T")
+        return graph
+
+
+def test_discover_with_all_models_passes_superstructure_to_supporting_models():
+    problem = make_real_problem()
+    with patch("causal_nest.discovery.applyable_models", return_value=[ScreenedModel, FastAgreeingModel]):
+        result = discover_with_all_models(problem, screening=ScreeningMethod.PARTIAL_CORRELATION, max_workers=2)
+
+    assert ("superstructure", ScreeningMethod.PARTIAL_CORRELATION) in problem.dataset.cache
+    assert result.discovery_results["ScreenedModel"].output_graph.has_edge("A", "T")
+    assert result.discovery_results["FastAgreeingModel"] is not None
+
+
+class ScoringModel(DiscoveryMethodModel):
+    def create_graph_from_data(self, dataset, **kwargs):
+        score = GaussianBIC(dataset.data[["A", "B", "T"]].to_numpy())
+        score.local_score(2, {0, 1})
+        score.local_score(2, {1, 0})
+        return nx.DiGraph([("A", "T")])
+
+
+def test_discover_with_all_models_reports_score_cache_stats_with_shared_cache():
+    problem = make_real_problem()
+    with patch("causal_nest.discovery.applyable_models", return_value=[ScoringModel, FastAgreeingModel]):
+        result = discover_with_all_models(problem, share_score_cache=True, max_workers=2)
+
+    scored = result.discovery_results["ScoringModel"]
+    assert scored.score_cache_hits >= 1
+    assert scored.score_cache_hits + scored.score_cache_misses == 2
+    assert result.discovery_results["FastAgreeingModel"].score_cache_hits is None
+
+
+class RowCountingModel(DiscoveryMethodModel):
+    def create_graph_from_data(self, dataset, **kwargs):
+        # The graph only settles once 200 rows are available
+        return nx.DiGraph([("A", "T")] if len(dataset.data) >= 200 else [("B", "T")])
+
+
+def test_discover_with_model_stops_growing_subsamples_once_graph_is_stable():
+    df = pd.DataFrame(np.random.normal(0, 1, size=(5000, 3)), columns=["A", "B", "T"])
+    dataset = Dataset(
+        data=df,
+        target="T",
+        feature_mapping=[
+            FeatureTypeMap(feature="A", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="B", type=FeatureType.CONTINUOUS),
+        ],
+    )
+    controller = SampleSizeController(initial_rows=100, growth_factor=2)
+    result = discover_with_model(Problem(dataset=dataset), RowCountingModel, sample_size=controller)
+
+    assert result.rows_used == 400
+    assert result.output_graph.has_edge("A", "T")
+    assert discover_with_model(Problem(dataset=dataset), RowCountingModel).rows_used is None
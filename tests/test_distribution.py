@@ -1,11 +1,12 @@
 import random
 import re
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
 import pytest
 
-from causal_nest.distribution import is_linear, is_normal
+from causal_nest.distribution import is_linear, is_normal, pairwise_linear_fits
 from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
 
 
@@ -106,3 +107,71 @@ def test_is_linear_returns_true_for_valid_linear_data():
 
 #     result = is_linear(dataset)
 #     assert result == False
+
+
+def test_is_normal_samples_large_datasets_and_caches_the_verdict():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(data=rng.normal(0, 5, size=(20000, 2)), columns=["foo", "test"])
+    df["skewed"] = rng.exponential(size=20000)
+
+    dataset = Dataset(
+        data=df,
+        target="test",
+        feature_mapping=[
+            FeatureTypeMap(feature="foo", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="skewed", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+    assert not is_normal(dataset, max_rows=1000)
+    assert dataset.cache[("is_normal", 0.05, 1000, 0)] is False
+    dataset.cache[("is_normal", 0.05, 1000, 0)] = True
+    assert is_normal(dataset, max_rows=1000)
+
+
+def test_is_normal_converts_only_the_sampled_rows():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(data=rng.normal(0, 5, size=(20000, 3)), columns=["foo", "bar", "test"])
+    dataset = Dataset(
+        data=df,
+        target="test",
+        feature_mapping=[
+            FeatureTypeMap(feature="foo", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="bar", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+    to_numpy = pd.DataFrame.to_numpy
+    with patch.object(pd.DataFrame, "to_numpy", autospec=True, side_effect=to_numpy) as converted:
+        is_normal(dataset, max_rows=1000)
+    assert [call.args[0].shape for call in converted.call_args_list] == [(1000, 2)]
+
+
+def test_pairwise_linear_fits_match_least_squares():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(200, 3)) * [1, 3, 0.5] + [1, -2, 3]
+    intercepts, slopes, residuals = pairwise_linear_fits(values)
+    slope, intercept = np.polyfit(values[:, 1], values[:, 2], 1)
+    assert slopes[1, 2] == pytest.approx(slope)
+    assert intercepts[1, 2] == pytest.approx(intercept)
+    assert np.allclose(residuals, 0)
+
+
+def test_is_linear_nonlinearity_test_detects_quadratic_relationships_on_a_sample():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(data=rng.normal(0, 5, size=(500, 2)), columns=["foo", "test"])
+    df["square"] = df["foo"] ** 2 + rng.normal(size=500)
+
+    dataset = Dataset(
+        data=df,
+        target="test",
+        feature_mapping=[
+            FeatureTypeMap(feature="foo", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="square", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+    assert is_linear(dataset)
+    assert not is_linear(dataset, test_nonlinearity=True)
+    assert not is_linear(dataset, test_nonlinearity=True, max_rows=100)
+    assert dataset.cache[("is_linear", 0.05, True, 0.01, 0.05, 100, 0)] is False
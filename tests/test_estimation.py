@@ -92,4 +92,15 @@ def test_estimate_effect():
     assert isinstance(result, EstimationResult)
     assert result.treatment == "treatment"
     assert result.estimand is not None
-    assert result.p_value is not None
\ No newline at end of file
+    assert result.p_value is not None
+    assert "dowhy_graph" in discovery_result.cache
+
+
+def test_dowhy_graph_is_converted_once():
+    graph = nx.DiGraph()
+    graph.add_edges_from([("treatment", "outcome"), ("covariate", "outcome")])
+    discovery_result = DiscoveryResult(output_graph=graph, model="test_model")
+
+    gml = discovery_result.dowhy_graph()
+    assert discovery_result.dowhy_graph() is gml
+    assert set(nx.parse_gml(gml).edges()) == {("treatment", "outcome"), ("covariate", "outcome")}
@@ -0,0 +1,79 @@
+import pickle
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy import sparse
+
+from causal_nest.graph import ArrayGraph, as_array_graph
+from causal_nest.results.discovery_result import DiscoveryResult
+
+
+def test_array_graph_round_trips_networkx_graphs():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["A", "B", "C", "D"])
+    graph.add_weighted_edges_from([("A", "B", 0.5), ("B", "C", 2.0)])
+    array_graph = ArrayGraph.from_networkx(graph, weight="weight")
+    assert array_graph.weighted
+    assert array_graph.number_of_edges() == 2
+    assert array_graph.predecessors("C") == ["B"]
+    assert array_graph.out_degree("A") == 1
+    restored = array_graph.to_networkx()
+    assert list(restored.nodes()) == ["A", "B", "C", "D"]
+    assert list(restored.edges(data=True)) == [("A", "B", {"weight": 0.5}), ("B", "C", {"weight": 2.0})]
+
+
+def test_array_graph_converts_integer_matrices_to_boolean():
+    array_graph = ArrayGraph(np.array([[0, 2], [0, 0]]), ["X", "Y"])
+    assert not array_graph.weighted
+    assert list(array_graph.edges()) == [("X", "Y")]
+    assert list(array_graph.to_networkx().edges(data=True)) == [("X", "Y", {})]
+
+
+def test_array_graph_rejects_mismatched_nodes():
+    with pytest.raises(ValueError):
+        ArrayGraph(np.zeros((2, 2)), ["X"])
+
+
+def test_array_graph_reindexes_over_other_nodes():
+    graph = nx.DiGraph([("A", "B"), ("B", "C")])
+    array_graph = as_array_graph(graph, ["C", "B", "E"])
+    assert array_graph.matrix.tolist() == [[False, False, False], [True, False, False], [False, False, False]]
+
+
+def test_array_graph_finds_cycles():
+    array_graph = ArrayGraph.from_networkx(nx.DiGraph([("A", "B"), ("B", "A"), ("B", "C")]))
+    assert not array_graph.is_acyclic()
+    assert [c.tolist() for c in array_graph.strongly_connected_components()] == [[0, 1]]
+    assert ArrayGraph.from_networkx(nx.DiGraph([("A", "B"), ("B", "C")])).is_acyclic()
+
+
+def test_array_graph_pickles_dense_and_sparse_graphs():
+    dense = ArrayGraph(np.triu(np.ones((4, 4)), k=1), list("ABCD"))
+    matrix = sparse.random(30, 30, density=0.05, random_state=0, format="csr")
+    sparse_graph = ArrayGraph(matrix, list(range(30)))
+    assert pickle.loads(pickle.dumps(dense)) == dense
+    restored = pickle.loads(pickle.dumps(sparse_graph))
+    assert sparse.issparse(restored.adjacency)
+    assert restored == sparse_graph
+
+
+def test_discovery_result_pickles_output_graph_as_array_graph():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["A", "B", "C"])
+    graph.add_weighted_edges_from([("A", "B", 0.3), ("C", "B", 1.0)])
+    result = DiscoveryResult(output_graph=graph, model="Model")
+    assert isinstance(result.__getstate__()["output_graph"], ArrayGraph)
+    restored = pickle.loads(pickle.dumps(result))
+    assert isinstance(restored.output_graph, nx.DiGraph)
+    assert list(restored.output_graph.nodes()) == ["A", "B", "C"]
+    assert list(restored.output_graph.edges(data=True)) == list(graph.edges(data=True))
+    assert restored.model == "Model"
+
+
+def test_discovery_result_keeps_graphs_with_other_attributes():
+    graph = nx.DiGraph()
+    graph.add_edge("A", "B", label="x")
+    result = DiscoveryResult(output_graph=graph)
+    assert result.__getstate__()["output_graph"] is graph
+    assert list(pickle.loads(pickle.dumps(result)).output_graph.edges(data=True)) == [("A", "B", {"label": "x"})]
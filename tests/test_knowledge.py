@@ -1,5 +1,5 @@
 import pytest
-from causal_nest.knowledge import Knowledge
+from causal_nest.knowledge import Knowledge, parse_knowledge_file
 
 def test_knowledge_initialization():
     knowledge = Knowledge(
@@ -55,4 +55,45 @@ def test_knowledge_contains_required_edge_manually():
 def test_knowledge_contains_forbidden_edge_manually():
     knowledge = Knowledge(forbidden_edges=[("C", "D")])
     assert ("C", "D") in knowledge.forbidden_edges
-    assert ("A", "B") not in knowledge.forbidden_edges
\ No newline at end of file
+    assert ("A", "B") not in knowledge.forbidden_edges
+
+def test_knowledge_edge_lists_follow_manual_changes():
+    knowledge = Knowledge(forbidden_edges=[("C", "D")])
+    knowledge.forbidden_edges.append(("A", "B"))
+    knowledge.forbidden_edges.remove(("C", "D"))
+    assert knowledge.is_forbidden("A", "B")
+    assert not knowledge.is_forbidden("C", "D")
+    knowledge.forbidden_edges[0] = ("E", "F")
+    assert knowledge.is_forbidden("E", "F") and not knowledge.is_forbidden("A", "B")
+
+
+def test_knowledge_tiers_forbid_edges_to_earlier_tiers():
+    knowledge = Knowledge(tiers={"A": 1, "B": 1, "C": 2, "D": 2}, exclusive_tiers=[2])
+    assert knowledge.is_forbidden("C", "A")
+    assert not knowledge.is_forbidden("A", "C")
+    assert not knowledge.is_forbidden("A", "B")
+    assert knowledge.is_forbidden("C", "D") and knowledge.is_forbidden("D", "C")
+    assert not knowledge.is_forbidden("C", "E")
+
+
+def test_knowledge_forbidden_matrix_combines_tiers_and_edges():
+    knowledge = Knowledge(forbidden_edges=[("A", "B")], tiers={"A": 1, "C": 2})
+    matrix = knowledge.forbidden_matrix(["A", "B", "C"])
+    assert matrix.tolist() == [[False, True, False], [False, False, False], [True, False, False]]
+
+
+def test_knowledge_rejects_non_integer_tiers():
+    with pytest.raises(ValueError):
+        Knowledge(tiers={"A": "first"})
+
+
+def test_parse_knowledge_file_keeps_tiers_compressed(tmp_path):
+    path = tmp_path / "knowledge.txt"
+    path.write_text("addtemporal\n1 A B\n2* C D\n\nforbiddirect\nB A\n\nrequiredirect\nA C\n")
+    knowledge = parse_knowledge_file(str(path))
+    assert knowledge.tiers == {"A": 1, "B": 1, "C": 2, "D": 2}
+    assert knowledge.exclusive_tiers == [2]
+    assert knowledge.forbidden_edges == [("B", "A")]
+    assert knowledge.required_edges == [("A", "C")]
+    assert knowledge.is_forbidden("D", "A") and knowledge.is_forbidden("C", "D")
+    assert knowledge.is_required("A", "C")
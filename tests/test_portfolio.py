@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
+from causal_nest.portfolio import CostProfile, PortfolioHistory, estimate_model_seconds, select_portfolio
+
+
+class FastModel:
+    cost_profile = CostProfile(base_seconds=1.0)
+
+
+class SlowModel:
+    cost_profile = CostProfile(base_seconds=1000.0)
+
+
+class ExactModel:
+    cost_profile = CostProfile(base_seconds=0.5, feature_exponent=0.0, exponential_in_features=True)
+
+
+def make_dataset(n_rows=1000, n_features=9):
+    columns = [f"x{i}" for i in range(n_features)] + ["target"]
+    df = pd.DataFrame(data=np.random.normal(0, 1, size=(n_rows, n_features + 1)), columns=columns)
+    return Dataset(
+        data=df,
+        target="target",
+        feature_mapping=[FeatureTypeMap(feature=c, type=FeatureType.CONTINUOUS) for c in columns[:-1]],
+    )
+
+
+def test_cost_profile_estimate_on_reference_shape():
+    profile = CostProfile(overhead_seconds=3.0, base_seconds=2.0)
+    assert profile.estimate_seconds(1000, 10) == pytest.approx(5.0)
+
+
+def test_cost_profile_scales_with_shape():
+    profile = CostProfile(base_seconds=1.0, row_exponent=1.0, feature_exponent=2.0)
+    assert profile.estimate_seconds(2000, 20) == pytest.approx(8.0)
+
+
+def test_cost_profile_exponential_in_features():
+    profile = CostProfile(base_seconds=1.0, feature_exponent=0.0, row_exponent=0.0, exponential_in_features=True)
+    assert profile.estimate_seconds(1000, 15) == pytest.approx(32.0)
+
+
+def test_estimate_model_seconds_uses_history_calibration():
+    dataset = make_dataset()
+    history = PortfolioHistory()
+    history.record_success("FastModel", runtime=3.0, estimated_seconds=1.0)
+
+    assert estimate_model_seconds(FastModel, dataset) == pytest.approx(1.0)
+    assert estimate_model_seconds(FastModel, dataset, history) == pytest.approx(3.0)
+
+
+def test_select_portfolio_skips_models_exceeding_model_limit():
+    dataset = make_dataset()
+    selected, skipped = select_portfolio(dataset, [FastModel, SlowModel], time_budget=60, max_seconds_model=30)
+
+    assert selected == [FastModel]
+    assert "SlowModel" in skipped
+    assert "model limit" in skipped["SlowModel"]
+
+
+def test_select_portfolio_skips_exponential_models_on_wide_data():
+    dataset = make_dataset(n_features=40)
+    selected, skipped = select_portfolio(dataset, [ExactModel], time_budget=600, max_seconds_model=90)
+
+    assert selected == []
+    assert "ExactModel" in skipped
+
+
+def test_select_portfolio_skips_models_that_usually_time_out():
+    dataset = make_dataset()
+    history = PortfolioHistory()
+    for _ in range(20):
+        history.record_timeout("FastModel")
+
+    selected, skipped = select_portfolio(dataset, [FastModel], time_budget=60, max_seconds_model=30, history=history)
+
+    assert selected == []
+    assert "timeout rate" in skipped["FastModel"]
+
+
+def test_select_portfolio_respects_total_budget():
+    dataset = make_dataset()
+
+    class OtherFastModel:
+        cost_profile = CostProfile(base_seconds=1.5)
+
+    selected, skipped = select_portfolio(
+        dataset, [OtherFastModel, FastModel], time_budget=2, max_seconds_model=30, max_workers=1
+    )
+
+    assert selected == [FastModel]
+    assert "time budget" in skipped["OtherFastModel"]
+
+
+def test_portfolio_history_round_trip(tmp_path):
+    history = PortfolioHistory()
+    history.record_success("PC", runtime=2.0, estimated_seconds=4.0)
+    history.record_timeout("BES")
+    history.record_rank("PC", 0.0)
+
+    file_path = tmp_path / "history.json"
+    history.save(str(file_path))
+    loaded = PortfolioHistory.load(str(file_path))
+
+    assert loaded == history
+    assert loaded.runtime_calibration("PC") == pytest.approx(0.5)
+    assert loaded.success_rate("PC") > loaded.success_rate("BES")
+    assert loaded.expected_quality("PC") > loaded.expected_quality("BES")
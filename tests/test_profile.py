@@ -0,0 +1,75 @@
+import pickle
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap, subsample_dataset
+from causal_nest.discovery_models import LINGAM, PC
+from causal_nest.profile import DatasetProfile, dataset_profile, inherit_profile
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=500)
+    df = pd.DataFrame({"X": x, "Y": 2 * x + rng.normal(size=500), "Z": rng.normal(size=500)})
+    return Dataset(
+        data=df,
+        target="Z",
+        feature_mapping=[
+            FeatureTypeMap(feature="X", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="Y", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+
+def test_dataset_profile_validates_dataset_as_cn_instance():
+    with pytest.raises(ValueError, match=r"Argument 'dataset' must be a CausalNest `Dataset` instance"):
+        dataset_profile("invalid")
+
+
+def test_dataset_profile_is_computed_once_and_verdicts_on_demand(dataset):
+    profile = dataset_profile(dataset)
+    assert profile == DatasetProfile(n_rows=500, n_features=2, feature_types=frozenset({FeatureType.CONTINUOUS}))
+
+    with patch("causal_nest.profile.is_normal", return_value=True) as is_normal:
+        assert dataset_profile(dataset, normality=True) is profile
+        assert dataset_profile(dataset, normality=True).normal
+        assert is_normal.call_count == 1
+    assert profile.linear is None
+
+
+def test_dataset_profile_is_invalidated_when_the_dataset_changes(dataset):
+    profile = dataset_profile(dataset, normality=True)
+    dataset.data = dataset.data.iloc[:100]
+    assert "profile" not in dataset.cache
+    assert dataset_profile(dataset) is not profile
+    assert dataset_profile(dataset).n_rows == 100
+
+    dataset.feature_mapping = dataset.feature_mapping[:1]
+    assert dataset_profile(dataset).n_features == 1
+
+
+def test_dataset_profile_travels_with_pickled_datasets(dataset):
+    PC().is_method_allowed(dataset)
+    LINGAM().is_method_allowed(dataset)
+    restored = pickle.loads(pickle.dumps(dataset))
+    with patch("causal_nest.profile.is_normal") as is_normal, patch("causal_nest.profile.is_linear") as is_linear:
+        assert LINGAM().is_method_allowed(restored) == LINGAM().is_method_allowed(dataset)
+        is_normal.assert_not_called()
+        is_linear.assert_not_called()
+
+
+def test_inherit_profile_keeps_verdicts_of_the_full_dataset(dataset):
+    dataset_profile(dataset, normality=True, linearity=True)
+    subsample = inherit_profile(dataset, subsample_dataset(dataset, max_rows=50, max_features=1))
+    profile = dataset.cache["profile"]
+    assert subsample.cache["profile"] == DatasetProfile(
+        n_rows=50,
+        n_features=1,
+        feature_types=frozenset({FeatureType.CONTINUOUS}),
+        normal=profile.normal,
+        linear=profile.linear,
+    )
@@ -0,0 +1,75 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from causal_nest.resources import (
+    ThreadBudget,
+    available_cpus,
+    cgroup_cpu_quota,
+    limit_threads,
+    plan_thread_budget,
+    thread_limit,
+    thread_limit_variables,
+)
+
+
+def test_cgroup_cpu_quota_reads_v2_quota(tmp_path):
+    (tmp_path / "cpu.max").write_text("800000 100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) == pytest.approx(8.0)
+
+
+def test_cgroup_cpu_quota_reads_v2_without_quota(tmp_path):
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+
+
+def test_cgroup_cpu_quota_reads_v1_quota(tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("250000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) == pytest.approx(2.5)
+
+
+def test_cgroup_cpu_quota_reads_v1_without_quota(tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+
+
+def test_cgroup_cpu_quota_without_cgroup_files(tmp_path):
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+
+
+def test_available_cpus_respects_quota(tmp_path):
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    with patch("os.sched_getaffinity", return_value=set(range(32))):
+        assert available_cpus(str(tmp_path)) == 1
+
+
+def test_available_cpus_is_at_least_one(tmp_path):
+    (tmp_path / "cpu.max").write_text("50000 100000\n")
+    assert available_cpus(str(tmp_path)) == 1
+
+
+def test_plan_thread_budget_splits_cpus_between_tasks():
+    with patch("causal_nest.resources.available_cpus", return_value=8):
+        assert plan_thread_budget(tasks=12) == ThreadBudget(processes=8, threads_per_process=1)
+        assert plan_thread_budget(tasks=2) == ThreadBudget(processes=2, threads_per_process=4)
+        assert plan_thread_budget(max_workers=3) == ThreadBudget(processes=3, threads_per_process=2)
+        assert plan_thread_budget(max_workers=16) == ThreadBudget(processes=16, threads_per_process=1)
+
+
+def test_limit_threads_sets_environment_variables():
+    with patch.dict(os.environ):
+        limit_threads(2)
+        assert all(os.environ[v] == "2" for v in thread_limit_variables)
+
+
+def test_thread_limit_follows_limit_threads():
+    with patch.dict(os.environ), patch("causal_nest.resources.available_cpus", return_value=8):
+        os.environ.pop(thread_limit_variables[0], None)
+        assert thread_limit() == 8
+        limit_threads(2)
+        assert thread_limit() == 2
@@ -0,0 +1,56 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
+from causal_nest.sampling import SampleSizeController, stratified_order, stratified_subsample
+
+
+def make_dataset(target):
+    df = pd.DataFrame({"foo": np.arange(len(target), dtype=float), "test": target})
+    return Dataset(data=df, target="test", feature_mapping=[FeatureTypeMap(feature="foo", type=FeatureType.CONTINUOUS)])
+
+
+def test_stratified_subsample_keeps_class_proportions():
+    dataset = make_dataset(np.array([0] * 900 + [1] * 100))
+    subsample = stratified_subsample(dataset, 100)
+    assert len(subsample.data) == 100
+    assert subsample.data["test"].sum() == 10
+
+
+def test_stratified_subsample_covers_regression_target_range():
+    dataset = make_dataset(np.random.default_rng(0).normal(size=1000))
+    subsample = stratified_subsample(dataset, 50)
+    deciles = np.searchsorted(np.quantile(dataset.data["test"], np.linspace(0, 1, 11)[1:-1]), subsample.data["test"])
+    assert np.bincount(deciles, minlength=10).tolist() == [5] * 10
+
+
+def test_stratified_subsamples_are_nested_and_cached():
+    dataset = make_dataset(np.random.default_rng(0).normal(size=1000))
+    small = set(stratified_subsample(dataset, 100).data.index)
+    large = set(stratified_subsample(dataset, 300).data.index)
+    assert small <= large
+    assert stratified_order(dataset) is stratified_order(dataset)
+    assert stratified_subsample(dataset, 2000) is dataset
+
+
+def test_sample_size_controller_sizes():
+    controller = SampleSizeController(initial_rows=100, growth_factor=2)
+    assert controller.sizes(1000) == [100, 200, 400, 800, 1000]
+    assert controller.sizes(50) == [50]
+    assert SampleSizeController(initial_rows=100, max_rows=300).sizes(1000) == [100, 200, 300]
+
+
+def test_sample_size_controller_stability():
+    controller = SampleSizeController(tolerance=0.5)
+    a = nx.DiGraph([("A", "B"), ("B", "C")])
+    assert controller.is_stable(a, a.copy())
+    assert controller.is_stable(a, nx.DiGraph([("A", "B"), ("B", "C"), ("A", "C")]))
+    assert not controller.is_stable(a, nx.DiGraph([("B", "A"), ("C", "B")]))
+    assert not SampleSizeController().is_stable(a, nx.DiGraph([("A", "B")]))
+
+
+def test_sample_size_controller_rejects_invalid_growth():
+    with pytest.raises(ValueError, match="Argument 'growth_factor' must be greater than 1"):
+        SampleSizeController(growth_factor=1)
@@ -1,7 +1,17 @@
 import networkx as nx
 import pytest
 from networkx import DiGraph
-from causal_nest.stats import calculate_auc_pr, calculate_shd, calculate_sid
+from causal_nest.stats import (
+    calculate_auc_pr,
+    calculate_ground_truth_metrics,
+    calculate_graph_ranking_score,
+    calculate_graph_ranking_scores,
+    calculate_shd,
+    calculate_sid,
+    forbidden_edges_violation_rate,
+    required_edges_compliance_rate,
+)
+from causal_nest.knowledge import Knowledge
 
 
 def test_calculate_auc_pr():
@@ -70,4 +80,51 @@ def test_calculate_sid_identical_graphs():
     graph_2.add_edges_from([("A", "B"), ("B", "C")])
     
     sid = calculate_sid(graph_1, graph_2)
-    assert sid == 0
\ No newline at end of file
+    assert sid == 0
+
+
+def test_calculate_graph_ranking_score():
+    graph = nx.DiGraph([("A", "B"), ("B", "C")])
+    # 1/3 of the nodes point to C, average distance 1, density 1/3, connected, B lies on 1 of 2 possible paths
+    assert calculate_graph_ranking_score(graph, "C") == pytest.approx(100 * (1 / 3) * (1 / 2) * (1 / 3) * 0.5)
+    assert calculate_graph_ranking_score(graph, "D") == 0
+
+
+def test_calculate_graph_ranking_scores_matches_single_graphs():
+    graphs = [
+        nx.DiGraph([("A", "B"), ("B", "C"), ("A", "C")]),
+        nx.DiGraph([("X", "Y")]),
+        nx.DiGraph([("A", "C"), ("B", "C"), ("D", "A"), ("D", "B")]),
+        nx.DiGraph([("A", "B"), ("C", "D")]),
+    ]
+    scores = calculate_graph_ranking_scores(graphs, "C")
+    assert scores == pytest.approx([calculate_graph_ranking_score(g, "C") for g in graphs])
+    assert scores[1] == 0 and scores[3] == 0
+
+
+def test_calculate_graph_ranking_scores_samples_betweenness_of_large_graphs():
+    graph = nx.gnp_random_graph(60, 0.1, directed=True, seed=0)
+    graph = nx.DiGraph([(u, v) for u, v in graph.edges() if u < v] + [(u, 59) for u in range(59)])
+    exact = calculate_graph_ranking_scores([graph], 59)[0]
+    sampled = calculate_graph_ranking_scores([graph], 59, max_exact_nodes=10, n_pivots=30)[0]
+    assert exact > 0
+    assert sampled == pytest.approx(exact, rel=0.5)
+
+
+def test_calculate_ground_truth_metrics_scores_every_graph():
+    ground_truth = nx.DiGraph([("A", "B"), ("B", "C")])
+    graphs = [nx.DiGraph([("A", "B"), ("B", "C")]), nx.DiGraph([("A", "B"), ("C", "B")]), nx.DiGraph([("A", "C")])]
+    metrics = calculate_ground_truth_metrics(ground_truth, graphs)
+    assert metrics["shd"] == [calculate_shd(ground_truth, g) for g in graphs]
+    assert metrics["sid"] == [calculate_sid(ground_truth, g) for g in graphs]
+    assert metrics["auc_pr"] == pytest.approx([calculate_auc_pr(ground_truth, g) for g in graphs])
+    assert metrics["shd"][0] == 0 and metrics["sid"][0] == 0
+
+
+def test_knowledge_rates_count_tier_forbidden_edges():
+    knowledge = Knowledge(required_edges=[("A", "B")], forbidden_edges=[("A", "C")], tiers={"A": 1, "B": 2})
+    graph = nx.DiGraph([("B", "A"), ("C", "B")])
+    # ("A", "C") and ("B", "A") are forbidden, and only the second one is in the graph
+    assert forbidden_edges_violation_rate(graph, knowledge) == 0.5
+    assert required_edges_compliance_rate(graph, knowledge) == 0.0
+    assert required_edges_compliance_rate(nx.DiGraph([("A", "B")]), knowledge) == 1.0
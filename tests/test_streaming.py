@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from torch.utils.data import DataLoader
+
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
+from causal_nest.streaming import RowSampler, dataset_buffer, subsample_rows
+
+
+def make_dataset():
+    df = pd.DataFrame(data=np.random.default_rng(0).normal(3, 2, size=(1000, 3)), columns=["foo", "bar", "test"])
+    return Dataset(
+        data=df,
+        target="test",
+        feature_mapping=[
+            FeatureTypeMap(feature="foo", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="bar", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+
+def test_dataset_buffer_is_built_once_per_dataset():
+    dataset = make_dataset()
+    buffer = dataset_buffer(dataset)
+    assert buffer.dtype == np.float32
+    assert buffer.shape == (1000, 3)
+    assert dataset_buffer(dataset) is buffer
+
+
+def test_subsample_rows_without_replacement():
+    assert list(subsample_rows(5)) == [0, 1, 2, 3, 4]
+    assert list(subsample_rows(5, 10)) == [0, 1, 2, 3, 4]
+    rows = subsample_rows(1000, 100, random_state=1)
+    assert len(set(rows.tolist())) == 100
+    assert (np.diff(rows) > 0).all()
+    assert (subsample_rows(1000, 100, random_state=1) == rows).all()
+
+
+def test_row_sampler_streams_standardized_batches():
+    dataset = make_dataset()
+    sampler = RowSampler(dataset_buffer(dataset), ["foo", "bar", "test"])
+    batches = list(DataLoader(sampler, batch_size=100, shuffle=True, drop_last=True))
+    assert len(batches) == 10
+    data = np.concatenate([b.numpy() for b in batches])
+    assert np.allclose(data.mean(axis=0), 0, atol=1e-4)
+    assert np.allclose(data.std(axis=0), 1, atol=1e-3)
+    assert sampler.get_names() == ["foo", "bar", "test"]
+    assert sampler.__featurelen__() == 3
+
+
+def test_row_sampler_subsamples_each_epoch():
+    sampler = RowSampler(dataset_buffer(make_dataset()), ["foo", "bar", "test"], rows_per_epoch=200)
+    loader = DataLoader(sampler, batch_size=50, shuffle=True, drop_last=True)
+    first, second = [np.concatenate([b.numpy() for b in loader]) for _ in range(2)]
+    assert len(first) == len(second) == 200
+    assert not np.allclose(first, second)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from causal_nest.dataset import Dataset, FeatureType, FeatureTypeMap
+from causal_nest.superstructure import (
+    ScreeningMethod,
+    _distance_correlation_candidates,
+    compute_superstructure,
+    dataset_superstructure,
+)
+
+
+def make_chain_dataset():
+    rng = np.random.default_rng(1)
+    a = rng.normal(0, 1, size=500)
+    b = 2 * a + rng.normal(0, 1, size=500)
+    c = -3 * b + rng.normal(0, 1, size=500)
+    d = rng.normal(0, 1, size=500)
+    df = pd.DataFrame({"A": a, "B": b, "C": c, "D": d})
+
+    return Dataset(
+        data=df,
+        target="C",
+        feature_mapping=[
+            FeatureTypeMap(feature="A", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="B", type=FeatureType.CONTINUOUS),
+            FeatureTypeMap(feature="D", type=FeatureType.CONTINUOUS),
+        ],
+    )
+
+
+@pytest.mark.parametrize("method", list(ScreeningMethod))
+def test_compute_superstructure_keeps_dependent_pairs(method):
+    superstructure = compute_superstructure(make_chain_dataset(), method)
+    assert set(superstructure.nodes) == {"A", "B", "C", "D"}
+    assert superstructure.allows("A", "B") and superstructure.allows("B", "C")
+    assert not superstructure.allows("A", "D") and not superstructure.allows("C", "D")
+    assert (superstructure.candidates == superstructure.candidates.T).all()
+
+
+def test_partial_correlation_removes_indirect_pairs():
+    superstructure = compute_superstructure(make_chain_dataset(), ScreeningMethod.PARTIAL_CORRELATION)
+    assert not superstructure.allows("A", "C")
+
+
+def test_superstructure_matrix_reindexes_and_leaves_unknown_nodes_unrestricted():
+    superstructure = compute_superstructure(make_chain_dataset())
+    matrix = superstructure.matrix(["C", "B", "E"])
+    assert matrix.tolist() == [[False, True, True], [True, False, True], [True, True, False]]
+
+
+def test_dataset_superstructure_is_cached_per_dataset():
+    dataset = make_chain_dataset()
+    first = dataset_superstructure(dataset)
+    assert dataset_superstructure(dataset) is first
+    assert dataset_superstructure(dataset, ScreeningMethod.GRAPHICAL_LASSO) is not first
+
+
+def test_distance_correlation_in_column_blocks_matches_a_single_block():
+    x = np.random.default_rng(2).normal(size=(200, 7))
+    x[:, 3] = x[:, 0] ** 2
+    single = _distance_correlation_candidates(x, 0.2, max_rows=1000)
+    blocked = _distance_correlation_candidates(x, 0.2, max_rows=1000, max_bytes=2 * 8 * 200 * 200 * 3)
+    assert (blocked == single).all()
+    assert single[0, 3] and not single[0, 1]
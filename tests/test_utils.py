@@ -1,6 +1,6 @@
 import pytest
 import networkx as nx
-from causal_nest.utils import graph_to_pydot_string, dagify_graph
+from causal_nest.utils import adjacency_matrix, graph_to_gml_string, graph_to_pydot_string, dagify_graph, dagify_graph_v2
 
 
 def test_graph_to_pydot_string():
@@ -33,4 +33,53 @@ def test_dagify_graph_no_cycles():
     assert nx.is_directed_acyclic_graph(dagified_graph)
     assert dagified_graph.has_edge("A", "B")
     assert dagified_graph.has_edge("B", "C")
-    assert dagified_graph.number_of_edges() == 2  # No edges should be removed
\ No newline at end of file
+    assert dagified_graph.number_of_edges() == 2  # No edges should be removed
+
+def test_adjacency_matrix():
+    graph = nx.DiGraph()
+    graph.add_edges_from([("A", "B"), ("B", "C"), ("C", "D")])
+    matrix = adjacency_matrix(graph, ["A", "B", "C"])
+    assert matrix.tolist() == [[0, 1, 0], [0, 0, 1], [0, 0, 0]]
+
+
+def test_dagify_graph_reverses_lightest_edge_of_cycle():
+    graph = nx.DiGraph()
+    graph.add_weighted_edges_from([("A", "B", 0.9), ("B", "C", 0.8), ("C", "A", 0.1)])
+    dagified_graph = dagify_graph(graph)
+    assert nx.is_directed_acyclic_graph(dagified_graph)
+    assert set(dagified_graph.edges()) == {("A", "B"), ("B", "C"), ("A", "C")}
+    assert dagified_graph["A"]["C"]["weight"] == 0.1
+
+
+def test_dagify_graph_removes_self_loops_and_lighter_direction_of_two_cycles():
+    graph = nx.DiGraph()
+    graph.add_weighted_edges_from([("A", "A", 1), ("A", "B", 0.2), ("B", "A", 0.7)])
+    dagified_graph = dagify_graph(graph)
+    assert set(dagified_graph.edges()) == {("B", "A")}
+
+
+def test_dagify_graph_v2_preserves_edges_into_target():
+    graph = nx.DiGraph()
+    graph.add_weighted_edges_from([("A", "T", 0.1), ("T", "A", 0.9), ("T", "B", 1), ("B", "C", 1), ("C", "T", 0.1)])
+    dagified_graph = dagify_graph_v2(graph, "T")
+    assert nx.is_directed_acyclic_graph(dagified_graph)
+    assert dagified_graph.has_edge("A", "T")
+    assert dagified_graph.has_edge("C", "T")
+    assert dagified_graph.has_edge("B", "T")
+    assert not any(dagified_graph.successors("T"))
+
+
+def test_dagify_graph_v2_handles_dense_graphs():
+    graph = nx.complete_graph(40, create_using=nx.DiGraph)
+    dagified_graph = dagify_graph_v2(graph, 0)
+    assert nx.is_directed_acyclic_graph(dagified_graph)
+    assert dagified_graph.number_of_edges() == 40 * 39 // 2
+    assert dagified_graph.in_degree(0) == 39
+
+
+def test_graph_to_gml_string():
+    graph = nx.DiGraph()
+    graph.add_edges_from([("A", "B"), (1, "C D")])
+    gml_string = graph_to_gml_string(graph)
+    assert gml_string.startswith("graph [")
+    assert set(nx.parse_gml(gml_string).edges()) == {("A", "B"), ("1", "C D")}
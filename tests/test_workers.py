@@ -0,0 +1,27 @@
+import os
+import time
+from multiprocessing import Process, Queue
+
+from pebble import ProcessPool
+
+from causal_nest.workers import initialize_worker, reported_pids
+
+
+def test_initialize_worker_reports_only_the_workers_of_its_pool():
+    pid_queue = Queue()
+    other = Process(target=time.sleep, args=(5,))
+    other.start()
+    try:
+        with ProcessPool(max_workers=1, initializer=initialize_worker, initargs=(1, None, pid_queue)) as pool:
+            worker_pid = pool.schedule(os.getpid).result()
+        pids = set()
+        deadline = time.monotonic() + 5
+        while not pids and time.monotonic() < deadline:
+            pids |= reported_pids(pid_queue)
+            time.sleep(0.05)
+    finally:
+        other.kill()
+        other.join()
+
+    assert pids == {worker_pid}
+    assert other.pid not in pids